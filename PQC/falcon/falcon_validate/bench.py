@@ -0,0 +1,762 @@
+# falcon_validate/bench.py
+# Benchmark harness: setup separated from timed work, warmups + repeated trials,
+# percentile summaries, JSON results and --compare regression check
+#   python -m falcon_validate.bench samplers --compare bench_samplers_<ts>.json
+#   python -m falcon_validate.bench fft --out fft_baseline.json
+#   python -m falcon_validate.bench fft --engines qx --kernels radix2,radix4,split --scalings fixed,bfp
+#   python -m falcon_validate.bench poly --n_list 256,512,1024
+#   python -m falcon_validate.bench ffsampling --n_list 512,1024
+#   python -m falcon_validate.bench samplerz --batch_sizes 1e3,1e5
+#   python -m falcon_validate.bench ntt --q_list 3329,8380417
+#   python -m falcon_validate.bench startup --max_ms 400
+
+from __future__ import annotations
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import numpy as np
+from .qformat_module import QCtx, QcArray
+from .sampler_module import SAMPLER_VARIANTS, sample_batch
+from .table_module import SamplerTables, TABLES
+from .fft_module import fft_q, mp_fft, to_qc_array, to_complex128
+from .refft_module import REF_ENGINES, dd_fft, ref_fft
+from .fftkernel_module import FFT_KERNELS, FFT_SCALINGS, OpCount, fft_q_kernel, check_kernel, compare_bits
+from .twiddle_module import TWIDDLES
+from .poly_module import (poly_to_q, poly_fft_q, poly_ifft_q, poly_mul_q, poly_div_q,
+                          poly_fft_fp64, poly_ifft_fp64, poly_mul_fp64, poly_div_fp64,
+                          poly_fft_mp, poly_ifft_mp, poly_mul_mp, mp_to_complex, negacyclic_convolve)
+from .ffsampling_module import (FALCON_Q, LEAF_SAMPLERS, TREES, synthetic_key, targets, ff_sampling,
+                                leaf_sampler, sample_leaf_rejection, z_coefficients, signature_sqnorm)
+from .samplerz_module import (BASE_VARIANTS, EXP_MODES, SIGMA_MAX, SIGMA_MIN, sampler_z, dgauss_pmf,
+                              check_sigma)
+from .ntt_module import (NTT_PARAMS, REDUCTIONS, ntt_params, ntt_np, intt_np, poly_mul_ntt, ntt_ref, intt_ref,
+                         poly_mul_ref, random_poly, doc_zetas_mismatch)
+
+
+# --- timing core ---
+_MAX_INNER = 1 << 20
+
+
+def time_trials(fn, work: int, warmup: int = 2, trials: int = 7, min_time: float = 0.05) -> dict:
+    """Run fn() in trials of `inner` calls (calibrated so one trial >= min_time);
+    returns ns per unit of work (work = units per fn() call)"""
+    for _ in range(warmup):
+        fn()
+    inner = 1
+    while True:                                   # timeit 방식 calibration
+        t0 = time.perf_counter_ns()
+        for _ in range(inner):
+            fn()
+        dt = time.perf_counter_ns() - t0
+        if dt >= min_time * 1e9 or inner >= _MAX_INNER:
+            break
+        inner = min(_MAX_INNER, max(inner * 2, int(inner * min_time * 1e9 / max(dt, 1))))
+    ns = []
+    for _ in range(trials):
+        t0 = time.perf_counter_ns()
+        for _ in range(inner):
+            fn()
+        ns.append((time.perf_counter_ns() - t0) / (inner * work))
+    return summarize(ns, inner)
+
+
+def summarize(ns, inner: int = 1) -> dict:
+    a = np.asarray(ns, dtype=np.float64)
+    med = float(np.median(a))
+    return {
+        "median_ns": med, "p5_ns": float(np.percentile(a, 5)), "p95_ns": float(np.percentile(a, 95)),
+        "min_ns": float(a.min()), "mean_ns": float(a.mean()),
+        "stdev_ns": float(a.std(ddof=1)) if len(a) > 1 else 0.0,
+        "trials": len(a), "inner": inner,
+        "per_sec": 1e9 / med if med > 0 else math.inf,
+    }
+
+
+# --- results file / regression compare ---
+def env_meta() -> dict:
+    return {
+        "timestamp": time.strftime("%Y%m%d_%H%M%S"), "python": sys.version.split()[0],
+        "numpy": np.__version__, "platform": platform.platform(), "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(kind: str, results: list, args, path: str | None = None) -> str:
+    meta = env_meta()
+    path = path or f"bench_{kind}_{meta['timestamp']}.json"
+    doc = {"kind": kind, "meta": meta, "args": {k: v for k, v in vars(args).items() if k != "func"},
+           "results": results}
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(doc, f, indent=1)
+    os.replace(tmp, path)
+    return path
+
+
+def compare_results(base: list, new: list, key_fields, metric: str = "median_ns",
+                    threshold: float = 0.10, spread: bool = True) -> list:
+    """Per matching key: ratio new/base; regression = ratio > 1+threshold and (spread=True)
+    the new p5 is above the base p95 (trial distributions do not overlap).
+    A new row marked "skipped" whose key was measured in base counts as a regression."""
+    def key(r):
+        return tuple(r[k] for k in key_fields)
+    ref = {key(r): r for r in base}
+    out = []
+    for r in new:
+        b = ref.get(key(r))
+        if b is None or not b.get(metric):
+            continue
+        if "skipped" in r:
+            out.append({**{k: r[k] for k in key_fields}, "metric": metric, "base": b[metric], "new": None,
+                        "ratio": math.inf, "regression": True, "skipped": r["skipped"]})
+            continue
+        ratio = r[metric] / b[metric]
+        p5 = metric.replace("median", "p5")
+        p95 = metric.replace("median", "p95")
+        separated = r.get(p5, r[metric]) > b.get(p95, b[metric]) if spread else True
+        out.append({**{k: r[k] for k in key_fields}, "metric": metric, "base": b[metric], "new": r[metric],
+                    "ratio": ratio, "regression": bool(ratio > 1.0 + threshold and separated)})
+    return out
+
+
+def report_compare(rows: list, key_fields, threshold: float) -> int:
+    n_reg = 0
+    for r in rows:
+        tag = "❌ REGRESSION" if r["regression"] else ("✅ better" if r["ratio"] < 1 - threshold else "  ")
+        n_reg += r["regression"]
+        label = "  ".join(f"{k}={r[k]}" for k in key_fields) + f"  [{r['metric']}]"
+        if "skipped" in r:
+            print(f"{label:<72s} {r['base']:>12.5g} → {'skipped':>12s}  {tag} ({r['skipped']})")
+            continue
+        print(f"{label:<72s} {r['base']:>12.5g} → {r['new']:>12.5g}  x{r['ratio']:.3f} {tag}")
+    print(f"\n{n_reg} regression(s) beyond {threshold:.0%} of {len(rows)} compared")
+    return n_reg
+
+
+def _load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+# --- samplers ---
+SAMPLER_KEY = ("sampler", "path", "sigma", "batch")
+
+
+def bench_samplers(args) -> list:
+    batches = [int(float(b)) for b in args.batch_sizes.split(",")]
+    results = []
+    for sigma in [float(s) for s in args.sigma_list.split(",")]:
+        k_max = max(1, int(np.ceil(10.0 * sigma)))
+        # setup (PMF + 모든 table) 은 sampling 과 분리해서 측정
+        t0 = time.perf_counter_ns()
+        SamplerTables.build(sigma, k_max, args.mp_dps, args.I, word_bits=args.word_bits)
+        setup_ms = (time.perf_counter_ns() - t0) / 1e6
+        tables = TABLES.get(sigma, k_max, args.mp_dps, args.I, args.word_bits)
+        q = QCtx(args.I, args.word_bits)
+        for sampler in args.sampler_list.split(","):
+            for path, qq in (("fp64", None), ("qx", q)):
+                for batch in batches:
+                    rng = np.random.default_rng(args.seed)
+                    def fn():
+                        sample_batch(sampler, batch, tables.pmf_mp, sigma, k_max, rng, q=qq, tables=tables)
+                    row = {"sampler": sampler, "path": path, "sigma": sigma, "batch": batch,
+                           "I": args.I, "word_bits": args.word_bits, "setup_ms": setup_ms}
+                    try:
+                        st = time_trials(fn, batch, args.warmup, args.trials, args.min_time)
+                    except ValueError as e:              # 예: F 가 작아 Qx KY table 이 비어 있음
+                        # 결과 파일에 남겨야 --compare 가 빠진 key 를 "regression 없음" 으로 넘기지 않음
+                        results.append({**row, "skipped": str(e)})
+                        print(f"  skip {sampler}/{path} σ={sigma} batch={batch}: {e}")
+                        continue
+                    row.update(st)
+                    results.append(row)
+                    print(f"{sampler:<10s} {path:<4s} σ={sigma:<4.2f} batch={batch:<9d} "
+                          f"median {st['median_ns']:>10.2f} ns  [p5 {st['p5_ns']:.2f}, p95 {st['p95_ns']:.2f}]"
+                          f"  {st['per_sec']:>12.4g}/s", flush=True)
+    return results
+
+
+# --- FFT engines ---
+FFT_KEY = ("engine", "N", "I", "word_bits")
+FFT_ENGINES = ("qx", "qx_scalar", "fp64", "mp", "dd")
+
+
+def _kernel_label(kernel, scaling) -> str:
+    # radix2 / fixed 는 기존 "qx" 그대로 (예전 baseline 과 비교 가능)
+    if kernel == "radix2" and scaling == "fixed":
+        return "qx"
+    return f"qx_{kernel}" + ("_bfp" if scaling == "bfp" else "")
+
+
+def _fft_setup(engine, x, I, word_bits, mp_dps, kernel="radix2", scaling="fixed"):
+    """-> (timed fn, output as complex128); twiddles / Q conversion happen here, untimed"""
+    if engine == "qx" and (kernel, scaling) != ("radix2", "fixed"):
+        q = QCtx(I, word_bits)
+        xa = to_qc_array(x, q)
+        fn = lambda: fft_q_kernel(xa.re, xa.im, q, kernel, scaling)
+        fn()                                                      # plan / qroot 표 생성 (untimed)
+        return fn, lambda: to_complex128(QcArray(*fn()[:2]), q)
+    if engine in ("qx", "qx_scalar"):
+        q = QCtx(I, word_bits)
+        xa = to_qc_array(x, q)
+        if engine == "qx_scalar":
+            xa = xa.to_list()
+        TWIDDLES.q(len(x), q)
+        fn = lambda: fft_q(xa, q)
+        return fn, lambda: to_complex128(fn()[0], q)
+    if engine == "fp64":
+        fn = lambda: np.fft.fft(x)
+        return fn, fn
+    if engine == "mp":
+        TWIDDLES.mp(len(x), mp_dps)
+        fn = lambda: mp_fft(x, mp_dps)
+        return fn, lambda: np.asarray([complex(v) for v in fn()], dtype=np.complex128)
+    if engine == "dd":
+        TWIDDLES.dd(len(x))
+        fn = lambda: dd_fft(x)
+        return fn, lambda: ref_fft(x, engine="dd")
+    raise ValueError(f"Unsupported FFT engine: {engine}")
+
+
+def peak_bytes(fn) -> int:
+    """tracemalloc peak of one call (NumPy buffers are tracked too)"""
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_fft(args) -> list:
+    from .main import align_scale
+    results = []
+    for N in [int(n) for n in args.N_list.split(",")]:
+        rng = np.random.default_rng(args.seed)
+        x = (rng.random(N) + 1j * rng.random(N)) / np.sqrt(2)      # main.py inputs 와 동일
+        ref = ref_fft(x, args.mp_dps, args.ref_engine)
+        bfly = (N // 2) * (N.bit_length() - 1)
+        for engine in args.engines.split(","):
+            if engine == "mp" and N > args.mp_max_n or engine == "qx_scalar" and N > args.scalar_max_n:
+                continue
+            Is = [int(i) for i in args.I_list.split(",")] if engine.startswith("qx") else [None]
+            variants = ([(k, s) for k in args.kernels.split(",") for s in args.scalings.split(",")]
+                        if engine == "qx" else [(None, None)])
+            for I in Is:
+                if I is not None and I >= args.word_bits:
+                    continue
+                for kernel, scaling in variants:
+                    label = _kernel_label(kernel, scaling) if kernel else engine
+                    fn, out = _fft_setup(engine, x, I, args.word_bits, args.mp_dps, kernel, scaling)
+                    st = time_trials(fn, 1, args.warmup, args.trials, args.min_time)
+                    est = out()
+                    rel = float(np.linalg.norm(align_scale(ref, est) - ref) / np.linalg.norm(ref))
+                    row = {"engine": label, "N": N, "I": I,
+                           "word_bits": args.word_bits if I is not None else None,
+                           **st, "butterflies_per_sec": bfly * 1e9 / st["median_ns"],
+                           "peak_bytes": peak_bytes(fn), "relL2": rel, "ref_engine": args.ref_engine}
+                    if kernel:
+                        row.update(_kernel_metrics(x, I, args, kernel, scaling, N <= args.scalar_max_n))
+                    results.append(row)
+                    tag = f"Q{I}.{args.word_bits - I}" if I is not None else ""
+                    ops = (f"  mul {row['op_mul']:>7d} add {row['op_add']:>7d} rnd {row['op_round']:>7d}  "
+                           f"Δradix2 {row['lsb_vs_radix2']:>6d} lsb  {row['bitexact']}" if kernel else "")
+                    print(f"{label:<16s} N={N:<6d} {tag:<7s} {st['median_ns'] / 1e3:>11.1f} µs "
+                          f"[p5 {st['p5_ns'] / 1e3:.1f}, p95 {st['p95_ns'] / 1e3:.1f}]  "
+                          f"{row['butterflies_per_sec']:>10.4g} bfly/s  peak {row['peak_bytes'] / 1024:>9.1f} KiB  "
+                          f"relL2 {rel:.3e}{ops}", flush=True)
+    return results
+
+
+def _kernel_metrics(x, I, args, kernel, scaling, scalar_check: bool) -> dict:
+    """Op / rounding counts per transform, saturations, LSB distance to radix2/fixed, bit-exact hook"""
+    q = QCtx(I, args.word_bits, stats=True)
+    xa = to_qc_array(x, q)
+    c = OpCount()
+    re, im, _ = fft_q_kernel(xa.re, xa.im, q, kernel, scaling, ops=c)
+    b_re, b_im, _ = fft_q_kernel(xa.re, xa.im, QCtx(I, args.word_bits))
+    out = {"kernel": kernel, "scaling": scaling, **{f"op_{k}": v for k, v in c.n.items()},
+           "shift": c.shift, "sat_total": q.stats.total,
+           "lsb_vs_radix2": compare_bits(re, im, b_re, b_im)["max_lsb"], "bitexact": "-"}
+    if scalar_check:
+        chk = check_kernel(xa.re, xa.im, QCtx(I, args.word_bits), kernel, scaling)
+        out["bitexact"] = "bit-exact" if all(v["mismatch"] == 0 for v in chk.values()) else "MISMATCH"
+    return out
+
+
+def check_fft(args, results) -> int:
+    bad = [r for r in results if r.get("bitexact") == "MISMATCH"]
+    for r in bad:
+        print(f"❌ {r['engine']} N={r['N']} I={r['I']}: vectorized kernel differs from its scalar reference")
+    return 1 if bad else 0
+
+
+# --- Falcon polynomial products (negacyclic FFT, pointwise mul, inverse FFT) ---
+POLY_KEY = ("engine", "n", "I", "word_bits", "batch")
+POLY_ENGINES = ("qx", "fp64", "mp")
+
+
+def _poly_setup(engine, f, g, I, word_bits, mp_dps):
+    """-> (timed product fn over the batch, {mul, rt, div}: untimed ops on one polynomial)"""
+    if engine == "qx":
+        q = QCtx(I, word_bits)
+        fq, gq = poly_to_q(f, q), poly_to_q(g, q)
+        ops = {
+            "mul": lambda a, b: q.cto_f(poly_mul_q(poly_to_q(a, q), poly_to_q(b, q), q)),
+            "rt": lambda a: q.cto_f(poly_ifft_q(poly_fft_q(poly_to_q(a, q), q), q)),
+            "div": lambda a, b: q.cto_f(poly_div_q(poly_to_q(a, q), poly_to_q(b, q), q)),
+        }
+        return lambda: poly_mul_q(fq, gq, q), ops
+    if engine == "fp64":
+        ops = {"mul": poly_mul_fp64, "rt": lambda a: poly_ifft_fp64(poly_fft_fp64(a)), "div": poly_div_fp64}
+        return lambda: poly_mul_fp64(f, g), ops
+    if engine == "mp":
+        ops = {
+            "mul": lambda a, b: mp_to_complex(poly_mul_mp(a, b, mp_dps)),
+            "rt": lambda a: mp_to_complex(poly_ifft_mp(poly_fft_mp(a, mp_dps), mp_dps)),
+            "div": lambda a, b: mp_to_complex(poly_ifft_mp(
+                [x / y for x, y in zip(poly_fft_mp(a, mp_dps), poly_fft_mp(b, mp_dps))], mp_dps)),
+        }
+        return lambda: [poly_mul_mp(a, b, mp_dps) for a, b in zip(f, g)], ops
+    raise ValueError(f"Unsupported poly engine: {engine}")
+
+
+def _rel(a, b) -> float:
+    return float(np.linalg.norm(a - b) / np.linalg.norm(b))
+
+
+def bench_poly(args) -> list:
+    results = []
+    for n in [int(v) for v in args.n_list.split(",")]:
+        rng = np.random.default_rng(args.seed)
+        bmax = max(int(b) for b in args.batch_list.split(","))
+        # keygen 류 정수 계수 (f, g ~ round(N(0, sigma)))
+        F = np.rint(rng.normal(0.0, args.sigma, (bmax, n)))
+        G = np.rint(rng.normal(0.0, args.sigma, (bmax, n)))
+        exact = np.array([negacyclic_convolve(a, b) for a, b in zip(F, G)], dtype=np.float64)
+        f0, g0, h0 = F[0], G[0], exact[0]
+        # 기준: mpmath 경로 (곱 / round trip / (f*g)/g)
+        ref_mul = mp_to_complex(poly_mul_mp(f0, g0, args.mp_dps))
+        ref_rt = mp_to_complex(poly_ifft_mp(poly_fft_mp(f0, args.mp_dps), args.mp_dps))
+        for engine in args.engines.split(","):
+            if engine == "mp" and n > args.mp_max_n:
+                continue
+            Is = [int(i) for i in args.I_list.split(",")] if engine == "qx" else [None]
+            for I in Is:
+                if I is not None and I >= args.word_bits:
+                    continue
+                for batch in [int(b) for b in args.batch_list.split(",")]:
+                    if engine == "mp" and batch > 1:
+                        continue
+                    fn, ops = _poly_setup(engine, F[:batch], G[:batch], I, args.word_bits, args.mp_dps)
+                    fn()                                          # twiddle / psi 표 생성 (untimed)
+                    st = time_trials(fn, batch, args.warmup, args.trials, args.min_time)
+                    mul = ops["mul"](f0, g0)
+                    row = {"engine": engine, "n": n, "I": I,
+                           "word_bits": args.word_bits if I is not None else None, "batch": batch,
+                           **st, "products_per_sec": 1e9 / st["median_ns"],
+                           "mul_relL2": _rel(mul, ref_mul),
+                           "rt_relL2": _rel(ops["rt"](f0), ref_rt),
+                           "div_relL2": _rel(ops["div"](h0, g0), ref_rt),
+                           "mul_max_abs_err": float(np.max(np.abs(mul - h0))),
+                           # 정수 계수로 반올림했을 때 exact 곱과 일치하는지 (서명 datapath 기준)
+                           "mul_round_exact": bool(np.array_equal(np.rint(mul.real), h0)),
+                           "mp_dps": args.mp_dps}
+                    results.append(row)
+                    tag = f"Q{I}.{args.word_bits - I}" if I is not None else ""
+                    print(f"{engine:<5s} n={n:<5d} {tag:<7s} batch={batch:<4d} "
+                          f"{st['median_ns'] / 1e3:>10.1f} µs/product  {row['products_per_sec']:>9.4g} prod/s  "
+                          f"mul {row['mul_relL2']:.2e}  rt {row['rt_relL2']:.2e}  div {row['div_relL2']:.2e}  "
+                          f"{'exact' if row['mul_round_exact'] else 'INEXACT'}", flush=True)
+    return results
+
+
+# --- ffSampling (cached ffLDL* tree + signature-batched sampling) ---
+FFS_KEY = ("engine", "n", "I", "word_bits", "batch")
+
+
+def bench_ffsampling(args) -> list:
+    results = []
+    for n in [int(v) for v in args.n_list.split(",")]:
+        key = synthetic_key(n, args.seed)
+        ref64 = TREES.get(key, "fp64")                         # sigma (leaf 최대 = SIGMA_MAX) 기준
+        sigma = ref64.sigma
+        ref = TREES.get(key, "mp", sigma=sigma, mp_dps=args.mp_dps) if n <= args.mp_max_n else ref64
+        ref_l10 = ref.l10_complex()
+        rng = np.random.default_rng(args.seed + 1)
+        bmax = max(int(b) for b in args.batch_list.split(","))
+        c = rng.integers(-(FALCON_Q // 2), FALCON_Q // 2 + 1, (bmax, n))
+        # FP64 경로 z (같은 seed) — Q 경로와 계수 단위 비교
+        z64 = [z_coefficients(z, ref64.ops)
+               for z in ff_sampling(ref64, *targets(key, c, ref64.ops), np.random.default_rng(args.seed),
+                                    leaf_sampler(ref64, args.leaf, args.base, args.exp))]
+        for engine in args.engines.split(","):
+            Is = [int(i) for i in args.I_list.split(",")] if engine == "qx" else [None]
+            for I in Is:
+                if I is not None and I >= args.word_bits:
+                    continue
+                q = QCtx(I, args.word_bits) if I is not None else None
+                tree = TREES.get(key, engine, q, sigma)
+                if args.leaf == "samplerz":
+                    try:
+                        check_sigma(tree.leaf_sigma)
+                    except ValueError as e:
+                        # Q-format leaf 가 SIGMA_MAX 를 넘으면 SamplerZ 분포가 틀어짐 → 이 I 는 건너뜀
+                        print(f"⚠️  {engine} n={n} I={I}: {e} (leaf rounding); skipped", flush=True)
+                        continue
+                t0, t1 = targets(key, c, tree.ops)
+                lstats = {}
+                zc = [z_coefficients(z, tree.ops)
+                      for z in ff_sampling(tree, t0, t1, np.random.default_rng(args.seed),
+                                           leaf_sampler(tree, args.leaf, args.base, args.exp, lstats))]
+                sq = signature_sqnorm(key, c, *zc)
+                dev = {
+                    "tree_ref": ref.engine,
+                    "l10_relL2": float(np.linalg.norm(tree.l10_complex() - ref_l10) / np.linalg.norm(ref_l10)),
+                    "leaf_max_rel": float(np.max(np.abs(tree.leaf_sigma / ref.leaf_sigma - 1.0))),
+                    "z_mismatch": float(np.mean(np.concatenate([zc[0] != z64[0], zc[1] != z64[1]]))),
+                    "s_norm_ratio": float(np.mean(sq) / (2 * n * sigma * sigma)),
+                    "leaf": args.leaf,
+                    "leaf_acceptance": lstats["accepted"] / lstats["proposals"] if lstats else None,
+                }
+                for batch in [int(b) for b in args.batch_list.split(",")]:
+                    tb0, tb1 = t0[:batch], t1[:batch]
+                    srng = np.random.default_rng(args.seed)
+                    leaf = leaf_sampler(tree, args.leaf, args.base, args.exp)
+                    fn = lambda: ff_sampling(tree, tb0, tb1, srng, leaf)
+                    st = time_trials(fn, batch, args.warmup, args.trials, args.min_time)
+                    row = {"engine": engine, "n": n, "I": I,
+                           "word_bits": args.word_bits if I is not None else None, "batch": batch,
+                           **st, "signatures_per_sec": 1e9 / st["median_ns"],
+                           "leaf_samples_per_sec": 2 * n * 1e9 / st["median_ns"],
+                           "tree_bytes": tree.nbytes, "tree_build_ms": tree.build_s * 1e3,
+                           "sigma": sigma, **dev}
+                    results.append(row)
+                    tag = f"Q{I}.{args.word_bits - I}" if I is not None else ""
+                    print(f"{engine:<5s} n={n:<5d} {tag:<7s} batch={batch:<4d} "
+                          f"{st['median_ns'] / 1e3:>10.1f} µs/sig  {row['signatures_per_sec']:>8.4g} sig/s  "
+                          f"tree {row['tree_bytes'] / 1024:.1f} KiB ({row['tree_build_ms']:.1f} ms)  "
+                          f"l10 {dev['l10_relL2']:.2e} vs {dev['tree_ref']}  z≠fp64 {dev['z_mismatch']:.2e}  "
+                          f"|s|²/2nσ² {dev['s_norm_ratio']:.3f}", flush=True)
+    print(f"\n🌳 tree cache: {TREES.stats()}")
+    return results
+
+
+# --- Kyber / Dilithium NTT (ntt_module): forward / inverse / polynomial products ---
+NTT_KEY = ("engine", "q", "batch")
+NTT_ENGINES = REDUCTIONS + ("ref",)
+
+
+def _ntt_setup(engine, p, a, b):
+    """-> (forward, inverse, product) callables over the batch"""
+    if engine == "ref":
+        return (lambda: [ntt_ref(x, p) for x in a], lambda: [intt_ref(x, p) for x in a],
+                lambda: [poly_mul_ref(x, y, p.q) for x, y in zip(a, b)])
+    A = ntt_np(a, p, engine)
+    return (lambda: ntt_np(a, p, engine), lambda: intt_np(A, p, engine),
+            lambda: poly_mul_ntt(a, b, p, engine))
+
+
+def bench_ntt(args) -> list:
+    results = []
+    bad = doc_zetas_mismatch()
+    if bad:
+        print(f"⚠️  Kyber_NTT_ISA_Integration_v0_3.md zetas[]: {len(bad)}/128 entries differ from "
+              f"mont(17^brv7(k)) (first k={bad[0]}); validating against the computed table\n")
+    for q in [int(v) for v in args.q_list.split(",")]:
+        p = ntt_params(q)
+        bmax = max(int(b) for b in args.batch_list.split(","))
+        a, b = random_poly(p, bmax, args.seed), random_poly(p, bmax, args.seed + 1)
+        nchk = min(args.check_n, bmax)
+        ref = np.array([ntt_ref(x, p) for x in a[:nchk]])
+        ref_mul = np.array([poly_mul_ref(x, y, q) for x, y in zip(a[:2], b[:2])])
+        for engine in args.engines.split(","):
+            if engine not in NTT_ENGINES:
+                raise ValueError(f"Unsupported NTT engine: {engine}")
+            for batch in [int(v) for v in args.batch_list.split(",")]:
+                if engine == "ref" and batch > args.ref_max_batch:
+                    continue
+                fwd, inv, mul = _ntt_setup(engine, p, a[:batch], b[:batch])
+                st = time_trials(fwd, batch, args.warmup, args.trials, args.min_time)
+                st_inv = time_trials(inv, batch, args.warmup, args.trials, args.min_time)
+                st_mul = time_trials(mul, batch, args.warmup, args.trials, args.min_time)
+                row = {"engine": engine, "q": q, "scheme": p.name, "n": p.n, "layers": p.layers,
+                       "batch": batch, **st, "ntt_per_sec": 1e9 / st["median_ns"],
+                       "intt_median_ns": st_inv["median_ns"], "intt_per_sec": 1e9 / st_inv["median_ns"],
+                       "mul_median_ns": st_mul["median_ns"], "mul_per_sec": 1e9 / st_mul["median_ns"],
+                       "butterflies_per_sec": p.layers * (p.n >> 1) * 1e9 / st["median_ns"]}
+                if engine != "ref":
+                    rstats = {}
+                    A = ntt_np(a[:nchk], p, engine, rstats)
+                    # bit-exact: pure-Python ntt_ref / schoolbook 곱과 계수 단위로 비교
+                    row["ntt_mismatch"] = int(np.count_nonzero(A != ref))
+                    row["intt_roundtrip_mismatch"] = int(np.count_nonzero(intt_np(A, p, engine) != a[:nchk]))
+                    row["mul_mismatch"] = int(np.count_nonzero(poly_mul_ntt(a[:2], b[:2], p, engine) != ref_mul))
+                    row["rtl_sum_overflow"] = rstats.get("rtl_sum_overflow")
+                results.append(row)
+                chk = ("" if engine == "ref" else
+                       f"mismatch ntt {row['ntt_mismatch']} rt {row['intt_roundtrip_mismatch']} "
+                       f"mul {row['mul_mismatch']}")
+                print(f"{engine:<10s} q={q:<8d} batch={batch:<5d} {st['median_ns'] / 1e3:>9.2f} µs/ntt  "
+                      f"{row['ntt_per_sec']:>9.4g} ntt/s  {row['intt_per_sec']:>9.4g} intt/s  "
+                      f"{row['mul_per_sec']:>9.4g} mul/s  {chk}", flush=True)
+    return results
+
+
+def check_ntt(args, results) -> int:
+    bad = [r for r in results if r.get("ntt_mismatch") or r.get("intt_roundtrip_mismatch") or r.get("mul_mismatch")]
+    for r in bad:
+        print(f"❌ {r['engine']} q={r['q']} batch={r['batch']}: not bit-exact vs the pure-Python reference")
+    return 1 if bad else 0
+
+
+# --- SamplerZ(mu, sigma') on arrays of centers / sigmas ---
+SAMPLERZ_KEY = ("sampler", "base", "exp", "batch")
+
+
+def bench_samplerz(args) -> list:
+    results = []
+    lo_s = args.sigma_lo or SIGMA_MIN[512]
+    rng = np.random.default_rng(args.seed)
+    # 분포 검사용 고정 (mu, sigma) 몇 개 — 통계적 TV (표본 수 args.check_n)
+    checks = [(0.0, lo_s), (0.5, SIGMA_MAX), (-7.3, 0.5 * (lo_s + SIGMA_MAX)), (123.77, lo_s)]
+    configs = [("samplerz", b, e) for b in args.bases.split(",") for e in args.exps.split(",")]
+    if args.window:
+        configs.append(("window", None, None))
+    for kind, base, exp in configs:
+        def draw(mu, sg, r, stats=None):
+            if kind == "window":
+                return sample_leaf_rejection(mu, sg, r)
+            return sampler_z(mu, sg, r, base, lo_s, exp, stats)
+        tv = 0.0
+        for mu, sg in checks:
+            z = draw(np.full(args.check_n, mu), sg, np.random.default_rng(args.seed))
+            a = int(np.floor(mu)) - 16
+            p = dgauss_pmf(mu, sg, a, a + 33)
+            e = np.bincount(np.clip(z - a, 0, 33), minlength=34) / len(z)
+            tv = max(tv, 0.5 * float(np.abs(e - p).sum()))
+        for batch in [int(float(b)) for b in args.batch_sizes.split(",")]:
+            mu = rng.uniform(-args.mu_range, args.mu_range, batch)
+            sg = rng.uniform(lo_s, SIGMA_MAX, batch)
+            st = {}
+            draw(mu, sg, np.random.default_rng(args.seed), st)
+            srng = np.random.default_rng(args.seed)
+            res = time_trials(lambda: draw(mu, sg, srng), batch, args.warmup, args.trials, args.min_time)
+            row = {"sampler": kind, "base": base, "exp": exp, "batch": batch, **res,
+                   "acceptance": st["accepted"] / st["proposals"] if st else None,
+                   "rounds": st.get("rounds"), "tv_max": tv, "check_n": args.check_n}
+            results.append(row)
+            acc = f"acc {row['acceptance']:.3f} ({row['rounds']} rounds)" if st else ""
+            print(f"{kind:<8s} {str(base):<9s} {str(exp):<6s} batch={batch:<8d} "
+                  f"{res['median_ns']:>8.1f} ns/sample  {res['per_sec']:>10.4g}/s  {acc:<22s} TV {tv:.4f}",
+                  flush=True)
+    return results
+
+
+# --- CLI startup ---
+STARTUP_KEY = ("target",)
+# 시작 경로에서 import 되면 안 되는 모듈 (plot / mpmath 기준값 / 해시 경로에서만 로드)
+LAZY_MODULES = ("matplotlib", "mpmath", "hashlib")
+STARTUP_TARGETS = {
+    "import": ["-c", "import falcon_validate.main"],
+    "help": ["-m", "falcon_validate.main", "--help"],
+    "bench_help": ["-m", "falcon_validate.bench", "--help"],
+}
+
+
+def _py_env() -> tuple[str, dict]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    return root, env
+
+
+def startup_loaded(module: str = "falcon_validate.main") -> list:
+    """LAZY_MODULES already in sys.modules after a fresh `import module`"""
+    root, env = _py_env()
+    code = (f"import sys, json, {module}; "
+            f"print(json.dumps([m for m in {list(LAZY_MODULES)!r} if m in sys.modules]))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out)
+
+
+def bench_startup(args) -> list:
+    root, env = _py_env()
+    results = []
+    for target in args.targets.split(","):
+        cmd = [sys.executable, *STARTUP_TARGETS[target]]
+        def fn():
+            subprocess.run(cmd, cwd=root, env=env, check=True, stdout=subprocess.DEVNULL)
+        for _ in range(args.warmup):
+            fn()
+        ns = []
+        for _ in range(args.trials):                 # process 단위라 inner loop 보정 없음
+            t0 = time.perf_counter_ns()
+            fn()
+            ns.append(time.perf_counter_ns() - t0)
+        st = summarize(ns)
+        results.append({"target": target, **st})
+        print(f"{target:<11s} {st['median_ns'] / 1e6:>9.1f} ms  [p5 {st['p5_ns'] / 1e6:.1f}, "
+              f"p95 {st['p95_ns'] / 1e6:.1f}]", flush=True)
+    return results
+
+
+def check_startup(args, results) -> int:
+    rc = 0
+    loaded = startup_loaded()
+    if loaded:
+        print(f"❌ eagerly imported by falcon_validate.main: {', '.join(loaded)}")
+        rc = 1
+    else:
+        print(f"✅ lazy: {', '.join(LAZY_MODULES)} not imported at startup")
+    if args.max_ms:
+        for r in results:
+            if r["median_ns"] / 1e6 > args.max_ms:
+                print(f"❌ {r['target']}: median {r['median_ns'] / 1e6:.1f} ms > {args.max_ms:g} ms")
+                rc = 1
+    return rc
+
+
+def _run(kind, bench_func, key_fields, args, extra_metrics=(), check=None) -> int:
+    results = bench_func(args)
+    path = write_results(kind, results, args, args.out)
+    print(f"\n📄 {kind} results → {path}")
+    rc = check(args, results) if check else 0
+    if args.compare:
+        base = _load(args.compare)["results"]
+        rows = compare_results(base, results, key_fields, threshold=args.threshold)
+        # 결정적 지표 (예: relL2) 는 trial 분산 없이 비율만으로 판정
+        for m in extra_metrics:
+            rows += compare_results(base, results, key_fields, metric=m, threshold=args.threshold,
+                                    spread=False)
+        return 1 if report_compare(rows, key_fields, args.threshold) else rc
+    return rc
+
+
+def _common(sp):
+    sp.add_argument("--warmup", type=int, default=2)
+    sp.add_argument("--trials", type=int, default=7)
+    sp.add_argument("--min_time", type=float, default=0.05,
+        help="seconds per trial; small workloads are repeated inside a trial to reach it")
+    sp.add_argument("--out", type=str, default=None, help="results JSON (default bench_<kind>_<ts>.json)")
+    sp.add_argument("--compare", type=str, default=None, help="baseline JSON to compare against")
+    sp.add_argument("--threshold", type=float, default=0.10, help="regression threshold on median ratio")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m falcon_validate.bench")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    sp = sub.add_parser("samplers", help="discrete Gaussian samplers (sample_batch), setup excluded")
+    sp.add_argument("--sampler_list", type=str, default=",".join(SAMPLER_VARIANTS))
+    sp.add_argument("--sigma_list", type=str, default="1.5")
+    sp.add_argument("--batch_sizes", type=str, default="1,10,100,1e3,1e4,1e5,1e6,1e7")
+    sp.add_argument("--mp_dps", type=int, default=33)
+    sp.add_argument("--I", type=int, default=12)
+    sp.add_argument("--word_bits", type=int, default=64, choices=QCtx.WORD_BITS)
+    sp.add_argument("--seed", type=int, default=0)
+    _common(sp)
+    sp.set_defaults(func=lambda a: _run("samplers", bench_samplers, SAMPLER_KEY, a))
+
+    sp = sub.add_parser("fft", help="FFT engines per transform: time, butterflies/s, peak memory, relL2")
+    sp.add_argument("--engines", type=str, default="qx,fp64,mp,dd",
+        help=f"comma-separated subset of {','.join(FFT_ENGINES)}")
+    sp.add_argument("--N_list", type=str, default="64,128,256,512,1024,2048,4096,8192,16384")
+    sp.add_argument("--I_list", type=str, default="8,10,12,16,32")
+    sp.add_argument("--word_bits", type=int, default=64, choices=QCtx.WORD_BITS)
+    sp.add_argument("--mp_dps", type=int, default=33)
+    sp.add_argument("--ref_engine", type=str, default="dd", choices=REF_ENGINES,
+        help="reference for relL2 (dd: double-double, fast at large N)")
+    sp.add_argument("--mp_max_n", type=int, default=1024, help="skip the mp engine above this N")
+    sp.add_argument("--scalar_max_n", type=int, default=1024,
+        help="skip qx_scalar (and the scalar bit-exact check of qx kernels) above this N")
+    sp.add_argument("--kernels", type=str, default="radix2",
+        help=f"qx engine kernels: comma-separated subset of {','.join(FFT_KERNELS)}")
+    sp.add_argument("--scalings", type=str, default="fixed",
+        help=f"qx engine scaling: {', '.join(FFT_SCALINGS)} (bfp: block floating point per stage)")
+    sp.add_argument("--seed", type=int, default=0)
+    _common(sp)
+    sp.set_defaults(func=lambda a: _run("fft", bench_fft, FFT_KEY, a, extra_metrics=("relL2",), check=check_fft))
+
+    sp = sub.add_parser("poly", help="Falcon polynomial products mod x^n+1: products/s, error vs mpmath path")
+    sp.add_argument("--engines", type=str, default="qx,fp64,mp",
+        help=f"comma-separated subset of {','.join(POLY_ENGINES)}")
+    sp.add_argument("--n_list", type=str, default="256,512,1024")
+    sp.add_argument("--I_list", type=str, default="16,20,24,32")
+    sp.add_argument("--word_bits", type=int, default=64, choices=QCtx.WORD_BITS)
+    sp.add_argument("--batch_list", type=str, default="1,16",
+        help="polynomial pairs per call (leading batch axis of the Q / FP64 paths)")
+    sp.add_argument("--sigma", type=float, default=4.05,
+        help="coefficient std-dev of f, g (Falcon-512 keygen: 1.17*sqrt(q/2n) ~ 4.05)")
+    sp.add_argument("--mp_dps", type=int, default=33)
+    sp.add_argument("--mp_max_n", type=int, default=1024, help="skip the mp engine above this n")
+    sp.add_argument("--seed", type=int, default=0)
+    _common(sp)
+    sp.set_defaults(func=lambda a: _run("poly", bench_poly, POLY_KEY, a, extra_metrics=("mul_relL2",)))
+
+    sp = sub.add_parser("ffsampling", help="Falcon ffSampling over a cached ffLDL* tree: sig/s, tree memory, "
+                                           "deviation vs FP64 / mpmath trees")
+    sp.add_argument("--engines", type=str, default="qx,fp64")
+    sp.add_argument("--n_list", type=str, default="512,1024")
+    sp.add_argument("--I_list", type=str, default="20,24")
+    sp.add_argument("--word_bits", type=int, default=64, choices=QCtx.WORD_BITS)
+    sp.add_argument("--batch_list", type=str, default="1,16", help="signatures per ffSampling call")
+    sp.add_argument("--mp_dps", type=int, default=40)
+    sp.add_argument("--mp_max_n", type=int, default=1024,
+        help="mpmath reference tree up to this n (FP64 tree above)")
+    sp.add_argument("--seed", type=int, default=0, help="synthetic key / hash / sampler seed")
+    sp.add_argument("--leaf", type=str, default="samplerz", choices=LEAF_SAMPLERS)
+    sp.add_argument("--base", type=str, default="cdt", choices=BASE_VARIANTS,
+        help="SamplerZ base half-Gaussian table")
+    sp.add_argument("--exp", type=str, default="falcon", choices=EXP_MODES,
+        help="BerExp: falcon (63-bit fixed-point ApproxExp) or fp64 exp")
+    _common(sp)
+    sp.set_defaults(func=lambda a: _run("ffsampling", bench_ffsampling, FFS_KEY, a,
+                                        extra_metrics=("l10_relL2",)))
+
+    sp = sub.add_parser("samplerz", help="batched SamplerZ(mu, sigma'): samples/s, acceptance rate, TV check")
+    sp.add_argument("--bases", type=str, default=",".join(BASE_VARIANTS))
+    sp.add_argument("--exps", type=str, default=",".join(EXP_MODES))
+    sp.add_argument("--batch_sizes", type=str, default="1,100,1e4,1e6")
+    sp.add_argument("--mu_range", type=float, default=64.0, help="centers uniform in [-r, r]")
+    sp.add_argument("--sigma_lo", type=float, default=None,
+        help="sigmas uniform in [sigma_lo, SIGMA_MAX]; also SamplerZ sigma_min (default Falcon-512)")
+    sp.add_argument("--check_n", type=int, default=100000, help="samples per fixed (mu, sigma) TV check")
+    sp.add_argument("--no_window", dest="window", action="store_false",
+        help="skip the window-rejection baseline (pre-SamplerZ ffSampling leaf sampler)")
+    sp.add_argument("--seed", type=int, default=0)
+    _common(sp)
+    sp.set_defaults(func=lambda a: _run("samplerz", bench_samplerz, SAMPLERZ_KEY, a))
+
+    sp = sub.add_parser("ntt", help="Kyber / Dilithium NTT: NTTs/s, products/s, bit-exact vs pure-Python ref")
+    sp.add_argument("--engines", type=str, default=",".join(NTT_ENGINES),
+        help=f"comma-separated subset of {','.join(NTT_ENGINES)} (rtl: montgomery_mult16 / ntt_butterfly model)")
+    sp.add_argument("--q_list", type=str, default=",".join(str(q) for q in NTT_PARAMS))
+    sp.add_argument("--batch_list", type=str, default="1,64,1024", help="polynomials per call")
+    sp.add_argument("--ref_max_batch", type=int, default=1, help="skip the pure-Python ref above this batch")
+    sp.add_argument("--check_n", type=int, default=64, help="polynomials compared against ntt_ref")
+    sp.add_argument("--seed", type=int, default=0)
+    _common(sp)
+    sp.set_defaults(func=lambda a: _run("ntt", bench_ntt, NTT_KEY, a, check=check_ntt))
+
+    sp = sub.add_parser("startup", help="CLI cold start in fresh interpreters + lazy-import check")
+    sp.add_argument("--targets", type=str, default=",".join(STARTUP_TARGETS),
+        help=f"comma-separated subset of {','.join(STARTUP_TARGETS)}")
+    sp.add_argument("--max_ms", type=float, default=0,
+        help="fail if a target's median wall time exceeds this (0 = no budget)")
+    _common(sp)
+    sp.set_defaults(func=lambda a: _run("startup", bench_startup, STARTUP_KEY, a, check=check_startup))
+
+    args = p.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
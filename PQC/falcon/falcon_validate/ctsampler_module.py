@@ -0,0 +1,129 @@
+# falcon_validate/ctsampler_module.py
+# Constant-time CDT sampler: fixed-point (72-bit, 3x24-bit limb) tables, full-table
+# branch-free scan, and a dudect-style timing-leak benchmark
+
+from __future__ import annotations
+import math
+import time
+import numpy as np
+
+
+def ct_cdt_table(pmf, bits: int = 72, limb_bits: int = 24, frac_bits: int | None = None) -> np.ndarray:
+    """CDT entries floor(2^frac_bits * CDF(i)), i = 0..n-2, left-aligned to `bits` and split into
+    limbs (MS limb first); frac_bits = bits by default"""
+    import mpmath as mp
+    if bits % limb_bits:
+        raise ValueError(f"bits={bits} is not a multiple of limb_bits={limb_bits}")
+    frac_bits = bits if frac_bits is None else frac_bits
+    L = bits // limb_bits
+    mask = (1 << limb_bits) - 1
+    scale = mp.mpf(2) ** frac_bits
+    acc = mp.mpf(0)
+    rows = []
+    for p in pmf[:-1]:
+        acc += mp.mpf(p)
+        c = min(int(mp.floor(acc * scale)), (1 << frac_bits) - 1) << (bits - frac_bits)
+        rows.append([(c >> (limb_bits * (L - 1 - l))) & mask for l in range(L)])
+    return np.array(rows, dtype=np.int64).reshape(len(rows), L)
+
+
+def ct_cdt_table_q(pmf, q, limb_bits: int = 24) -> np.ndarray:
+    """Qx CDT: floor(CDF(i) * q.QONE), i.e. the QCtx fraction (q.F bits), in ceil(F / limb_bits) limbs"""
+    bits = -(-q.F // limb_bits) * limb_bits
+    return ct_cdt_table(pmf, bits, limb_bits, frac_bits=q.F)
+
+
+def table_to_ints(table: np.ndarray, limb_bits: int = 24) -> list[int]:
+    out = []
+    for row in table.tolist():
+        v = 0
+        for limb in row:
+            v = (v << limb_bits) | limb
+        out.append(v)
+    return out
+
+
+def ct_cdt_kernel(table: np.ndarray, u: np.ndarray, chunk: int = 4096) -> np.ndarray:
+    """Index = #{i : u >= c_i}; every entry compared via limb borrow chain, no early exit"""
+    n, L = u.shape
+    out = np.empty(n, dtype=np.int64)
+    for s in range(0, n, chunk):
+        uc = u[s:s + chunk]
+        borrow = np.zeros((len(uc), table.shape[0]), dtype=np.int64)
+        for l in range(L - 1, -1, -1):
+            # (u_l - c_l - borrow) < 0  ⇔  borrow out (sign bit, branch-free)
+            borrow = ((uc[:, l, None] - table[None, :, l] - borrow) >> 63) & 1
+        out[s:s + chunk] = table.shape[0] - borrow.sum(axis=1)
+    return out
+
+
+def ct_cdt_sample(table: np.ndarray, n: int, rng, limb_bits: int = 24) -> np.ndarray:
+    u = rng.integers(0, 1 << limb_bits, size=(n, table.shape[1]), dtype=np.int64)
+    return ct_cdt_kernel(table, u)
+
+
+# --- timing-leak benchmark (dudect-style Welch t-test) ---
+def _limbs_for_range(lo: int, hi: int, count: int, rng, L: int, limb_bits: int) -> np.ndarray:
+    """count uniform values in [lo, hi) as limb rows"""
+    mask = (1 << limb_bits) - 1
+    span = hi - lo
+    rows = []
+    for _ in range(count):
+        r = 0
+        for w in rng.integers(0, 1 << 62, size=(L * limb_bits + 62) // 62 + 1).tolist():
+            r = (r << 62) | w
+        v = lo + r % span
+        rows.append([(v >> (limb_bits * (L - 1 - l))) & mask for l in range(L)])
+    return np.array(rows, dtype=np.int64)
+
+
+def welch_t(a, b) -> float:
+    a = np.asarray(a, dtype=np.float64); b = np.asarray(b, dtype=np.float64)
+    den = math.sqrt(a.var(ddof=1) / len(a) + b.var(ddof=1) / len(b))
+    return float((a.mean() - b.mean()) / den) if den > 0 else 0.0
+
+
+def timing_leak_benchmark(pmf, k_max: int, bits: int = 72, limb_bits: int = 24,
+                          batch: int = 256, reps: int = 200, seed: int = 0) -> dict:
+    """Per-output-value latency distributions + Welch t vs random-input class (|t| > 4.5 = leak)"""
+    rng = np.random.default_rng(seed)
+    table = ct_cdt_table(pmf, bits, limb_bits)
+    L = table.shape[1]
+    edges = [0] + table_to_ints(table, limb_bits) + [1 << bits]
+    classes = {"random": None}
+    for idx in range(len(edges) - 1):
+        if edges[idx + 1] > edges[idx]:
+            classes[idx - k_max] = _limbs_for_range(edges[idx], edges[idx + 1], batch, rng, L, limb_bits)
+    timings = {c: [] for c in classes}
+    order = [c for c in classes for _ in range(reps)]
+    rng.shuffle(order)                                  # class 간 drift 방지: 무작위 interleave
+    for c in order:
+        u = classes[c]
+        if u is None:
+            u = rng.integers(0, 1 << limb_bits, size=(batch, L), dtype=np.int64)
+        t0 = time.perf_counter_ns()
+        ct_cdt_kernel(table, u)
+        timings[c].append((time.perf_counter_ns() - t0) / batch)
+    ref = timings["random"]
+    per_value = {}
+    for c, ts in timings.items():
+        ts = np.asarray(ts)
+        per_value[str(c)] = {
+            "median_ns": float(np.median(ts)),
+            "p5_ns": float(np.percentile(ts, 5)),
+            "p95_ns": float(np.percentile(ts, 95)),
+            "t_vs_random": 0.0 if c == "random" else welch_t(ts, ref),
+        }
+    # throughput: constant-time scan vs searchsorted CDT (float CDF)
+    n = batch * 64
+    t0 = time.perf_counter_ns(); ct_cdt_sample(table, n, rng, limb_bits); t1 = time.perf_counter_ns()
+    cdf = np.cumsum(np.array([float(p) for p in pmf], dtype=np.float64))
+    t2 = time.perf_counter_ns(); np.searchsorted(cdf, rng.random(n), side="right"); t3 = time.perf_counter_ns()
+    max_t = max(abs(v["t_vs_random"]) for v in per_value.values())
+    return {
+        "bits": bits, "limb_bits": limb_bits, "table_entries": int(table.shape[0]),
+        "table_bytes": int(table.shape[0] * bits // 8),
+        "ct_ns_per_sample": (t1 - t0) / n, "cdt_ns_per_sample": (t3 - t2) / n,
+        "max_abs_t": max_t, "leak_suspected": bool(max_t > 4.5),
+        "per_value": per_value,
+    }
@@ -0,0 +1,351 @@
+# falcon_validate/ffsampling_module.py
+# Falcon fast Fourier sampling: ffLDL* tree of the basis Gram matrix (built level by level as
+# compact (2^l, n >> l) arrays, cached per key) and signature-batched ffSampling, in Q-format
+# (QCtx / fft_q_np) with FP64 and mpmath reference backends
+
+from __future__ import annotations
+import sys
+import math
+import time
+import operator
+from collections import OrderedDict
+import numpy as np
+from .qformat_module import QCtx, QcArray
+from .poly_module import (poly_to_q, poly_fft_q, split_fft_q, merge_fft_q,
+                          poly_fft_fp64, poly_ifft_fp64, poly_fft_mp, psi_fp64, psi_mp,
+                          negacyclic_convolve)
+from .samplerz_module import SIGMA_MAX, SIGMA_MIN, samplerz_leaf
+from .trace_module import span
+
+FALCON_Q = 12289
+LEAF_SAMPLERS = ("samplerz", "rejection")
+TREE_ENGINES = ("qx", "fp64", "mp")
+
+
+# --- key ---
+def synthetic_key(n: int, seed: int = 0, q: int = FALCON_Q, sigma_fg: float | None = None) -> dict:
+    """(f, g, F, G) with f, g ~ round(N(0, 1.17*sqrt(q/2n))) and (F, G) the rounded continuous
+    solution q*(-adj g, adj f) / (f adj f + g adj g): fG - gF ~ q, Falcon-like Gram-Schmidt shape
+    (NTRUSolve 는 하지 않음 — tree / sampling 수치 검증용)"""
+    rng = np.random.default_rng(seed)
+    sigma_fg = sigma_fg or 1.17 * math.sqrt(q / (2 * n))
+    f = np.rint(rng.normal(0.0, sigma_fg, n)).astype(np.int64)
+    g = np.rint(rng.normal(0.0, sigma_fg, n)).astype(np.int64)
+    fh, gh = poly_fft_fp64(f), poly_fft_fp64(g)
+    den = (fh * np.conj(fh) + gh * np.conj(gh)).real
+    F = np.rint(poly_ifft_fp64(-q * np.conj(gh) / den).real).astype(np.int64)
+    G = np.rint(poly_ifft_fp64(q * np.conj(fh) / den).real).astype(np.int64)
+    return {"f": f, "g": g, "F": F, "G": G}
+
+
+def key_id(key: dict) -> str:
+    from .hash_module import payload_sha256
+    return payload_sha256({k: np.asarray(key[k], dtype=np.int64) for k in ("f", "g", "F", "G")})[:24]
+
+
+# --- backends: same tree / sampling code over QcArray or complex128 / mpc(object) arrays ---
+class _QOps:
+    def __init__(self, q: QCtx):
+        self.q = q
+        self.add, self.sub, self.mul, self.div, self.conj = q.cadd, q.csub, q.cmul, q.cdiv, q.cconj
+
+    def fft(self, x) -> QcArray:
+        return poly_fft_q(poly_to_q(x, self.q), self.q)
+
+    def split(self, F):
+        return split_fft_q(F, self.q)
+
+    def merge(self, F0, F1):
+        return merge_fft_q(F0, F1, self.q)
+
+    def interleave(self, a, b) -> QcArray:
+        m = a.re.shape[-1]
+        return QcArray(np.stack([a.re, b.re], axis=1).reshape(-1, m),
+                       np.stack([a.im, b.im], axis=1).reshape(-1, m))
+
+    def row(self, a, i):
+        return a[i:i + 1]
+
+    def width(self, a) -> int:
+        return a.re.shape[-1]
+
+    def real_f(self, a) -> np.ndarray:
+        return self.q.to_f_np(a.re)
+
+    def from_int(self, z) -> QcArray:
+        return QcArray(self.q.from_f_np(z), np.zeros(np.shape(z), dtype=self.q.dtype))
+
+    def to_complex(self, a) -> np.ndarray:
+        return self.q.to_f_np(a.re) + 1j * self.q.to_f_np(a.im)
+
+    def leaves(self, d, sigma: float):
+        # sigma / sqrt(d): 정수 isqrt (Q 값 d 의 sqrt = isqrt(d << F)) + Q-division
+        q = self.q
+        r = q.asarray([math.isqrt(int(v) << q.F) if v > 0 else 0 for v in d.re.ravel().tolist()])
+        lf = q.div_np(q.asarray(np.full(r.shape, q.from_f(sigma), dtype=object)), r)
+        return lf.reshape(d.re.shape)
+
+    def leaves_f(self, leaves) -> np.ndarray:
+        return self.q.to_f_np(leaves)
+
+
+class _ArrayOps:
+    def __init__(self, psi, sqrt, fft=None):
+        self.psi = psi
+        self._sqrt = sqrt
+        self._fft = fft
+        self.add, self.sub, self.mul, self.div = operator.add, operator.sub, operator.mul, operator.truediv
+        self.conj = np.conj
+
+    def fft(self, x):
+        return self._fft(x)
+
+    def split(self, F):
+        h = F.shape[-1] >> 1
+        a, b = F[..., :h], F[..., h:]
+        return (a + b) / 2, (a - b) / 2 * np.conj(self.psi(F.shape[-1])[1::2])
+
+    def merge(self, F0, F1):
+        t = F1 * self.psi(F0.shape[-1] << 1)[1::2]
+        return np.concatenate([F0 + t, F0 - t], axis=-1)
+
+    def interleave(self, a, b):
+        return np.stack([a, b], axis=1).reshape(-1, a.shape[-1])
+
+    def row(self, a, i):
+        return a[i:i + 1]
+
+    def width(self, a) -> int:
+        return a.shape[-1]
+
+    def real_f(self, a) -> np.ndarray:
+        if a.dtype != object:
+            return a.real.astype(np.float64)
+        return np.asarray([float(v.real) for v in a.ravel()]).reshape(a.shape)
+
+    def from_int(self, z):
+        return np.asarray(z, dtype=np.complex128)
+
+    def to_complex(self, a) -> np.ndarray:
+        if a.dtype != object:
+            return a.astype(np.complex128)
+        return np.asarray([complex(v) for v in a.ravel()], dtype=np.complex128).reshape(a.shape)
+
+    def leaves(self, d, sigma: float):
+        if d.dtype != object:
+            return sigma / np.sqrt(d.real)
+        return np.vectorize(lambda v: sigma / self._sqrt(v.real), otypes=[object])(d)
+
+    def leaves_f(self, leaves) -> np.ndarray:
+        return np.asarray(leaves, dtype=np.float64)
+
+
+def make_ops(engine: str, q: QCtx | None = None, mp_dps: int = 40):
+    if engine == "qx":
+        return _QOps(q)
+    if engine == "fp64":
+        return _ArrayOps(psi_fp64, math.sqrt, poly_fft_fp64)
+    if engine == "mp":
+        import mpmath as mp
+        psis = {}
+        def psi(n):
+            if n not in psis:
+                psis[n] = np.array(psi_mp(n, mp_dps), dtype=object)
+            return psis[n]
+        def fft(x):
+            return np.array([poly_fft_mp(row, mp_dps) for row in np.atleast_2d(x)], dtype=object)
+        return _ArrayOps(psi, mp.sqrt, fft)
+    raise ValueError(f"Unsupported tree engine: {engine}")
+
+
+# --- ffLDL* tree ---
+def _storage_bytes(a) -> int:
+    """Bytes held by a tree array; object arrays (Q128 ints, mpc) add each element's Python storage"""
+    if isinstance(a, QcArray):
+        return _storage_bytes(a.re) + _storage_bytes(a.im)
+    a = np.asarray(a)
+    if a.dtype != object:
+        return int(a.nbytes)
+    return int(a.nbytes) + sum(_obj_bytes(v) for v in a.flat)
+
+
+def _obj_bytes(v) -> int:
+    # mpf / mpc: 객체 + (sign, man, exp, bc) tuple 과 그 안의 int (mantissa)
+    parts = getattr(v, "_mpc_", None) or ((v._mpf_,) if hasattr(v, "_mpf_") else ())
+    return sys.getsizeof(v) + sum(sys.getsizeof(p) + sum(sys.getsizeof(x) for x in p) for p in parts)
+
+
+class FalconTree:
+    """levels[l]: l10 of the 2^l nodes at depth l, shape (2^l, n >> l); leaves: (n, 2) sigma / sqrt(d)"""
+    def __init__(self, engine, n, sigma, levels, leaves, ops, build_s):
+        self.engine = engine
+        self.n = n
+        self.sigma = sigma
+        self.levels = levels
+        self.leaves = leaves
+        self.ops = ops
+        self.leaf_sigma = ops.leaves_f(leaves)            # sampler 입력 (float)
+        self.build_s = build_s
+
+    @property
+    def depth(self) -> int:
+        return len(self.levels)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(_storage_bytes(lv) for lv in self.levels) + _storage_bytes(self.leaves)
+
+    def l10_complex(self) -> np.ndarray:
+        """All l10 values, level-major, as complex128 (deviation vs reference trees)"""
+        return np.concatenate([self.ops.to_complex(lv).ravel() for lv in self.levels])
+
+
+def gram(key: dict, ops):
+    """B = [[g, -f], [G, -F]] -> (g00, g01, g11) of B B* in the FFT domain, shape (1, n)"""
+    f, g, F, G = (ops.fft(np.asarray(key[k], dtype=np.float64)[None, :]) for k in ("f", "g", "F", "G"))
+    g00 = ops.add(ops.mul(g, ops.conj(g)), ops.mul(f, ops.conj(f)))
+    g01 = ops.add(ops.mul(g, ops.conj(G)), ops.mul(f, ops.conj(F)))
+    g11 = ops.add(ops.mul(G, ops.conj(G)), ops.mul(F, ops.conj(F)))
+    return g00, g01, g11
+
+
+def build_tree(key: dict, engine: str = "qx", q: QCtx | None = None, sigma: float | None = None,
+               mp_dps: int = 40) -> FalconTree:
+    """ffLDL* over all 2^l nodes of a level at once; sigma=None -> largest leaf = SIGMA_MAX"""
+    t0 = time.perf_counter()
+    ops = make_ops(engine, q, mp_dps)
+    n = len(key["f"])
+    g00, g01, g11 = gram(key, ops)
+    levels = []
+    while True:
+        l10 = ops.div(ops.conj(g01), g00)
+        d11 = ops.sub(g11, ops.mul(ops.mul(l10, ops.conj(l10)), g00))
+        levels.append(l10)
+        if ops.width(g00) == 1:
+            d = ops.interleave(g00, d11)                  # (n, 1) x 2 → leaf i: (d00, d11)
+            break
+        a0, a1 = ops.split(g00)
+        b0, b1 = ops.split(d11)
+        # 자식 2i (d00 에서), 2i+1 (d11 에서): Gram [[d0, d1], [adj d1, d0]]
+        g00 = ops.interleave(a0, b0)
+        g01 = ops.interleave(a1, b1)
+        g11 = g00
+    if sigma is None:
+        dmin = float(np.min(ops.real_f(d)))
+        sigma = SIGMA_MAX * math.sqrt(max(dmin, 0.0))
+    leaves = ops.leaves(d, sigma).reshape(n, 2)
+    return FalconTree(engine, n, sigma, levels, leaves, ops, time.perf_counter() - t0)
+
+
+class TreeStore:
+    """In-memory LRU of FalconTree per (key id, engine, word_bits, I, sigma, mp_dps)."""
+    def __init__(self, maxsize: int = 8):
+        self.maxsize = maxsize
+        self._mem = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses,
+                "bytes": sum(t.nbytes for t in self._mem.values())}
+
+    def get(self, key: dict, engine: str = "qx", q: QCtx | None = None, sigma: float | None = None,
+            mp_dps: int = 40) -> FalconTree:
+        k = (key_id(key), engine, q.W if q else None, q.I if q else None,
+             None if sigma is None else repr(float(sigma)), mp_dps if engine == "mp" else None)
+        if k in self._mem:
+            self._mem.move_to_end(k)
+            self.hits += 1
+            return self._mem[k]
+        with span(f"fftree.{engine}"):
+            tree = build_tree(key, engine, q, sigma, mp_dps)
+        self.misses += 1
+        self._mem[k] = tree
+        if len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+        return tree
+
+
+# 프로세스 공용 tree cache
+TREES = TreeStore()
+
+
+# --- leaf sampler: integers ~ D_{Z, mu, sigma} per element ---
+def sample_leaf_rejection(mu, sigma, rng, tail: float = 6.0, max_rounds=10000) -> np.ndarray:
+    """Vectorized window rejection: z uniform in floor(mu) +- ceil(tail*sigma), accept w.p.
+    exp(-(z-mu)^2 / 2 sigma^2)"""
+    mu = np.asarray(mu, dtype=np.float64)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=np.float64), mu.shape)
+    out = np.floor(mu).astype(np.int64)
+    w = np.ceil(tail * sigma).astype(np.int64)
+    active = np.arange(mu.size)
+    mu_f, sg_f, w_f, out_f = mu.ravel(), sigma.ravel(), w.ravel(), out.reshape(-1)
+    for _ in range(max_rounds):
+        m = len(active)
+        if m == 0:
+            break
+        z = out_f[active] + rng.integers(-w_f[active], w_f[active] + 1)
+        x = z - mu_f[active]
+        ok = rng.random(m) < np.exp(-x * x / (2 * sg_f[active] ** 2))
+        out_f[active[ok]] = z[ok]
+        active = active[~ok]
+    return out
+
+
+# --- signing ---
+def targets(key: dict, c, ops):
+    """t = (c, 0) B^-1 = c / det * (-F, f) in the FFT domain, c: (B, n) integer hashes"""
+    f, g, F, G = (ops.fft(np.asarray(key[k], dtype=np.float64)[None, :]) for k in ("f", "g", "F", "G"))
+    det = ops.sub(ops.mul(f, G), ops.mul(g, F))
+    u = ops.div(ops.fft(np.asarray(c, dtype=np.float64)), det)
+    return ops.mul(u, ops.fft(-np.asarray(key["F"], dtype=np.float64)[None, :])), ops.mul(u, f)
+
+
+def leaf_sampler(tree: FalconTree, kind: str = "samplerz", base: str = "cdt", exp: str = "falcon",
+                 stats: dict | None = None):
+    """(mu, sigma, rng) -> ints for the tree leaves; SamplerZ uses Falcon sigma_min for n (else min leaf)"""
+    if kind == "samplerz":
+        sigma_min = SIGMA_MIN.get(tree.n, float(np.min(tree.leaf_sigma)))
+        return samplerz_leaf(base, sigma_min, exp, stats)
+    if kind == "rejection":
+        return sample_leaf_rejection
+    raise ValueError(f"Unsupported leaf sampler: {kind}")
+
+
+def ff_sampling(tree: FalconTree, t0, t1, rng, sampler=None):
+    """Falcon ffSampling for a batch of targets (B, n) -> (z0, z1) in the FFT domain
+    (sampler=None: batched SamplerZ, base CDT + Falcon BerExp)"""
+    return _ffs(tree, tree.ops, t0, t1, 0, 0, rng, sampler or leaf_sampler(tree))
+
+
+def _ffs(tree, ops, t0, t1, lvl, i, rng, sampler):
+    l10 = ops.row(tree.levels[lvl], i)
+    if lvl == tree.depth - 1:
+        # m = 1: FFT 값 = 상수 계수 (실수) → leaf sampler 직접
+        sig = tree.leaf_sigma[i]
+        mu1 = ops.real_f(t1)[:, 0]
+        z1 = ops.from_int(sampler(mu1, np.full(mu1.shape, sig[1]), rng)[:, None])
+        t0p = ops.add(t0, ops.mul(ops.sub(t1, z1), l10))
+        mu0 = ops.real_f(t0p)[:, 0]
+        z0 = ops.from_int(sampler(mu0, np.full(mu0.shape, sig[0]), rng)[:, None])
+        return z0, z1
+    # 오른쪽 (T1 = node 2i+1) 먼저, 그 결과로 t0 갱신 후 왼쪽 (T0 = 2i)
+    z1 = ops.merge(*_ffs(tree, ops, *ops.split(t1), lvl + 1, 2 * i + 1, rng, sampler))
+    t0p = ops.add(t0, ops.mul(ops.sub(t1, z1), l10))
+    z0 = ops.merge(*_ffs(tree, ops, *ops.split(t0p), lvl + 1, 2 * i, rng, sampler))
+    return z0, z1
+
+
+def z_coefficients(z, ops) -> np.ndarray:
+    """FFT-domain z (B, n) -> integer coefficients"""
+    return np.rint(poly_ifft_fp64(ops.to_complex(z)).real).astype(np.int64)
+
+
+def signature_sqnorm(key: dict, c, z0c, z1c) -> np.ndarray:
+    """||s||^2, s = (c, 0) - z B = (c - z0 g - z1 G, z0 f + z1 F), exact integer arithmetic"""
+    out = []
+    for cc, a, b in zip(np.atleast_2d(c), z0c, z1c):
+        s1 = np.asarray(cc, dtype=object) - negacyclic_convolve(a, key["g"]) - negacyclic_convolve(b, key["G"])
+        s2 = negacyclic_convolve(a, key["f"]) + negacyclic_convolve(b, key["F"])
+        out.append(int(np.dot(s1, s1) + np.dot(s2, s2)))
+    return np.asarray(out, dtype=np.float64)
@@ -4,8 +4,8 @@
 from __future__ import annotations
 import math
 import numpy as np
-import mpmath as mp
-from .qformat_module import QCtx, Qc
+from .qformat_module import QCtx, Qc, QcArray, max_abs
+from .twiddle_module import TWIDDLES
 
 
 def bit_reverse_indices(n: int) -> np.ndarray:
@@ -69,59 +69,124 @@ def q_cshr_round(q: QCtx, a: Qc, s: int) -> Qc:
     return Qc(q.shr_round(a.re, s), q.shr_round(a.im, s))
 
 
-def fft_q(x_list: list[Qc], q: QCtx):
-    """Falcon-style radix-2 FFT in Q-format"""
+def fft_q(x_list: list[Qc] | QcArray, q: QCtx):
+    """Falcon-style radix-2 FFT in Q-format (QcArray input -> vectorized fft_q_np)"""
+    if isinstance(x_list, QcArray):
+        re, im, stages = fft_q_np(x_list.re, x_list.im, q)
+        return QcArray(re, im), stages
     n = len(x_list)
     br = bit_reverse_indices(n)
     a = [x_list[i] for i in br]
-    tw = twiddles_q(n, q)
+    tw = [[Qc(int(r), int(i)) for r, i in zip(wr, wi)] for wr, wi in TWIDDLES.q(n, q)]
     stages = len(tw)
+    st = q.stats
     step = 1
     for stage in range(stages):
         M = step << 1
         half = step
         W = tw[stage]
+        if st is not None:
+            st.begin_stage()
         for k in range(0, n, M):
             for j in range(half):
                 t = q_cmul(q, W[j], a[k + j + half])
                 u = a[k + j]
                 a[k + j] = q_cshr_round(q, q_cadd(q, u, t), 1)
                 a[k + j + half] = q_cshr_round(q, q_csub(q, u, t), 1)
+        if st is not None:
+            st.end_stage(max(max(abs(z.re), abs(z.im)) for z in a))
         step = M
     # rescale back
+    if st is not None:
+        st.begin_stage()
     for i in range(n):
         re = a[i].re << stages
         im = a[i].im << stages
+        if st is not None:
+            st.sat["shl"] += (not q.QMIN <= re <= q.QMAX) + (not q.QMIN <= im <= q.QMAX)
         re = min(max(re, q.QMIN), q.QMAX)
         im = min(max(im, q.QMIN), q.QMAX)
         a[i] = Qc(re, im)
+    if st is not None:
+        st.end_stage(max(max(abs(z.re), abs(z.im)) for z in a))
     return a, stages
 
 
-def to_qc_array(x: np.ndarray, q: QCtx) -> list[Qc]:
-    return [Qc(q.from_f(float(np.real(z))), q.from_f(float(np.imag(z)))) for z in x]
+# --- ADD: stage-vectorized Q-format FFT (integer arrays, bit-identical to fft_q) ---
+def twiddles_q_np(n: int, q: QCtx):
+    """Per-stage twiddles as (re, im) integer arrays (cached in TWIDDLES)"""
+    return TWIDDLES.q(n, q)
 
 
-def to_complex128(a: list[Qc], q: QCtx) -> np.ndarray:
-    return np.array([q.to_f(z.re) + 1j * q.to_f(z.im) for z in a], dtype=np.complex128)
-
-
-def mp_fft(x_list, dps: int = 60):
-    """High-precision mpmath FFT baseline"""
+def fft_q_np(x_re: np.ndarray, x_im: np.ndarray, q: QCtx, rescale: bool = True):
+    """Falcon-style radix-2 FFT in Q-format, one butterfly stage per array op.
+    Transforms the last axis (leading axes = batch); rescale=False keeps the 1/n scaling."""
+    n = np.shape(x_re)[-1]
+    br = bit_reverse_indices(n)
+    a = QcArray(q.asarray(x_re)[..., br], q.asarray(x_im)[..., br])
+    shape = a.re.shape
+    tw = twiddles_q_np(n, q)
+    stages = len(tw)
+    st = q.stats
+    step = 1
+    for stage in range(stages):
+        if st is not None:
+            st.begin_stage()
+        W = QcArray(*tw[stage])
+        # (blocks, 2, half): [:, 0] = upper leg u, [:, 1] = lower leg
+        re = a.re.reshape(-1, 2, step)
+        im = a.im.reshape(-1, 2, step)
+        u = QcArray(re[:, 0], im[:, 0])
+        t = q.cmul(W, QcArray(re[:, 1], im[:, 1]))
+        top = q.cshr_round(q.cadd(u, t), 1)
+        bot = q.cshr_round(q.csub(u, t), 1)
+        a = QcArray(np.stack([top.re, bot.re], axis=1).reshape(shape),
+                    np.stack([top.im, bot.im], axis=1).reshape(shape))
+        if st is not None:
+            st.end_stage(max_abs(a.re, a.im))
+        step <<= 1
+    if not rescale:
+        return a.re, a.im, stages
+    # rescale back (stats: 마지막 stage 항목)
+    if st is not None:
+        st.begin_stage()
+    re, im = q.shl_sat_np(a.re, stages), q.shl_sat_np(a.im, stages)
+    if st is not None:
+        st.end_stage(max_abs(re, im))
+    return re, im, stages
+
+
+# ---------------------------------------------------------------------------------
+
+
+def to_qc_array(x: np.ndarray, q: QCtx) -> QcArray:
+    return q.cfrom_f(x)
+
+
+def to_complex128(a: list[Qc] | QcArray, q: QCtx) -> np.ndarray:
+    if not isinstance(a, QcArray):
+        a = QcArray.from_list(a)
+    return q.cto_f(a)
+
+
+def mp_fft(x_list, dps: int = 60, convert: bool = True):
+    """High-precision mpmath FFT baseline (convert=False: x_list already mpc, kept at full precision)"""
+    import mpmath as mp
     mp.mp.dps = dps
-    x = [mp.mpc(complex(z)) for z in x_list]
+    x = [mp.mpc(complex(z)) for z in x_list] if convert else list(x_list)
     n = len(x)
     bits = n.bit_length() - 1
     rev = [int('{:0{w}b}'.format(i, w=bits)[::-1], 2) for i in range(n)]
     a = [x[rev[i]] for i in range(n)]
+    tw = TWIDDLES.mp(n, dps)
     m = 1
     stage = 0
     while m < n:
         M = m * 2
+        W = tw[stage]
         for k in range(0, n, M):
             for j in range(m):
-                angle = -2 * mp.pi * j / M
-                w = mp.e ** (mp.j * angle)
+                w = W[j]
                 t = w * a[k + j + m]
                 u = a[k + j]
                 a[k + j] = (u + t) / 2
@@ -0,0 +1,318 @@
+# falcon_validate/fftkernel_module.py
+# Selectable Q-format FFT kernels (radix-2, radix-4, split-radix) with fixed per-stage or
+# block-floating-point scaling, real-op / rounding-event counters and bit-exact comparison hooks
+#
+#   decimation tree: node (offset, stride, m) -> children per kernel; every node of size m is
+#   combined in one array op per level and carries the level's block exponent e_m
+#   (value = raw * 2^e_m / QONE).  fixed: e_m = log2 m (radix2 == fft_q_np bit for bit);
+#   bfp: inputs shifted only when the level's guard bits would not fit in the headroom
+
+from __future__ import annotations
+import math
+import numpy as np
+from .qformat_module import QCtx, Qc, QcArray, max_abs
+from .fft_module import fft_q_np, q_cadd, q_csub, q_cmul
+from .twiddle_module import TWIDDLES
+
+FFT_KERNELS = ("radix2", "radix4", "split")
+FFT_SCALINGS = ("fixed", "bfp")
+# bfp guard bits per combine: |u + w t| < 2.42 M, |t0 + sum w^rk t_r| < 5.25 M, |u + w z + w^3 z'| < 3.83 M
+_GUARD = {"radix2": 2, "radix4": 3, "split": 2}
+_PLANS = {}
+
+
+class OpCount:
+    """Real multiplies / adds / negations / rounding shifts, rounding events (inexact mul / shr)."""
+    KEYS = ("mul", "add", "neg", "shr", "round")
+
+    def __init__(self):
+        self.n = dict.fromkeys(self.KEYS, 0)
+        self.shift = 0                # block exponent of the output (fixed: log2 n)
+
+    def reset(self):
+        for k in self.n:
+            self.n[k] = 0
+        self.shift = 0
+
+    def columns(self, prefix: str) -> dict:
+        out = {f"{prefix}op_{k}": v for k, v in self.n.items()}
+        out[f"{prefix}shift"] = self.shift
+        return out
+
+
+def opcount_fields(prefix: str) -> list[str]:
+    return [f"{prefix}op_{k}" for k in OpCount.KEYS] + [f"{prefix}shift"]
+
+
+# --- plan: nodes per size, children row indices per role ---
+def plan(n: int, kernel: str):
+    """{m: (offsets, [child row-index arrays])} for sizes m = 1 .. n (cached per (n, kernel))"""
+    if kernel not in FFT_KERNELS:
+        raise ValueError(f"Unsupported FFT kernel: {kernel}")
+    if n & (n - 1):
+        raise ValueError(f"FFT size must be a power of two: {n}")
+    key = (n, kernel)
+    if key in _PLANS:
+        return _PLANS[key]
+    nodes = {n: [(0, 1)]}
+    children = {}
+    m = n
+    while m > 1:
+        if m not in nodes:                          # radix-4: size 2 는 n = 2 * 4^k 일 때만
+            m >>= 1
+            continue
+        roles = _roles(m, kernel)
+        kids = [[] for _ in roles]
+        for off, s in nodes[m]:
+            for r, (d, ds, cm) in enumerate(roles):
+                lst = nodes.setdefault(cm, [])
+                kids[r].append(len(lst))
+                lst.append((off + d * s, s * ds))
+        children[m] = [(roles[r][2], np.array(k, dtype=np.intp)) for r, k in enumerate(kids)]
+        m >>= 1
+    out = {cm: (np.array([o for o, _ in lst], dtype=np.intp), children.get(cm, []))
+           for cm, lst in nodes.items()}
+    _PLANS[key] = out
+    return out
+
+
+def _roles(m: int, kernel: str):
+    """Children of a size-m node as (offset multiple, stride multiple, size)"""
+    if kernel == "radix4" and m % 4 == 0:
+        return [(r, 4, m >> 2) for r in range(4)]
+    if kernel == "split" and m >= 4:
+        return [(0, 2, m >> 1), (1, 4, m >> 2), (3, 4, m >> 2)]
+    return [(0, 2, m >> 1), (1, 2, m >> 1)]
+
+
+def qroot(m: int, q: QCtx) -> QcArray:
+    """w_m^j = exp(-2 pi i j / m), j < m (same rounding as twiddles_q; cached in TWIDDLES)"""
+    return QcArray(*TWIDDLES.qroot(m, q)[0])
+
+
+# --- counted array ops ---
+class _Ops:
+    def __init__(self, q: QCtx, cnt: OpCount | None):
+        self.q = q
+        self.cnt = cnt
+        self.mask = (1 << q.F) - 1
+
+    def add(self, a, b):
+        if self.cnt is not None:
+            self.cnt.n["add"] += 2 * a.re.size
+        return self.q.cadd(a, b)
+
+    def sub(self, a, b):
+        if self.cnt is not None:
+            self.cnt.n["add"] += 2 * a.re.size
+        return self.q.csub(a, b)
+
+    def mul(self, a, w):
+        if self.cnt is not None:
+            k = np.broadcast_shapes(a.re.shape, w.re.shape)
+            self.cnt.n["mul"] += 4 * math.prod(k)
+            self.cnt.n["add"] += 2 * math.prod(k)
+            # 곱의 하위 F bit (int64 wrap 해도 정확) 가 0 이 아니면 rounding event
+            self.cnt.n["round"] += sum(int(np.count_nonzero((x * y) & self.mask))
+                                       for x, y in ((a.re, w.re), (a.im, w.im), (a.re, w.im), (a.im, w.re)))
+        return self.q.cmul(a, w)
+
+    def negj(self, a):
+        """a * (-j) = (im, -re)"""
+        if self.cnt is not None:
+            self.cnt.n["neg"] += a.re.size
+        return QcArray(a.im, self.q.sub_np(np.zeros_like(a.re), a.re))
+
+    def shr(self, a, s: int):
+        if s <= 0:
+            return a
+        if self.cnt is not None:
+            self.cnt.n["shr"] += 2 * a.re.size
+            m = (1 << s) - 1
+            self.cnt.n["round"] += int(np.count_nonzero(a.re & m)) + int(np.count_nonzero(a.im & m))
+        return self.q.cshr_round(a, s)
+
+
+def _cat(parts) -> QcArray:
+    return QcArray(np.concatenate([p.re for p in parts], axis=-1), np.concatenate([p.im for p in parts], axis=-1))
+
+
+def _rows(R: QcArray, idx) -> QcArray:
+    return QcArray(R.re[..., idx, :], R.im[..., idx, :])
+
+
+def _mul_skip0(o: _Ops, z: QcArray, w: QcArray) -> QcArray:
+    """z * w with the k = 0 column (w = 1) passed through (radix-4 / split trivial twiddle)"""
+    if z.re.shape[-1] == 1:
+        return z
+    return _cat([z[..., :1], o.mul(z[..., 1:], w[1:])])
+
+
+def _combine(o: _Ops, kernel: str, m: int, kids: list[QcArray]) -> QcArray:
+    if kernel == "radix2" or len(kids) == 2:
+        u, v = kids
+        h = m >> 1
+        if kernel == "radix2":
+            t = o.mul(v, qroot(m, o.q)[:h])              # fft_q_np 와 동일 (w = 1 도 곱함)
+        else:
+            t = _mul_skip0(o, v, qroot(m, o.q)[:h])
+        return _cat([o.add(u, t), o.sub(u, t)])
+    if kernel == "radix4":
+        h = m >> 2
+        w = qroot(m, o.q)
+        k = np.arange(h)
+        t0 = kids[0]
+        t1, t2, t3 = (_mul_skip0(o, kids[r], w[r * k]) for r in (1, 2, 3))
+        a0, a1 = o.add(t0, t2), o.sub(t0, t2)
+        b0, b1 = o.add(t1, t3), o.negj(o.sub(t1, t3))
+        return _cat([o.add(a0, b0), o.add(a1, b1), o.sub(a0, b0), o.sub(a1, b1)])
+    # split-radix: U (m/2), Z, Z' (m/4)
+    u, z, z3 = kids
+    h = m >> 2
+    w = qroot(m, o.q)
+    k = np.arange(h)
+    t1 = _mul_skip0(o, z, w[k])
+    t2 = _mul_skip0(o, z3, w[3 * k])
+    s, jd = o.add(t1, t2), o.negj(o.sub(t1, t2))
+    u0, u1 = u[..., :h], u[..., h:]
+    return _cat([o.add(u0, s), o.add(u1, jd), o.sub(u0, s), o.sub(u1, jd)])
+
+
+def _level_shifts(q: QCtx, kernel: str, scaling: str, exps: list[int], mags: list[int]):
+    """-> (per-child input shifts, post shift, output exponent) for one level"""
+    e_in = max(exps)
+    if scaling == "fixed":
+        post = 2 if kernel == "radix4" and len(exps) == 4 else 1
+        return [e_in - e for e in exps], post, e_in + post
+    if scaling != "bfp":
+        raise ValueError(f"Unsupported FFT scaling: {scaling}")
+    bits = max(int(mg).bit_length() - (e_in - e) for mg, e in zip(mags, exps))
+    pre = max(0, _GUARD[kernel] - (q.W - 1 - bits))
+    return [e_in - e + pre for e in exps], 0, e_in + pre
+
+
+def fft_q_kernel(x_re, x_im, q: QCtx, kernel: str = "radix2", scaling: str = "fixed",
+                 rescale: bool = True, ops: OpCount | None = None):
+    """Q-format FFT of the last axis (leading axes = batch) -> (re, im, shift), natural order.
+    rescale=False leaves the output scaled by 2^-shift (fixed: shift = log2 n, the 1/n of fft_q_np)"""
+    if kernel == "radix2" and scaling == "fixed" and ops is None:
+        return fft_q_np(x_re, x_im, q, rescale)
+    x = QcArray(q.asarray(x_re), q.asarray(x_im))
+    n = x.re.shape[-1]
+    pl = plan(n, kernel)
+    o = _Ops(q, ops)
+    st = q.stats
+    offs = pl[1][0]
+    R = {1: QcArray(x.re[..., offs, None], x.im[..., offs, None])}
+    E = {1: 0}
+    m = 2
+    while m <= n:
+        if m not in pl:
+            m <<= 1
+            continue
+        if st is not None:
+            st.begin_stage()
+        kids = [_rows(R[cm], idx) for cm, idx in pl[m][1]]
+        exps = [E[cm] for cm, _ in pl[m][1]]
+        mags = [max_abs(k.re, k.im) for k in kids] if scaling == "bfp" else None
+        shifts, post, E[m] = _level_shifts(q, kernel, scaling, exps, mags)
+        kids = [o.shr(k, s) for k, s in zip(kids, shifts)]
+        R[m] = o.shr(_combine(o, kernel, m, kids), post)
+        if st is not None:
+            st.end_stage(max_abs(R[m].re, R[m].im))
+        m <<= 1
+    out = R[n]
+    re, im, shift = out.re[..., 0, :], out.im[..., 0, :], E[n]
+    if ops is not None:
+        ops.shift = shift
+    if not rescale:
+        return re, im, shift
+    if st is not None:
+        st.begin_stage()
+    re, im = q.shl_sat_np(re, shift), q.shl_sat_np(im, shift)
+    if st is not None:
+        st.end_stage(max_abs(re, im))
+    return re, im, shift
+
+
+# --- scalar reference (Qc / Python int, one butterfly at a time) for the bit-exact hook ---
+def fft_q_kernel_scalar(x_list: list[Qc], q: QCtx, kernel: str = "radix2", scaling: str = "fixed",
+                        rescale: bool = True):
+    n = len(x_list)
+    pl = plan(n, kernel)
+    R = {1: [[x_list[int(o)]] for o in pl[1][0]]}
+    E = {1: 0}
+    m = 2
+    while m <= n:
+        if m not in pl:
+            m <<= 1
+            continue
+        roles = pl[m][1]
+        w = [Qc(int(r), int(i)) for r, i in zip(*TWIDDLES.qroot(m, q)[0])]
+        exps = [E[cm] for cm, _ in roles]
+        mags = [max((max(abs(z.re), abs(z.im)) for row in (R[cm][i] for i in idx) for z in row), default=0)
+                for cm, idx in roles] if scaling == "bfp" else None
+        shifts, post, E[m] = _level_shifts(q, kernel, scaling, exps, mags)
+        rows = []
+        for j in range(len(roles[0][1])):
+            kids = [[_sshr(q, z, s) for z in R[cm][int(idx[j])]] for (cm, idx), s in zip(roles, shifts)]
+            rows.append([_sshr(q, z, post) for z in _scombine(q, kernel, m, kids, w)])
+        R[m] = rows
+        m <<= 1
+    out, shift = R[n][0], E[n]
+    if rescale:
+        out = [Qc(q.shr_round(z.re, -shift), q.shr_round(z.im, -shift)) for z in out]
+    return out, shift
+
+
+def _sshr(q: QCtx, z: Qc, s: int) -> Qc:
+    return z if s <= 0 else Qc(q.shr_round(z.re, s), q.shr_round(z.im, s))
+
+
+def _snegj(q: QCtx, z: Qc) -> Qc:
+    return Qc(z.im, q.sub(0, z.re))
+
+
+def _scombine(q: QCtx, kernel: str, m: int, kids, w) -> list[Qc]:
+    def tw(z, k, j):
+        return z if k == 0 and kernel != "radix2" else q_cmul(q, w[j], z)
+    if kernel == "radix2" or len(kids) == 2:
+        h = m >> 1
+        u, v = kids
+        t = [tw(v[k], k, k) for k in range(h)]
+        return [q_cadd(q, u[k], t[k]) for k in range(h)] + [q_csub(q, u[k], t[k]) for k in range(h)]
+    h = m >> 2
+    out = [None] * m
+    for k in range(h):
+        if kernel == "radix4":
+            t0, t1, t2, t3 = kids[0][k], tw(kids[1][k], k, k), tw(kids[2][k], k, 2 * k), tw(kids[3][k], k, 3 * k)
+            a0, a1 = q_cadd(q, t0, t2), q_csub(q, t0, t2)
+            b0, b1 = q_cadd(q, t1, t3), _snegj(q, q_csub(q, t1, t3))
+            out[k], out[k + h], out[k + 2 * h], out[k + 3 * h] = (
+                q_cadd(q, a0, b0), q_cadd(q, a1, b1), q_csub(q, a0, b0), q_csub(q, a1, b1))
+        else:
+            u, z, z3 = kids
+            t1, t2 = tw(z[k], k, k), tw(z3[k], k, 3 * k)
+            s, jd = q_cadd(q, t1, t2), _snegj(q, q_csub(q, t1, t2))
+            out[k], out[k + h] = q_cadd(q, u[k], s), q_cadd(q, u[k + h], jd)
+            out[k + 2 * h], out[k + 3 * h] = q_csub(q, u[k], s), q_csub(q, u[k + h], jd)
+    return out
+
+
+# --- bit-exact comparison hooks ---
+def compare_bits(a_re, a_im, b_re, b_im) -> dict:
+    """Element-wise raw-integer comparison: mismatching components and max |difference| in LSBs"""
+    d = np.concatenate([np.ravel(np.asarray(a_re) - np.asarray(b_re)), np.ravel(np.asarray(a_im) - np.asarray(b_im))])
+    nz = d != 0
+    return {"mismatch": int(np.count_nonzero(nz)), "max_lsb": int(max_abs(d)) if nz.any() else 0}
+
+
+def check_kernel(x_re, x_im, q: QCtx, kernel: str, scaling: str = "fixed") -> dict:
+    """Bit-exact hook: vectorized kernel vs its scalar reference (radix2/fixed also vs fft_q_np)"""
+    re, im, _ = fft_q_kernel(x_re, x_im, q, kernel, scaling, ops=OpCount())
+    ref, _ = fft_q_kernel_scalar([Qc(int(r), int(i)) for r, i in zip(x_re, x_im)], q, kernel, scaling)
+    out = {"vs_scalar": compare_bits(re, im, [z.re for z in ref], [z.im for z in ref])}
+    if kernel == "radix2" and scaling == "fixed":
+        b_re, b_im, _ = fft_q_np(x_re, x_im, q)
+        out["vs_fft_q_np"] = compare_bits(re, im, b_re, b_im)
+    return out
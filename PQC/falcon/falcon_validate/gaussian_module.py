@@ -4,7 +4,6 @@
 from __future__ import annotations
 import numpy as np
 import math
-import mpmath as mp
 from .qformat_module import QCtx
 
 
@@ -16,22 +15,37 @@ def box_muller_from_uniforms_np(u1, u2):
     return z0, z1
 
 
-def box_muller_from_uniforms_mp(u1_list, u2_list, dps=60):
+def box_muller_from_uniforms_mp(u1_list, u2_list, dps=60, jobs=1, chunk=4096):
+    if jobs > 1 and len(u1_list) > chunk:
+        return _box_muller_mp_parallel(u1_list, u2_list, dps, jobs, chunk)
+    import mpmath as mp
     mp.mp.dps = dps
     out = []
+    two_pi = 2 * mp.pi                      # 루프 밖으로 (값은 동일)
+    tiny = mp.mpf("1e-60")
     for u1, u2 in zip(u1_list, u2_list):
         u1m = mp.mpf(str(u1))
         if u1m == 0:
-            u1m = mp.mpf("1e-60")
+            u1m = tiny
         u2m = mp.mpf(str(u2))
         r = mp.sqrt(-2 * mp.log(u1m))
-        theta = 2 * mp.pi * u2m
-        z0 = r * mp.cos(theta)
-        z1 = r * mp.sin(theta)
-        out.append((float(z0), float(z1)))
+        c, s = mp.cos_sin(two_pi * u2m)     # cos/sin 을 한 번에 (mp.cos/mp.sin 과 동일 값)
+        out.append((float(r * c), float(r * s)))
     return out
 
 
+def _box_muller_mp_parallel(u1_list, u2_list, dps, jobs, chunk):
+    """Chunked mpmath Box–Muller over a process pool (order preserved)"""
+    from concurrent.futures import ProcessPoolExecutor
+    u1 = [float(v) for v in u1_list]
+    u2 = [float(v) for v in u2_list]
+    spans = [(s, s + chunk) for s in range(0, len(u1), chunk)]
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        parts = ex.map(box_muller_from_uniforms_mp,
+                       [u1[a:b] for a, b in spans], [u2[a:b] for a, b in spans], [dps] * len(spans))
+        return [pair for part in parts for pair in part]
+
+
 def box_muller_qx(u1: float, u2: float, q: QCtx):
     """Box-Muller transform with staged Q-format rounding"""
     ln_u1 = math.log(max(u1, 1e-300))
@@ -48,7 +62,38 @@ def box_muller_qx(u1: float, u2: float, q: QCtx):
     return rq * cq, rq * sq
 
 
+# --- ADD: vectorized Box–Muller with staged Q-format rounding ---
+def box_muller_qx_np(u1, u2, q: QCtx, exact=True):
+    """Array version of box_muller_qx. exact=True evaluates log/cos/sin with libm (math.*)
+    so results are bit-identical to the scalar path; exact=False uses NumPy ufuncs
+    (faster, may differ in the last ulp before quantization)."""
+    u1 = np.maximum(np.asarray(u1, dtype=np.float64), 1e-300)
+    u2 = np.asarray(u2, dtype=np.float64)
+    n = len(u1)
+    if exact:
+        ln_u1 = np.fromiter(map(math.log, u1.tolist()), dtype=np.float64, count=n)
+    else:
+        ln_u1 = np.log(u1)
+    val = -2.0 * ln_u1
+    qv = q.from_f_np(val)
+    r = np.sqrt(np.maximum(q.to_f_np(qv), 0.0))
+    rq = q.to_f_np(q.from_f_np(r))
+    theta = 2.0 * math.pi * u2
+    tq = q.to_f_np(q.from_f_np(theta))
+    if exact:
+        tl = tq.tolist()
+        c = np.fromiter(map(math.cos, tl), dtype=np.float64, count=n)
+        s = np.fromiter(map(math.sin, tl), dtype=np.float64, count=n)
+    else:
+        c = np.cos(tq); s = np.sin(tq)
+    cq = q.to_f_np(q.from_f_np(c))
+    sq = q.to_f_np(q.from_f_np(s))
+    return rq * cq, rq * sq
+# ---------------------------------------------------------------
+
+
 def discrete_gaussian_pmf_mp(k_max, sigma, mp_dps=60):
+    import mpmath as mp
     mp.mp.dps = mp_dps
     two = mp.mpf(2)
     s2 = mp.mpf(sigma) ** 2
@@ -0,0 +1,88 @@
+# falcon_validate/hash_module.py
+# Canonical raw-payload hashing: per array (name, dtype, shape, little-endian bytes) in
+# sorted key order, streamed into SHA-256 (flat or chunk tree); legacy npz mode kept
+
+from __future__ import annotations
+import io
+import numpy as np
+
+HASH_MODES = ("sha256", "tree", "legacy")
+
+_CHUNK = 1 << 20
+
+
+def _canonical(a) -> np.ndarray:
+    a = np.ascontiguousarray(a)
+    if a.dtype.hasobject:
+        raise TypeError("object arrays have no canonical byte form")
+    if a.dtype.byteorder == ">":
+        a = a.astype(a.dtype.newbyteorder("<"))
+    return a
+
+
+def _header(name: str, a: np.ndarray) -> bytes:
+    # dtype.str ('<f8', '<c16', '|b1' …) 는 NumPy 버전과 무관하게 고정
+    shape = ",".join(str(d) for d in a.shape)
+    return f"{name}\0{a.dtype.str}\0{shape}\0{a.nbytes}\0".encode()
+
+
+class TreeSHA256:
+    """Chunk tree over SHA-256 (BLAKE3-style: counter-tagged leaves, 0x01-tagged parents)"""
+    def __init__(self, chunk: int = _CHUNK):
+        self.chunk = chunk
+        self._buf = bytearray()
+        self._leaves = []
+
+    def update(self, data):
+        self._buf += data
+        while len(self._buf) >= self.chunk:
+            self._leaf(bytes(self._buf[:self.chunk]))
+            del self._buf[:self.chunk]
+
+    def _leaf(self, data: bytes):
+        import hashlib
+        ctr = len(self._leaves).to_bytes(8, "little")
+        self._leaves.append(hashlib.sha256(b"\x00" + ctr + data).digest())
+
+    def hexdigest(self) -> str:
+        import hashlib
+        nodes = list(self._leaves)
+        if self._buf or not nodes:
+            ctr = len(nodes).to_bytes(8, "little")
+            nodes.append(hashlib.sha256(b"\x00" + ctr + bytes(self._buf)).digest())
+        while len(nodes) > 1:
+            nxt = [hashlib.sha256(b"\x01" + nodes[i] + nodes[i + 1]).digest()
+                   for i in range(0, len(nodes) - 1, 2)]
+            if len(nodes) % 2:
+                nxt.append(nodes[-1])                 # 홀수 노드는 그대로 올림
+            nodes = nxt
+        return nodes[0].hex()
+
+
+def payload_sha256(payload: dict, mode: str = "sha256", chunk: int = _CHUNK) -> str:
+    """Hash of {name: array}; mode = sha256 (flat) | tree (chunked) | legacy (savez_compressed)"""
+    if mode == "legacy":
+        return _legacy_npz_sha256(payload)
+    if mode == "sha256":
+        import hashlib
+        h = hashlib.sha256()
+    elif mode == "tree":
+        h = TreeSHA256(chunk)
+    else:
+        raise ValueError(f"Unsupported hash mode: {mode}")
+    for name in sorted(payload):
+        a = _canonical(payload[name])
+        h.update(_header(name, a))
+        buf = memoryview(a.reshape(-1)).cast("B")   # 복사 없이 chunk 단위로 공급
+        for s in range(0, len(buf), chunk):
+            h.update(buf[s:s + chunk])
+    return h.hexdigest()
+
+
+def _legacy_npz_sha256(payload: dict) -> str:
+    # 이전 raw_sha256_from_payload 와 동일 (zip 메타데이터에 의존)
+    import hashlib
+    buf = io.BytesIO()
+    ordered = {k: np.asarray(payload[k]) for k in sorted(payload.keys())}
+    np.savez_compressed(buf, **ordered)
+    return hashlib.sha256(buf.getvalue()).hexdigest()
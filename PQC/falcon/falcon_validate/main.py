@@ -3,9 +3,13 @@
 
 from __future__ import annotations
 import argparse
+import os
+import json
+from functools import partial
 import numpy as np
-from .qformat_module import QCtx
-from .fft_module import fft_q, mp_fft, to_qc_array, to_complex128
+from .qformat_module import QCtx, QcArray
+from .fft_module import mp_fft, to_qc_array, to_complex128
+from .fftkernel_module import FFT_KERNELS, FFT_SCALINGS, OpCount, fft_q_kernel
 # 추가/보강: discrete PMF + Box–Muller 함수들
 from .gaussian_module import (
     discrete_gaussian_pmf_mp,
@@ -13,6 +17,7 @@ from .gaussian_module import (
     box_muller_from_uniforms_np,
     box_muller_from_uniforms_mp,
     box_muller_qx,
+    box_muller_qx_np,
 )
 
 # --- UPDATE: imports ---
@@ -25,6 +30,15 @@ from .sampler_module import (
 # (gaussian import는 기존대로 유지)
 from .metrics_module import compute_fft_errors, compute_hist_errors, compute_continuous_errors
 from .sweep_module import sweep_and_export
+from .twiddle_module import TWIDDLES
+from .refft_module import REF_ENGINES, ref_fft, ref_self_check
+from .stage_module import STAGES
+from .table_module import TABLES
+from .ctsampler_module import timing_leak_benchmark
+from .hash_module import HASH_MODES
+from .trace_module import TRACE, span, format_trace
+from .ntt_module import (NTT_PARAMS, REDUCTIONS, ntt_params, ntt_np, intt_np, poly_mul_ntt, ntt_ref,
+                         poly_mul_ref, random_poly)
 
 # ------------------------
 
@@ -37,85 +51,180 @@ def align_scale(ref, est):
     s = np.vdot(ref, est) / den  # complex least-squares scale
     return s * est
 
-# def compare_single(I, N, sigma, mp_dps, sampler):
-# 수정
-def compare_single(I, N, sigma, mp_dps, sampler, need_raw=False):
-    q = QCtx(I)
+# === Stage graph: 샘플러와 무관한 단계는 의존 파라미터 기준으로 캐시 ===
+@STAGES.stage("x", params=("N",))
+def _stage_x(N):
+    # FFT 입력: N (seed 0) 에만 의존 → bm_pairs 가 바뀌어도 FFT stage 재사용
     rng = np.random.default_rng(0)
-    x = (rng.random(N) + 1j * rng.random(N)) / np.sqrt(2)
+    return (rng.random(N) + 1j * rng.random(N)) / np.sqrt(2)
 
-    # --- FFT (MP128을 기준 ref로 사용) ---
-    # MP128 (ref)
-    mp_fft_out = mp_fft(x, mp_dps)
-    mp_fft_out = np.asarray([complex(v) for v in mp_fft_out], dtype=np.complex128)
 
-    # FP64 (est1)
-    np_fft_out = np.asarray(np.fft.fft(x) / 2, dtype=np.complex128)
+@STAGES.stage("bm_inputs", params=("N", "bm_pairs"))
+def _stage_bm_inputs(N, bm_pairs):
+    # Box–Muller uniform 은 같은 rng 에서 x 다음에 뽑음 (기존 순서 유지 → raw 값 동일)
+    rng = np.random.default_rng(0)
+    rng.random(2 * N)                                  # x 의 re / im 건너뜀
+    u1 = rng.random(bm_pairs); u2 = rng.random(bm_pairs)
+    return u1, u2
+
 
-    # Qx (est2)
-    qx_in = to_qc_array(x, q)
-    q_fft_out, _ = fft_q(qx_in, q)
-    qx_fft_f = to_complex128(q_fft_out, q)             # complex128 배열
+@STAGES.stage("fft_ref", params=("mp_dps", "ref_engine", "ref_check_digits"), deps=("x",))
+def _stage_fft_ref(mp_dps, ref_engine, ref_check_digits, x):
+    # MP128 (ref) — engine: mpmath (mp_fft) | dd (double-double)
+    with span("fft.mp" if ref_engine == "mpmath" else f"fft.{ref_engine}"):
+        out = ref_fft(x, mp_dps, ref_engine)
+    if ref_engine != "mpmath" and ref_check_digits:
+        with span("fft.ref_check"):
+            ref_self_check(x, mp_dps, ref_check_digits)
+    return out
 
-    # 스케일/위상 정렬: 각 est를 ref(mp) 기준으로 정렬
-    np_fft_aligned = align_scale(mp_fft_out, np_fft_out)
-    qx_fft_aligned = align_scale(mp_fft_out, qx_fft_f)
 
-    # 오차 집계 (인자 순서: FP64, FP128(ref), Qx)
-    fft_err = compute_fft_errors(np_fft_aligned, mp_fft_out, qx_fft_aligned)
+@STAGES.stage("fft_fp64", deps=("x",))
+def _stage_fft_fp64(x):
+    with span("fft.fp64"):
+        return np.asarray(np.fft.fft(x) / 2, dtype=np.complex128)
 
 
-    # --- UPDATE: inside compare_single(...) after pmf, before histograms ---
-    # === Discrete Gaussian PMF (먼저 확정적으로 생성) ===
+@STAGES.stage("fft_qx", params=("I", "word_bits", "qstats", "fft_kernel", "fft_scaling", "fft_opcount"),
+              deps=("x",))
+def _stage_fft_qx(I, word_bits, qstats, fft_kernel, fft_scaling, fft_opcount, x):
+    q = QCtx(I, word_bits, stats=qstats)
+    qx_in = to_qc_array(x, q)                  # QcArray (re/im int64 | Q128: object buffers)
+    ops = OpCount() if fft_opcount else None
+    with span("fft.qx"):
+        # radix2 / fixed (opcount 없음) = fft_q_np, scalar fft_q 와 bit-identical
+        re, im, _ = fft_q_kernel(qx_in.re, qx_in.im, q, fft_kernel, fft_scaling, ops=ops)
+    cols = {}
+    if qstats:
+        cols.update(q.stats.columns("fftq_"))
+    if ops is not None or (fft_kernel, fft_scaling) != ("radix2", "fixed"):
+        # 기본 (radix2 / fixed) 이 아니면 항상 kernel / scaling 컬럼 (CSV 에서 구분 가능하게)
+        cols.update(fft_kernel=fft_kernel, fft_scaling=fft_scaling)
+    if ops is not None:
+        cols.update(ops.columns("fftq_"))
+    # (complex128 배열, saturation/headroom + op count 컬럼 | None)
+    return to_complex128(QcArray(re, im), q), (cols or None)
+
+
+@STAGES.stage("fft_err", deps=("fft_ref", "fft_fp64", "fft_qx"))
+def _stage_fft_err(fft_ref, fft_fp64, fft_qx):
+    with span("fft.err"):
+        # 스케일/위상 정렬: 각 est를 ref(mp) 기준으로 정렬
+        np_fft_aligned = align_scale(fft_ref, fft_fp64)
+        qx_fft_aligned = align_scale(fft_ref, fft_qx[0])
+        # 오차 집계 (인자 순서: FP64, FP128(ref), Qx)
+        return compute_fft_errors(np_fft_aligned, fft_ref, qx_fft_aligned)
+
+
+@STAGES.stage("tables", params=("sigma", "mp_dps", "I", "word_bits"))
+def _stage_tables(sigma, mp_dps, I, word_bits):
+    # === Discrete Gaussian PMF + sampler tables (TABLES: LRU + 디스크 캐시) ===
     k_max = max(1, int(np.ceil(10.0 * sigma)))
     try:
-        pmf_mp = discrete_gaussian_pmf_mp(k_max, sigma, mp_dps)   # FP128 기준
-        pmf_f  = discrete_gaussian_pmf_float(k_max, sigma)        # FP64 스냅샷
+        with span("tables"):
+            return TABLES.get(sigma, k_max, mp_dps, I, word_bits)
     except Exception as e:
         raise RuntimeError(
             f"PMF build failed (k_max={k_max}, sigma={sigma}, mp_dps={mp_dps}): {e}"
         )
 
+
+@STAGES.stage("bm_fp64", deps=("bm_inputs",))
+def _stage_bm_fp64(bm_inputs):
+    u1, u2 = bm_inputs
+    with span("bm.fp64"):
+        z_np0, z_np1 = box_muller_from_uniforms_np(u1, u2)
+        return np.concatenate([z_np0, z_np1])
+
+
+@STAGES.stage("bm_mp", params=("mp_dps", "bm_jobs"), deps=("bm_inputs",))
+def _stage_bm_mp(mp_dps, bm_jobs, bm_inputs):
+    u1, u2 = bm_inputs
+    with span("bm.mp"):
+        z_mp_pairs = box_muller_from_uniforms_mp(u1, u2, dps=mp_dps, jobs=bm_jobs)
+        return np.array([v for pair in z_mp_pairs for v in pair], dtype=np.float64)
+
+
+@STAGES.stage("bm_qx", params=("I", "word_bits", "qstats"), deps=("bm_inputs",))
+def _stage_bm_qx(I, word_bits, qstats, bm_inputs):
+    q = QCtx(I, word_bits, stats=qstats)
+    u1, u2 = bm_inputs
+    with span("bm.qx"):
+        z0, z1 = box_muller_qx_np(u1, u2, q)           # box_muller_qx 와 bit-identical
+    # (z0, z1) pair 순서 유지
+    return np.column_stack([z0, z1]).ravel(), (q.stats.columns("bmqx_") if qstats else None)
+
+
+@STAGES.stage("cont_err", deps=("bm_fp64", "bm_mp", "bm_qx"))
+def _stage_cont_err(bm_fp64, bm_mp, bm_qx):
+    with span("bm.err"):
+        return compute_continuous_errors(bm_fp64, bm_mp, bm_qx[0])
+
+
+# def compare_single(I, N, sigma, mp_dps, sampler):
+# 수정
+def compare_single(I, N, sigma, mp_dps, sampler, need_raw=False,
+                   ref_engine="mpmath", ref_check_digits=0, sampler_engine="batch",
+                   bm_pairs=5000, bm_jobs=1, word_bits=64, qstats=False,
+                   fft_kernel="radix2", fft_scaling="fixed", fft_opcount=False):
+    q = QCtx(I, word_bits)
+    params = dict(I=I, N=N, sigma=sigma, mp_dps=mp_dps, word_bits=word_bits, qstats=qstats,
+                  ref_engine=ref_engine, ref_check_digits=ref_check_digits,
+                  bm_pairs=bm_pairs, bm_jobs=bm_jobs,
+                  fft_kernel=fft_kernel, fft_scaling=fft_scaling, fft_opcount=fft_opcount)
+    x = STAGES.get("x", **params)
+    u1, u2 = STAGES.get("bm_inputs", **params)
+
+    # --- FFT (MP128을 기준 ref로 사용) ---
+    fft_err = STAGES.get("fft_err", **params)
+
+    # --- UPDATE: inside compare_single(...) after pmf, before histograms ---
+    tables = STAGES.get("tables", **params)
+    k_max, pmf_mp = tables.k_max, tables.pmf_mp
+    pmf_f = tables.pmf_fp64                                   # FP64 스냅샷
+
     # === Sampler 실행 + 타이밍 ===
     n_samples = 10000
-    t0 = time.perf_counter_ns()
-    vals_fp64 = sample_discrete_variants(pmf_mp, sigma, k_max, n_samples, sampler)
-    t1 = time.perf_counter_ns()
-    t2 = time.perf_counter_ns()
-    vals_qx   = sample_discrete_variants_qx(pmf_mp, sigma, k_max, n_samples, sampler, q)
-    t3 = time.perf_counter_ns()
+    batch = sampler_engine == "batch"
+    ky_stats = {}                                   # knuth_yao: DDG bit/table counters (FP64 경로)
+    with span("sampler.fp64"):
+        t0 = time.perf_counter_ns()
+        vals_fp64 = sample_discrete_variants(pmf_mp, sigma, k_max, n_samples, sampler, batch=batch,
+                                             stats=ky_stats, tables=tables)
+        t1 = time.perf_counter_ns()
+    with span("sampler.qx"):
+        t2 = time.perf_counter_ns()
+        vals_qx   = sample_discrete_variants_qx(pmf_mp, sigma, k_max, n_samples, sampler, q, batch=batch,
+                                                tables=tables)
+        t3 = time.perf_counter_ns()
 
     ns_per_sample_fp64 = (t1 - t0) / n_samples
     ns_per_sample_qx   = (t3 - t2) / n_samples
 
     # === 히스토그램/정확도 ===
-    hist_edges = np.arange(-k_max, k_max + 2)
-    hist64, _ = np.histogram(vals_fp64, bins=hist_edges)
-    histqx, _ = np.histogram(vals_qx,  bins=hist_edges)
-    gauss_err = compute_hist_errors(pmf_mp, pmf_f, pmf_f, hist64, histqx)
+    with span("hist"):
+        hist_edges = np.arange(-k_max, k_max + 2)
+        hist64, _ = np.histogram(vals_fp64, bins=hist_edges)
+        histqx, _ = np.histogram(vals_qx,  bins=hist_edges)
+        gauss_err = compute_hist_errors(pmf_mp, pmf_f, pmf_f, hist64, histqx)
 
     # === Continuous Gaussian (Box–Muller, 공유 uniform) ===
-    pairs = 5000
-    u1 = rng.random(pairs); u2 = rng.random(pairs)
-    z_np0, z_np1 = box_muller_from_uniforms_np(u1, u2)
-    z_fp64 = np.concatenate([z_np0, z_np1])
-    z_mp_pairs = box_muller_from_uniforms_mp(u1, u2, dps=mp_dps)
-    z_mp = np.array([v for pair in z_mp_pairs for v in pair], dtype=np.float64)
-    z_q = []
-    for i in range(pairs):
-        z0, z1 = box_muller_qx(float(u1[i]), float(u2[i]), q)
-        z_q.extend([z0, z1])
-    z_q = np.array(z_q, dtype=np.float64)
-
-    cont_err = compute_continuous_errors(z_fp64, z_mp, z_q)
+    cont_err = STAGES.get("cont_err", **params)
 
     # === 결과 딕셔너리 ===
-    res = {"I": I, "N": N, "sigma": sigma, "mp_dps": mp_dps, "sampler": sampler}
+    res = {"I": I, "word_bits": word_bits, "N": N, "sigma": sigma, "mp_dps": mp_dps, "sampler": sampler}
     res.update(fft_err)
     res.update(gauss_err)
     res.update(cont_err)
     res["sampler_ns_per_sample_fp64"] = float(ns_per_sample_fp64)
     res["sampler_ns_per_sample_qx"]   = float(ns_per_sample_qx)
+    res.update(ky_stats)
+    fft_cols = STAGES.get("fft_qx", **params)[1]
+    if fft_cols:
+        # saturation / headroom 계측 (FFT stage 별), 기본이 아닌 FFT kernel / scaling, op count
+        res.update(fft_cols)
+    if qstats:
+        res.update(STAGES.get("bm_qx", **params)[1])
 
     # === RAW가 필요 없으면 여기서 종료 ===
     if not need_raw:
@@ -124,9 +233,9 @@ def compare_single(I, N, sigma, mp_dps, sampler, need_raw=False):
     # === RAW payload (위에서 생성된 동일 변수명 사용) ===
     raw_payload = {
         "x": x.astype(np.complex128),
-        "fft_mp": np.array(mp_fft_out, dtype=np.complex128),
-        "fft_fp64": np_fft_out.astype(np.complex128),
-        "fft_qx": qx_fft_f.astype(np.complex128),
+        "fft_mp": np.array(STAGES.get("fft_ref", **params), dtype=np.complex128),
+        "fft_fp64": STAGES.get("fft_fp64", **params).astype(np.complex128),
+        "fft_qx": STAGES.get("fft_qx", **params)[0].astype(np.complex128),
 
         "pmf_mp": np.array([float(p) for p in pmf_mp], dtype=np.float64),
         "pmf_fp64": np.array(pmf_f, dtype=np.float64),
@@ -135,51 +244,193 @@ def compare_single(I, N, sigma, mp_dps, sampler, need_raw=False):
 
         "bm_u1": u1.astype(np.float64),
         "bm_u2": u2.astype(np.float64),
-        "bm_z_mp": z_mp.astype(np.float64),
-        "bm_z_fp64": z_fp64.astype(np.float64),
-        "bm_z_qx": z_q.astype(np.float64),
+        "bm_z_mp": STAGES.get("bm_mp", **params).astype(np.float64),
+        "bm_z_fp64": STAGES.get("bm_fp64", **params).astype(np.float64),
+        "bm_z_qx": STAGES.get("bm_qx", **params)[0].astype(np.float64),
     }
     return res, raw_payload
 
 
 
+# === Kyber / Dilithium NTT point (--ntt): bit-exact vs pure-Python reference + timing ===
+def compare_ntt(q, reduce, batch, need_raw=False, seed=0, check_n=8, warmup=1, trials=5, min_time=0.02):
+    from .bench import time_trials
+    p = ntt_params(q)
+    a, b = random_poly(p, batch, seed), random_poly(p, batch, seed + 1)
+    stats = {}
+    # 검증용 1 회 (twiddle 표 생성 포함, 시간 측정 밖) — rtl overflow 도 여기서만 집계
+    with span("ntt.fwd"):
+        A = ntt_np(a, p, reduce, stats)
+    with span("ntt.inv"):
+        a_rt = intt_np(A, p, reduce, stats)
+    with span("ntt.mul"):
+        c = poly_mul_ntt(a, b, p, reduce, stats)
+    with span("ntt.time"):
+        t_fwd = time_trials(lambda: ntt_np(a, p, reduce), batch, warmup, trials, min_time)
+        t_inv = time_trials(lambda: intt_np(A, p, reduce), batch, warmup, trials, min_time)
+        t_mul = time_trials(lambda: poly_mul_ntt(a, b, p, reduce), batch, warmup, trials, min_time)
+    nchk = min(check_n, batch)
+    with span("ntt.ref"):
+        ref = np.array([ntt_ref(x, p) for x in a[:nchk]])
+        ref_mul = np.array([poly_mul_ref(x, y, q) for x, y in zip(a[:nchk], b[:nchk])])
+    res = {"q": q, "scheme": p.name, "n": p.n, "layers": p.layers, "reduce": reduce, "batch": batch,
+           "ntt_mismatch": int(np.count_nonzero(A[:nchk] != ref)),
+           "intt_roundtrip_mismatch": int(np.count_nonzero(a_rt != a)),
+           "mul_mismatch": int(np.count_nonzero(c[:nchk] != ref_mul)),
+           "rtl_sum_overflow": stats.get("rtl_sum_overflow"),
+           # ns per polynomial = median over trials (bench.time_trials)
+           "ntt_ns_per_poly": t_fwd["median_ns"], "intt_ns_per_poly": t_inv["median_ns"],
+           "mul_ns_per_poly": t_mul["median_ns"],
+           "ntt_per_sec": t_fwd["per_sec"], "mul_per_sec": t_mul["per_sec"]}
+    if not need_raw:
+        return res
+    return res, {"x": a, "y": b, "ntt": A, "mul": c}
+
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--I_list", type=str, default="8,10,12,16,32")
     p.add_argument("--N_list", type=str, default="256,512")
     p.add_argument("--sigma_list", type=str, default="1.2,1.5,2.0")
     p.add_argument("--mp_dps_list", type=str, default="33,50")
+    p.add_argument("--word_bits", type=int, default=64, choices=QCtx.WORD_BITS,
+        help="Q-format word width (F = word_bits - I); I_list entries >= word_bits are skipped")
+    p.add_argument("--qstats", action="store_true",
+        help="count Q-format saturations per op / FFT stage and report max magnitude + headroom bits")
+    p.add_argument("--fft_kernel", type=str, default="radix2", choices=FFT_KERNELS,
+        help="Q-format FFT kernel (radix2 = fft_q_np; radix4 / split use fewer real multiplies)")
+    p.add_argument("--fft_scaling", type=str, default="fixed", choices=FFT_SCALINGS,
+        help="fixed: >>1 per radix-2 stage (>>2 per radix-4); bfp: block floating point, shift on demand")
+    p.add_argument("--fft_opcount", action="store_true",
+        help="add real mul / add / neg / shr / rounding-event counts of the Q-format FFT to the results")
     p.add_argument("--sweep", action="store_true", help="Run full parameter sweep")
+    p.add_argument("--resume", type=str, default=None, metavar="TS",
+        help="resume the sweep with timestamp TS (falcon_sweep_<TS>.*), skipping completed points")
+    p.add_argument("--raw_archive", action="store_true",
+        help="keep every raw payload in falcon_sweep_<ts>.raw.bin (+ .raw.idx.jsonl); "
+             "rawmeta CSV stores offset/nbytes/sha instead of the inlined input vector")
+    p.add_argument("--hash", type=str, default=None, choices=HASH_MODES,
+        help="raw_sha256 scheme: sha256 (canonical stream, default), tree (chunked), legacy (savez_compressed); "
+             "--resume uses the scheme recorded in the manifest")
+    p.add_argument("--trace", action="store_true",
+        help="record per-stage spans (wall/CPU ms, allocated-block delta), aggregated over workers")
+    p.add_argument("--trace_out", type=str, default=None,
+        help="also write a Chrome trace JSON (chrome://tracing / Perfetto); implies --trace")
+    p.add_argument("--profile", type=str, default=None,
+        help="cProfile the main process into this .prof file (workers not included: use --jobs 1)")
+    p.add_argument("--no-plots", dest="plots", action="store_false",
+        help="skip the PNG plots after --sweep (matplotlib is never imported)")
+    p.add_argument("--jobs", type=int, default=1,
+        help="worker processes for --sweep (grid points grouped by (I, N), groups split into ceil(points/jobs) chunks); 1 = serial")
+    p.add_argument("--twiddle_cache_dir", type=str, default=None,
+        help="directory for on-disk twiddle tables (Q / FP64 / mpmath), reused across runs")
+    p.add_argument("--table_cache_dir", type=str, default=None,
+        help="content-addressed cache directory for sampler tables (.npy, memory-mapped)")
+    p.add_argument("--ref_engine", type=str, default="mpmath", choices=REF_ENGINES,
+        help="reference FFT engine: mpmath (mp_fft) or dd (double-double, ~32 digits)")
+    p.add_argument("--ref_check_digits", type=int, default=0,
+        help="self-check non-mpmath ref engine against mp_fft to this many digits (0 = off; dd: at most 32)")
     # --- UPDATE: argparse help only (choices 제한이 없다면 문구만) ---
     p.add_argument("--sampler_list", type=str,
         default="cdt,knuth_yao,rejection,ziggurat,alias,expcut",
-        help="comma-separated samplers: cdt,knuth_yao,rejection,ziggurat,alias,expcut")
+        help="comma-separated samplers: cdt,cdt_ct,knuth_yao,rejection,ziggurat,alias,expcut")
+    p.add_argument("--sampler_engine", type=str, default="batch", choices=("batch", "scalar"),
+        help="batch: vectorized sample_batch (default); scalar: legacy per-sample loop")
+    p.add_argument("--bm_pairs", type=int, default=5000,
+        help="Box–Muller pairs for the continuous-Gaussian section")
+    p.add_argument("--bm_jobs", type=int, default=1,
+        help="processes for the chunked mpmath Box–Muller reference")
+    p.add_argument("--ntt", action="store_true",
+        help="Kyber / Dilithium NTT sweep over --ntt_q_list x --ntt_reduce_list x --ntt_batch_list -> CSV "
+             "(lattice_ntt_sweep_<ts>.*; --resume / --jobs / --raw_archive / --hash apply)")
+    p.add_argument("--ntt_q_list", type=str, default=",".join(str(q) for q in NTT_PARAMS))
+    p.add_argument("--ntt_reduce_list", type=str, default=",".join(REDUCTIONS),
+        help="montgomery, barrett, rtl (bit-exact montgomery_mult16 / ntt_butterfly model)")
+    p.add_argument("--ntt_batch_list", type=str, default="1,64")
+    p.add_argument("--ct_leak_bench", action="store_true",
+        help="run constant-time CDT timing-leak benchmark (first sigma / mp_dps) and exit")
     # -----------------------------------------------------------------
 
     args = p.parse_args()
+    if args.twiddle_cache_dir:
+        TWIDDLES.set_cache_dir(args.twiddle_cache_dir)
+        os.environ["FALCON_TWIDDLE_CACHE"] = args.twiddle_cache_dir   # worker 프로세스에도 전달
+    if args.table_cache_dir:
+        TABLES.set_cache_dir(args.table_cache_dir)
+        os.environ["FALCON_TABLE_CACHE"] = args.table_cache_dir
+    if args.trace or args.trace_out:
+        TRACE.enable(record_events=bool(args.trace_out))
+        os.environ["FALCON_TRACE"] = "events" if args.trace_out else "1"
+    prof = None
+    if args.profile:
+        import cProfile
+        prof = cProfile.Profile()
+        prof.enable()
 
     param_grid = {
-        "I_list": [int(x) for x in args.I_list.split(",")],
+        "I_list": [int(x) for x in args.I_list.split(",") if int(x) < args.word_bits],
         "N_list": [int(x) for x in args.N_list.split(",")],
         "sigma_list": [float(x) for x in args.sigma_list.split(",")],
         "mp_dps_list": [int(x) for x in args.mp_dps_list.split(",")],
         "sampler_list": args.sampler_list.split(","),
     }
     
+    compute = partial(compare_single, ref_engine=args.ref_engine,
+                      ref_check_digits=args.ref_check_digits,
+                      sampler_engine=args.sampler_engine,
+                      bm_pairs=args.bm_pairs, bm_jobs=args.bm_jobs,
+                      word_bits=args.word_bits, qstats=args.qstats,
+                      fft_kernel=args.fft_kernel, fft_scaling=args.fft_scaling, fft_opcount=args.fft_opcount)
+
     # (교체) args.sweep 분기 안
-    if args.sweep:
+    if args.ct_leak_bench:
+        sigma, mp_dps = param_grid["sigma_list"][0], param_grid["mp_dps_list"][0]
+        k_max = max(1, int(np.ceil(10.0 * sigma)))
+        rep = timing_leak_benchmark(discrete_gaussian_pmf_mp(k_max, sigma, mp_dps), k_max)
+        print(json.dumps({"sigma": sigma, "mp_dps": mp_dps, **rep}, indent=2))
+    elif args.ntt:
+        from .sweep_module import ntt_sweep_and_export
+        ntt_grid = {"q_list": [int(x) for x in args.ntt_q_list.split(",")],
+                    "reduce_list": args.ntt_reduce_list.split(","),
+                    "batch_list": [int(x) for x in args.ntt_batch_list.split(",")]}
+        ntt_sweep_and_export(ntt_grid, compare_ntt, jobs=args.jobs, resume=args.resume,
+                             raw_archive=args.raw_archive, hash_mode=args.hash, trace_out=args.trace_out,
+                             plots=args.plots)
+    elif args.sweep or args.resume:
         # --- UPDATE: in main(), sweep call receive 5 returns ---
-        csv_path, png_relL2, png_perf, png_ks, png_mse = sweep_and_export(param_grid, compare_single)
-        print(f"\n✅ Sweep done.\nCSV: {csv_path}\nFFT: {png_relL2}\nPerf: {png_perf}\nKS: {png_ks}\nMSE: {png_mse}")
+        csv_path, png_relL2, png_perf, png_ks, png_mse = sweep_and_export(param_grid, compute, jobs=args.jobs,
+                                                                          resume=args.resume,
+                                                                          raw_archive=args.raw_archive,
+                                                                          hash_mode=args.hash,
+                                                                          trace_out=args.trace_out,
+                                                                          plots=args.plots)
+        if args.plots:
+            print(f"\n✅ Sweep done.\nCSV: {csv_path}\nFFT: {png_relL2}\nPerf: {png_perf}\nKS: {png_ks}\nMSE: {png_mse}")
+        else:
+            print(f"\n✅ Sweep done.\nCSV: {csv_path}")
         # -----------------------------------------------------------------
     else:
         # 단일 실행도 RAW 해시만 콘솔에 같이 표시 (파일 저장 없음)
-        res, raw = compare_single(param_grid["I_list"][0], param_grid["N_list"][0],
-                                param_grid["sigma_list"][0], param_grid["mp_dps_list"][0],
-                                param_grid["sampler_list"][0], need_raw=True)
+        with span("point"):
+            res, raw = compute(param_grid["I_list"][0], param_grid["N_list"][0],
+                               param_grid["sigma_list"][0], param_grid["mp_dps_list"][0],
+                               param_grid["sampler_list"][0], need_raw=True)
         from .sweep_module import raw_sha256_from_payload, timestamp
-        sha = raw_sha256_from_payload(raw)
-        print(json.dumps({"result": res, "raw_timestamp": timestamp(), "raw_sha256": sha}, indent=2))
+        sha = raw_sha256_from_payload(raw, args.hash or "sha256")
+        out = {"result": res, "raw_timestamp": timestamp(), "raw_sha256": sha}
+        if TRACE.enabled:
+            out["trace"] = TRACE.stats()
+            if args.trace_out:
+                TRACE.dump_chrome(args.trace_out)
+        print(json.dumps(out, indent=2))
+
+    if prof is not None:
+        import sys
+        import pstats
+        prof.disable()
+        prof.dump_stats(args.profile)
+        # stdout(JSON) 과 섞이지 않도록 stderr 로 요약
+        pstats.Stats(prof, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
 
 
 if __name__ == "__main__":
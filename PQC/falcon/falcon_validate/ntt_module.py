@@ -0,0 +1,292 @@
+# falcon_validate/ntt_module.py
+# Kyber / Dilithium NTT over Z_q[x]/(x^256 + 1) (q = 3329, 8380417): layer-vectorized forward /
+# inverse NTT with Montgomery and Barrett reduction, a bit-exact model of the 16-bit Montgomery
+# datapath (montgomery_mult16 / ntt_butterfly, PQC/Kyber_NTT_ISA_Integration_v0_3.md) and a
+# pure-Python reference
+#
+#   coefficients canonical in [0, q);  zetas[k] = root^brv(k)  (Kyber: 7 layers, degree-1 slots)
+#   forward CT:  (u, w) -> (u + z w, u - z w);  inverse GS: (x, y) -> (x + y, (x - y) / z), * 2^-layers
+
+from __future__ import annotations
+import numpy as np
+from .twiddle_module import TWIDDLES
+
+REDUCTIONS = ("montgomery", "barrett", "rtl")
+
+
+class NttParams:
+    """Per-modulus NTT constants: root of unity, layers, Montgomery R = 2^r_bits, Barrett mu"""
+    def __init__(self, name: str, q: int, root: int, layers: int, r_bits: int, n: int = 256):
+        self.name = name
+        self.q = q
+        self.root = root
+        self.layers = layers
+        self.n = n
+        self.slot = n >> layers                       # 2: Kyber base multiplication in Z_q[x]/(x^2 - gamma)
+        self.r_bits = r_bits
+        self.R = 1 << r_bits
+        self.rmask = self.R - 1
+        self.qinv = (-pow(q, -1, self.R)) % self.R    # -q^-1 mod R (doc QINV = 3327)
+        self.L = q.bit_length()
+        self.mu = (1 << (2 * self.L)) // q            # Barrett: x < 2^2L -> r in [0, 3q)
+        self.zetas = [pow(root, bit_reverse(k, layers), q) for k in range(1 << layers)]
+        self.zetas_inv = [pow(z, -1, q) for z in self.zetas]
+
+    def mont(self, x: int) -> int:
+        """x * R mod q (Montgomery domain)"""
+        return x * self.R % self.q
+
+    def inv_scale(self, s: int = 1) -> int:
+        """2^-layers * s mod q (final inverse-NTT factor, s = R after Montgomery pointwise products)"""
+        return pow(2, -self.layers, self.q) * s % self.q
+
+
+def bit_reverse(k: int, bits: int) -> int:
+    return int(format(k, f"0{bits}b")[::-1], 2)
+
+
+NTT_PARAMS = {
+    3329: NttParams("kyber", 3329, 17, 7, 16),
+    8380417: NttParams("dilithium", 8380417, 1753, 8, 32),
+}
+
+
+def ntt_params(q: int) -> NttParams:
+    if q not in NTT_PARAMS:
+        raise ValueError(f"Unsupported NTT modulus: {q} (one of {sorted(NTT_PARAMS)})")
+    return NTT_PARAMS[q]
+
+
+# zetas[] as printed in Kyber_NTT_ISA_Integration_v0_3.md §1 (Montgomery domain, R = 2^16)
+DOC_ZETAS = [
+    2285, 2571, 2647, 1425, 292, 108, 3277, 2375, 179, 1370, 2432, 1816, 509, 862, 1844, 2956,
+    331, 2682, 1915, 1983, 235, 3117, 1030, 835, 1416, 1234, 1418, 3025, 1494, 3153, 1699, 297,
+    667, 1507, 2209, 2260, 1020, 1694, 1407, 1719, 1439, 1415, 1179, 1211, 3124, 2343, 228, 1944,
+    883, 305, 2291, 2517, 1368, 336, 1041, 1690, 317, 1706, 982, 1650, 285, 1215, 2444, 3270,
+    229, 1451, 262, 2749, 2094, 2640, 1947, 893, 1078, 2513, 1162, 1596, 145, 3274, 2416, 3179,
+    1084, 1834, 1289, 727, 1850, 1977, 1511, 1033, 254, 372, 1207, 2333, 1975, 172, 590, 1754,
+    1353, 1288, 2365, 1821, 3214, 2984, 716, 2534, 1564, 1667, 1831, 1736, 3065, 1490, 1727, 1116,
+    1002, 3165, 1197, 2741, 765, 3110, 2294, 2441, 1035, 1735, 1291, 1603, 2838, 2862, 2763, 1989,
+]
+
+
+def doc_zetas_mismatch() -> list[int]:
+    """Indices where DOC_ZETAS differs from mont(17^brv7(k)) (the table the RTL expects)"""
+    p = NTT_PARAMS[3329]
+    return [k for k, z in enumerate(DOC_ZETAS) if z != p.mont(p.zetas[k])]
+
+
+# --- reductions (int64 / uint64 arrays) ---
+def mont_reduce_np(x: np.ndarray, p: NttParams) -> np.ndarray:
+    """x * R^-1 mod q for 0 <= x < q * R  -> [0, q)"""
+    x = np.asarray(x, dtype=np.int64)
+    # R = 2^32 이면 (x mod R) * qinv 가 int64 를 넘지만 wrap 해도 하위 32 bit 는 정확
+    u = ((x & p.rmask) * p.qinv) & p.rmask
+    t = (x + u * p.q) >> p.r_bits
+    return np.where(t >= p.q, t - p.q, t)
+
+
+def barrett_reduce_np(x: np.ndarray, p: NttParams) -> np.ndarray:
+    """x mod q for 0 <= x < 2^2L: t = ((x >> (L-1)) * mu) >> (L+1), two conditional subtractions"""
+    x = np.asarray(x, dtype=np.int64)
+    t = ((x >> (p.L - 1)) * p.mu) >> (p.L + 1)
+    r = x - t * p.q
+    r = np.where(r >= p.q, r - p.q, r)
+    return np.where(r >= p.q, r - p.q, r)
+
+
+def add_mod(a: np.ndarray, b: np.ndarray, q: int) -> np.ndarray:
+    s = a + b
+    return np.where(s >= q, s - q, s)
+
+
+def sub_mod(a: np.ndarray, b: np.ndarray, q: int) -> np.ndarray:
+    d = a - b
+    return np.where(d < 0, d + q, d)
+
+
+# --- bit-exact RTL model: montgomery_mult16 / ntt_butterfly at word width W = r_bits ---
+def montgomery_mult_rtl(a, b, p: NttParams, stats: dict | None = None) -> np.ndarray:
+    """c = a*b*R^-1 with W-bit ports, 2W-bit t_prod / t_sum (wrapping) and one conditional
+    subtract (exact for a, b < q). stats["rtl_sum_overflow"] counts wrapped t_sum"""
+    wm = np.uint64(p.rmask)
+    W = np.uint64(p.r_bits)
+    pm = np.uint64((1 << (2 * p.r_bits)) - 1)            # W=32: 2^64 - 1, uint64 wrap = [63:0]
+    t_prod = ((np.asarray(a).astype(np.uint64) & wm) * (np.asarray(b).astype(np.uint64) & wm)) & pm
+    u = ((t_prod & wm) * np.uint64(p.qinv)) & wm
+    t_sum = (t_prod + u * np.uint64(p.q)) & pm
+    if stats is not None:
+        stats["rtl_sum_overflow"] = stats.get("rtl_sum_overflow", 0) + int(np.count_nonzero(t_sum < t_prod))
+    t_red = (t_sum >> W) & wm
+    q = np.uint64(p.q)
+    return np.where(t_red >= q, t_red - q, t_red).astype(np.int64)
+
+
+def add_mod_rtl(x, y, p: NttParams) -> np.ndarray:
+    """add_mod_q: (W+1)-bit sum, (sum >= Q) ? sum - Q : sum[W-1:0]"""
+    s = (x & p.rmask) + (y & p.rmask)
+    return np.where(s >= p.q, s - p.q, s & p.rmask)
+
+
+def sub_mod_rtl(x, y, p: NttParams) -> np.ndarray:
+    """sub_mod_q: signed (W+1)-bit diff, diff[W] ? diff + Q : diff[W-1:0] (low W bits kept)"""
+    d = (x & p.rmask) - (y & p.rmask)
+    return np.where(d < 0, d + p.q, d) & p.rmask
+
+
+def butterfly_rtl(a, b, zeta, p: NttParams, stats: dict | None = None):
+    """ntt_butterfly: t = montgomery_mult(b, zeta); (a + t, a - t) mod q"""
+    t = montgomery_mult_rtl(b, zeta, p, stats)
+    return add_mod_rtl(a, t, p), sub_mod_rtl(a, t, p)
+
+
+# --- vectorized NTT (last axis, leading axes = batch) ---
+def twiddles_ntt(p: NttParams, reduce: str):
+    """(zetas, zetas_inv) int64 arrays: Montgomery domain for montgomery / rtl, plain for barrett"""
+    if reduce not in REDUCTIONS:
+        raise ValueError(f"Unsupported NTT reduction: {reduce}")
+    return TWIDDLES.ntt(p, "plain" if reduce == "barrett" else "mont")
+
+
+def _mulz(w, z, p: NttParams, reduce: str, stats) -> np.ndarray:
+    if reduce == "montgomery":
+        return mont_reduce_np(w * z, p)
+    if reduce == "barrett":
+        return barrett_reduce_np(w * z, p)
+    return montgomery_mult_rtl(w, z, p, stats)
+
+
+def ntt_np(a, p: NttParams, reduce: str = "montgomery", stats: dict | None = None) -> np.ndarray:
+    """Forward NTT (Cooley–Tukey, zetas in bit-reversed order), one array op per layer.
+    Output slot order matches the Kyber / Dilithium reference ntt()."""
+    a = np.asarray(a, dtype=np.int64)
+    shape = a.shape
+    n = shape[-1]
+    zt, _ = twiddles_ntt(p, reduce)
+    length = n >> 1
+    for _ in range(p.layers):
+        blocks = n // (2 * length)
+        z = zt[blocks:2 * blocks, None]
+        v = a.reshape(-1, blocks, 2, length)
+        u, w = v[:, :, 0], v[:, :, 1]
+        if reduce == "rtl":
+            top, bot = butterfly_rtl(u, w, z, p, stats)
+        else:
+            t = _mulz(w, z, p, reduce, stats)
+            top, bot = add_mod(u, t, p.q), sub_mod(u, t, p.q)
+        a = np.stack([top, bot], axis=2).reshape(shape)
+        length >>= 1
+    return a
+
+
+def intt_np(A, p: NttParams, reduce: str = "montgomery", stats: dict | None = None,
+            scale: int = 1) -> np.ndarray:
+    """Inverse NTT (Gentleman–Sande) times 2^-layers * scale (scale = R undoes one Montgomery product)"""
+    a = np.asarray(A, dtype=np.int64)
+    shape = a.shape
+    n = shape[-1]
+    _, zi = twiddles_ntt(p, reduce)
+    length = n >> p.layers
+    for _ in range(p.layers):
+        blocks = n // (2 * length)
+        z = zi[blocks:2 * blocks, None]
+        v = a.reshape(-1, blocks, 2, length)
+        x, y = v[:, :, 0], v[:, :, 1]
+        if reduce == "rtl":
+            top = add_mod_rtl(x, y, p)
+            bot = montgomery_mult_rtl(sub_mod_rtl(x, y, p), z, p, stats)
+        else:
+            top = add_mod(x, y, p.q)
+            bot = _mulz(sub_mod(x, y, p.q), z, p, reduce, stats)
+        a = np.stack([top, bot], axis=2).reshape(shape)
+        length <<= 1
+    f = p.inv_scale(scale)
+    if reduce == "barrett":
+        return barrett_reduce_np(a * f, p)
+    return _mulz(a, np.int64(p.mont(f)), p, reduce, stats)
+
+
+def pointwise_np(A, B, p: NttParams, reduce: str = "montgomery", stats: dict | None = None):
+    """NTT-domain product -> (C, scale for intt_np): Dilithium slot-wise, Kyber basemul in
+    Z_q[x]/(x^2 - gamma_i), gamma_{2i} = zetas[64+i], gamma_{2i+1} = -zetas[64+i]"""
+    A = np.asarray(A, dtype=np.int64)
+    B = np.asarray(B, dtype=np.int64)
+    s = 1 if reduce == "barrett" else p.R % p.q
+    mul = lambda x, y: _mulz(x, y, p, reduce, stats)
+    if p.slot == 1:
+        return mul(A, B), s
+    if p.slot != 2:
+        raise ValueError(f"Unsupported NTT slot degree: {p.slot}")
+    zt, _ = twiddles_ntt(p, reduce)
+    h = p.n >> 2
+    g = np.empty(2 * h, dtype=np.int64)
+    g[0::2] = zt[h:2 * h]
+    g[1::2] = (p.q - zt[h:2 * h]) % p.q
+    a0, a1 = A[..., 0::2], A[..., 1::2]
+    b0, b1 = B[..., 0::2], B[..., 1::2]
+    # Montgomery: mul(a1, b1) 는 R^-1 배, gamma 는 Montgomery 도메인 → 한 번 더 곱해도 R^-1 배 유지
+    c0 = add_mod(mul(mul(a1, b1), g), mul(a0, b0), p.q)
+    c1 = add_mod(mul(a0, b1), mul(a1, b0), p.q)
+    C = np.empty(np.broadcast_shapes(A.shape, B.shape), dtype=np.int64)
+    C[..., 0::2], C[..., 1::2] = c0, c1
+    return C, s
+
+
+def poly_mul_ntt(a, b, p: NttParams, reduce: str = "montgomery", stats: dict | None = None) -> np.ndarray:
+    """a * b mod (q, x^n + 1) through the NTT domain"""
+    C, s = pointwise_np(ntt_np(a, p, reduce, stats), ntt_np(b, p, reduce, stats), p, reduce, stats)
+    return intt_np(C, p, reduce, stats, scale=s)
+
+
+# --- pure-Python reference (int lists, %, plain-domain zetas) ---
+def ntt_ref(a, p: NttParams) -> list[int]:
+    a = [int(c) % p.q for c in a]
+    n = len(a)
+    k = 1
+    length = n >> 1
+    while length >= p.slot:
+        for start in range(0, n, 2 * length):
+            z = p.zetas[k]
+            k += 1
+            for j in range(start, start + length):
+                t = z * a[j + length] % p.q
+                a[j + length] = (a[j] - t) % p.q
+                a[j] = (a[j] + t) % p.q
+        length >>= 1
+    return a
+
+
+def intt_ref(A, p: NttParams) -> list[int]:
+    a = [int(c) % p.q for c in A]
+    n = len(a)
+    length = p.slot
+    while length < n:
+        blocks = n // (2 * length)
+        for b in range(blocks):
+            z = p.zetas_inv[blocks + b]
+            for j in range(2 * length * b, 2 * length * b + length):
+                x, y = a[j], a[j + length]
+                a[j] = (x + y) % p.q
+                a[j + length] = (x - y) * z % p.q
+        length <<= 1
+    f = p.inv_scale()
+    return [c * f % p.q for c in a]
+
+
+def poly_mul_ref(a, b, q: int) -> list[int]:
+    """Schoolbook a * b mod (q, x^n + 1)"""
+    n = len(a)
+    c = [0] * n
+    for i, ai in enumerate(a):
+        ai = int(ai)
+        for j, bj in enumerate(b):
+            if i + j < n:
+                c[i + j] += ai * int(bj)
+            else:
+                c[i + j - n] -= ai * int(bj)
+    return [v % q for v in c]
+
+
+def random_poly(p: NttParams, batch: int | None = None, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, p.q, size=(p.n,) if batch is None else (batch, p.n), dtype=np.int64)
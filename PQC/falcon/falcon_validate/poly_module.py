@@ -0,0 +1,147 @@
+# falcon_validate/poly_module.py
+# Falcon polynomial datapath over R[x]/(x^n + 1): negacyclic (psi-twisted) FFT and inverse,
+# split_fft / merge_fft and pointwise mul / div / adj in Q-format (array-backed, batched on
+# the leading axes), with FP64 / mpmath / exact-integer references
+#
+#   FFT(f)[k] = f(zeta_k),  zeta_k = psi^(2k+1),  psi = exp(-i*pi/n)   (roots of x^n + 1)
+#   pointwise: q.cmul (product), q.cdiv (quotient), q.cconj (adjoint f(1/x) of a real f)
+
+from __future__ import annotations
+import numpy as np
+from .qformat_module import QCtx, QcArray
+from .fft_module import fft_q_np, mp_fft
+from .twiddle_module import TWIDDLES
+
+
+def psi_q(n: int, q: QCtx) -> QcArray:
+    """psi^j, j < n, in Q-format (cached in TWIDDLES)"""
+    return QcArray(*TWIDDLES.psi(n, q)[0])
+
+
+def poly_to_q(f, q: QCtx) -> QcArray:
+    """Real (or complex) coefficients (..., n) -> QcArray"""
+    return q.cfrom_f(f)
+
+
+# --- Q-format ---
+def poly_fft_q(f: QcArray, q: QCtx) -> QcArray:
+    """Negacyclic FFT: twist by psi^j, then fft_q_np (natural order, zeta_k = psi^(2k+1))"""
+    a = q.cmul(f, psi_q(f.re.shape[-1], q))
+    re, im, _ = fft_q_np(a.re, a.im, q)
+    return QcArray(re, im)
+
+
+def poly_ifft_q(F: QcArray, q: QCtx) -> QcArray:
+    """Inverse of poly_fft_q: conj(DFT(conj F) / n * psi^j), the 1/n from the per-stage >> 1"""
+    n = F.re.shape[-1]
+    c = q.cconj(F)
+    re, im, _ = fft_q_np(c.re, c.im, q, rescale=False)
+    return q.cconj(q.cmul(QcArray(re, im), psi_q(n, q)))
+
+
+def split_fft_q(F: QcArray, q: QCtx) -> tuple[QcArray, QcArray]:
+    """FFT(f) -> (FFT(f0), FFT(f1)) with f(x) = f0(x^2) + x f1(x^2) (size n/2 each)"""
+    n = F.re.shape[-1]
+    h = n >> 1
+    a, b = F[..., :h], F[..., h:]                           # zeta_{k+n/2} = -zeta_k
+    zc = q.cconj(psi_q(n, q)[1::2])                           # 1 / zeta_k
+    f0 = q.cshr_round(q.cadd(a, b), 1)
+    f1 = q.cmul(q.cshr_round(q.csub(a, b), 1), zc)
+    return f0, f1
+
+
+def merge_fft_q(F0: QcArray, F1: QcArray, q: QCtx) -> QcArray:
+    """Inverse of split_fft_q (one DIF butterfly with zeta_k)"""
+    n = F0.re.shape[-1] << 1
+    t = q.cmul(F1, psi_q(n, q)[1::2])
+    top, bot = q.cadd(F0, t), q.csub(F0, t)
+    return QcArray(np.concatenate([top.re, bot.re], axis=-1), np.concatenate([top.im, bot.im], axis=-1))
+
+
+def poly_mul_q(f: QcArray, g: QcArray, q: QCtx) -> QcArray:
+    """f * g mod (x^n + 1) through the FFT domain"""
+    return poly_ifft_q(q.cmul(poly_fft_q(f, q), poly_fft_q(g, q)), q)
+
+
+def poly_div_q(f: QcArray, g: QcArray, q: QCtx) -> QcArray:
+    """f / g mod (x^n + 1) (g invertible) through the FFT domain"""
+    return poly_ifft_q(q.cdiv(poly_fft_q(f, q), poly_fft_q(g, q)), q)
+
+
+# --- FP64 ---
+def psi_fp64(n: int) -> np.ndarray:
+    return np.exp(-1j * np.pi * np.arange(n) / n)
+
+
+def poly_fft_fp64(f) -> np.ndarray:
+    f = np.asarray(f, dtype=np.complex128)
+    return np.fft.fft(f * psi_fp64(f.shape[-1]), axis=-1)
+
+
+def poly_ifft_fp64(F) -> np.ndarray:
+    F = np.asarray(F, dtype=np.complex128)
+    return np.fft.ifft(F, axis=-1) * np.conj(psi_fp64(F.shape[-1]))
+
+
+def split_fft_fp64(F):
+    n = F.shape[-1]
+    h = n >> 1
+    a, b = F[..., :h], F[..., h:]
+    return (a + b) / 2, (a - b) / 2 * np.conj(psi_fp64(n)[1::2])
+
+
+def merge_fft_fp64(F0, F1) -> np.ndarray:
+    t = F1 * psi_fp64(F0.shape[-1] << 1)[1::2]
+    return np.concatenate([F0 + t, F0 - t], axis=-1)
+
+
+def poly_mul_fp64(f, g) -> np.ndarray:
+    return poly_ifft_fp64(poly_fft_fp64(f) * poly_fft_fp64(g))
+
+
+def poly_div_fp64(f, g) -> np.ndarray:
+    return poly_ifft_fp64(poly_fft_fp64(f) / poly_fft_fp64(g))
+
+
+# --- mpmath (1-D; mp_fft + mp twist) ---
+def psi_mp(n: int, dps: int):
+    import mpmath as mp
+    mp.mp.dps = dps
+    return [mp.e ** (mp.j * (-mp.pi * j / n)) for j in range(n)]
+
+
+def poly_fft_mp(f, dps: int = 60):
+    import mpmath as mp
+    n = len(f)
+    psi = psi_mp(n, dps)
+    # twist 결과를 complex128 로 되돌리지 않음 (convert=False)
+    return mp_fft([mp.mpc(c) * w for c, w in zip(f, psi)], dps, convert=False)
+
+
+def poly_ifft_mp(F, dps: int = 60):
+    import mpmath as mp
+    n = len(F)
+    psi = psi_mp(n, dps)
+    y = mp_fft([mp.conj(mp.mpc(z)) for z in F], dps, convert=False)
+    return [mp.conj(z) / n * mp.conj(w) for z, w in zip(y, psi)]
+
+
+def poly_mul_mp(f, g, dps: int = 60):
+    F, G = poly_fft_mp(f, dps), poly_fft_mp(g, dps)
+    return poly_ifft_mp([a * b for a, b in zip(F, G)], dps)
+
+
+def mp_to_complex(xs) -> np.ndarray:
+    return np.array([complex(z) for z in xs], dtype=np.complex128)
+
+
+# --- exact ---
+def negacyclic_convolve(f, g) -> np.ndarray:
+    """Exact f * g mod (x^n + 1) for integer coefficient vectors (Python ints, no overflow)"""
+    f = np.array([int(c) for c in f], dtype=object)
+    g = np.array([int(c) for c in g], dtype=object)
+    n = len(f)
+    c = np.convolve(f, g)
+    out = c[:n].copy()
+    out[:n - 1] -= c[n:]                                      # x^n = -1
+    return out
@@ -2,38 +2,87 @@
 # Q-format fixed-point arithmetic utilities for Falcon validation
 
 from __future__ import annotations
+import numpy as np
+
+_M32 = np.uint64(0xFFFFFFFF)
+_S32 = np.uint64(32)
+
+
+def _uabs(a: np.ndarray) -> np.ndarray:
+    """|a| as uint64 (|INT64_MIN| = 2^63 stays exact)"""
+    return np.where(a < 0, -a, a).view(np.uint64)
+
+
+def _umul128(a: np.ndarray, b: np.ndarray):
+    """Exact 64x64 -> 128-bit unsigned product as (hi, lo) uint64 arrays"""
+    a0 = a & _M32; a1 = a >> _S32
+    b0 = b & _M32; b1 = b >> _S32
+    p00 = a0 * b0
+    p01 = a0 * b1
+    p10 = a1 * b0
+    p11 = a1 * b1
+    mid = (p00 >> _S32) + (p01 & _M32) + (p10 & _M32)
+    lo = (p00 & _M32) | (mid << _S32)
+    hi = p11 + (p01 >> _S32) + (p10 >> _S32) + (mid >> _S32)
+    return hi, lo
+
 
 class QCtx:
     """Q-format context: manages bit-width and scaling."""
-    def __init__(self, I_bits: int):
-        assert 1 <= I_bits <= 63, "I_bits must be between 1 and 63"
+    # 지원 word 폭: <=32 는 int64 직접 곱, <=64 는 32-bit limb 128-bit 곱, 128 은 object(int) 배열
+    WORD_BITS = (16, 32, 48, 64, 128)
+
+    def __init__(self, I_bits: int, word_bits: int = 64, stats: bool = False):
+        assert word_bits in self.WORD_BITS, f"word_bits must be one of {self.WORD_BITS}"
+        assert 1 <= I_bits <= word_bits - 1, f"I_bits must be between 1 and {word_bits - 1}"
+        self.W = word_bits
         self.I = I_bits
-        self.F = 64 - I_bits
+        self.F = word_bits - I_bits
         self.QONE = 1 << self.F
-        self.QMAX = (1 << 63) - 1
-        self.QMIN = -(1 << 63)
+        self.QMAX = (1 << (word_bits - 1)) - 1
+        self.QMIN = -(1 << (word_bits - 1))
+        self._half = 1 << (self.F - 1)
+        self.dtype = object if word_bits > 64 else np.int64
+        # np.where 용 0-d 상수 (Q128 은 int64 범위 밖 → object)
+        self._qmax_a = np.asarray(self.QMAX, dtype=self.dtype)
+        self._qmin_a = np.asarray(self.QMIN, dtype=self.dtype)
+        self._half_a = np.asarray(self._half, dtype=self.dtype)
+        # opt-in 계측 (None 이면 saturation 분기 밖에서는 비용 없음)
+        self.stats = QStats(self) if stats else None
+
+    def _sat(self, z: int, op: str) -> int:
+        # min(max(...)) 대신 비교 2회 (scalar fast path)
+        if z > self.QMAX:
+            if self.stats is not None:
+                self.stats.sat[op] += 1
+            return self.QMAX
+        if z < self.QMIN:
+            if self.stats is not None:
+                self.stats.sat[op] += 1
+            return self.QMIN
+        return z
+
+    def _count(self, op: str, mask: np.ndarray):
+        if self.stats is not None:
+            self.stats.sat[op] += int(np.count_nonzero(mask))
 
     def from_f(self, x: float) -> int:
-        y = int(round(x * self.QONE))
-        return min(max(y, self.QMIN), self.QMAX)
+        return self._sat(int(round(x * self.QONE)), "from_f")
 
     def to_f(self, q: int) -> float:
         return float(q) / self.QONE
 
     def add(self, a: int, b: int) -> int:
-        z = a + b
-        return min(max(z, self.QMIN), self.QMAX)
+        return self._sat(a + b, "add")
 
     def sub(self, a: int, b: int) -> int:
-        z = a - b
-        return min(max(z, self.QMIN), self.QMAX)
+        return self._sat(a - b, "sub")
 
     def mul(self, a: int, b: int) -> int:
         """Q-multiplication with rounding"""
         prod = a * b
-        prod += (1 << (self.F - 1)) if prod >= 0 else -(1 << (self.F - 1))
-        z = prod >> self.F
-        return min(max(z, self.QMIN), self.QMAX)
+        prod += self._half if prod >= 0 else -self._half
+        return self._sat(prod >> self.F, "mul")
 
     def shr_round(self, x: int, s: int) -> int:
         if s <= 0:
@@ -41,14 +90,310 @@ class QCtx:
         else:
             add = 1 << (s - 1)
             y = (x + add) >> s if x >= 0 else (x - add) >> s
-        return min(max(y, self.QMIN), self.QMAX)
+        return self._sat(y, "shr" if s > 0 else "shl")
+
+    def div(self, a: int, b: int) -> int:
+        """Q-division a / b, rounded half away from zero; b = 0 saturates (0 / 0 = 0)"""
+        if b == 0:
+            return self._sat((a > 0) - (a < 0) << self.W, "div")
+        num = a << self.F
+        qq, r = divmod(abs(num), abs(b))
+        qq += 2 * r >= abs(b)
+        return self._sat(-qq if (num < 0) != (b < 0) else qq, "div")
+
+    # --- ADD: array fast-path ops, bit-identical to the scalar ops above ---
+    def asarray(self, x) -> np.ndarray:
+        return np.asarray(x, dtype=self.dtype)
+
+    def _clip_np(self, z: np.ndarray, op: str) -> np.ndarray:
+        hi = z > self.QMAX
+        lo = z < self.QMIN
+        sat = hi | lo
+        if sat.any():
+            self._count(op, sat)
+            z = np.where(hi, self._qmax_a, np.where(lo, self._qmin_a, z))
+        return z
+
+    def from_f_np(self, x) -> np.ndarray:
+        y = np.rint(np.asarray(x, dtype=np.float64) * float(self.QONE))
+        if self.W > 64:
+            z = np.empty(y.shape, dtype=object)
+            z.ravel()[:] = [int(v) for v in y.ravel().tolist()]
+            return self._clip_np(z, "from_f")
+        if self.W < 64:
+            # QMAX/QMIN (|.| <= 2^47) 은 float64 로 exact → 직접 비교
+            hi = y > self.QMAX
+            lo = y < self.QMIN
+        else:
+            hi = y >= 9223372036854775808.0      # 2**63: outside int64
+            lo = y < -9223372036854775808.0
+        out = np.empty(y.shape, dtype=np.int64)
+        sat = hi | lo
+        ok = ~sat
+        out[ok] = y[ok].astype(np.int64)
+        out[hi] = self.QMAX
+        out[lo] = self.QMIN
+        if self.stats is not None:
+            self._count("from_f", sat)
+        return out
+
+    def to_f_np(self, q) -> np.ndarray:
+        return self.asarray(q).astype(np.float64) / float(self.QONE)
+
+    def add_np(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if self.W != 64:
+            return self._clip_np(a + b, "add")       # int64 (W<64) / object (W=128): overflow 없음
+        z = a + b                                # wraps on overflow
+        ovf = ((a ^ z) & (b ^ z)) < 0
+        if ovf.any():
+            self._count("add", ovf)
+            z = np.where(ovf, np.where(a >= 0, self.QMAX, self.QMIN), z)
+        return z
+
+    def sub_np(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if self.W != 64:
+            return self._clip_np(a - b, "sub")
+        z = a - b
+        ovf = ((a ^ b) & (a ^ z)) < 0
+        if ovf.any():
+            self._count("sub", ovf)
+            z = np.where(ovf, np.where(a >= 0, self.QMAX, self.QMIN), z)
+        return z
+
+    def mul_np(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Q-multiplication with rounding on integer arrays (exact wide product)"""
+        a, b = np.broadcast_arrays(self.asarray(a), self.asarray(b))
+        if self.W <= 32 or self.W > 64:
+            # W<=32: |a*b| <= 2^62 → int64 직접 / W=128: Python int (object) 그대로 exact
+            prod = a * b
+            prod = prod + np.where(prod >= 0, self._half_a, -self._half_a)
+            return self._clip_np(prod >> self.F, "mul")
+        return self._mul_limb(a, b)
+
+    def _mul_limb(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """32 < W <= 64: 64x64 -> 128-bit product from 32-bit limbs"""
+        neg = ((a < 0) ^ (b < 0)) & (a != 0) & (b != 0)
+        hi, lo = _umul128(_uabs(a), _uabs(b))
+        # |prod| + 2^(F-1), then split into quotient / remainder of 2^F
+        F = self.F
+        lo2 = lo + np.uint64(1 << (F - 1))
+        hi = hi + (lo2 < lo).astype(np.uint64)
+        qlo = (lo2 >> np.uint64(F)) | (hi << np.uint64(64 - F))
+        qhi = hi >> np.uint64(F)
+        inexact = (lo2 & np.uint64((1 << F) - 1)) != 0
+        big = (qhi != 0) | (qlo > np.uint64(self.QMAX))
+        # 음수는 floor 이므로 나머지가 있으면 크기가 1 증가
+        qneg = qlo + inexact.astype(np.uint64)
+        neg_sat = (qhi != 0) | (qlo >= np.uint64(1 << 63)) | (qneg > np.uint64(-self.QMIN))
+        z = np.where(neg, -(qneg.view(np.int64)), qlo.view(np.int64))
+        nsat = neg & neg_sat
+        psat = ~neg & big
+        sat = nsat | psat
+        if sat.any():
+            self._count("mul", sat)
+            z = np.where(nsat, self.QMIN, z)
+            z = np.where(psat, self.QMAX, z)
+        return z
+
+    def shr_round_np(self, x: np.ndarray, s: int) -> np.ndarray:
+        if s <= 0:
+            return self.shl_sat_np(x, -s)
+        add = 1 << (s - 1)
+        frac = x & ((1 << s) - 1)
+        return (x >> s) + ((frac + np.where(x >= 0, add, -add)) >> s)
+
+    def div_np(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Q-division on integer arrays (exact, same rounding as div)"""
+        a, b = np.broadcast_arrays(self.asarray(a), self.asarray(b))
+        if self.W > 32:
+            # a << F 는 64-bit 를 넘음 → Python int (object) 로 exact 계산
+            a, b = a.astype(object), b.astype(object)
+        num = a << self.F
+        zero = b == 0
+        ab = np.where(zero, 1, np.abs(b))
+        an = np.abs(num)
+        qq = an // ab                           # (np.divmod 은 object 배열 미지원)
+        qq = qq + (2 * (an - qq * ab) >= ab)
+        z = np.where((num < 0) != (b < 0), -qq, qq)
+        if zero.any():
+            # b = 0: ±overflow → _clip_np 에서 saturate
+            big = np.asarray(1 << self.W, dtype=num.dtype)
+            nbig = np.asarray(-(1 << self.W), dtype=num.dtype)
+            z = np.where(zero, np.where(a > 0, big, np.where(a < 0, nbig, 0)), z)
+        z = self._clip_np(z, "div")
+        return z if z.dtype == self.dtype else z.astype(self.dtype)
+
+    def shl_sat_np(self, x: np.ndarray, s: int) -> np.ndarray:
+        if s == 0:
+            return x.copy()
+        y = x << s
+        hi = x > (self.QMAX >> s)
+        lo = x < (self.QMIN >> s)
+        sat = hi | lo
+        if sat.any():
+            self._count("shl", sat)
+            y = np.where(hi, self._qmax_a, np.where(lo, self._qmin_a, y))
+        return y
+    # -----------------------------------------------------------------------------
+
+    # --- ADD: bulk complex ops on QcArray (structure-of-arrays) ---
+    def cfrom_f(self, x) -> QcArray:
+        x = np.asarray(x, dtype=np.complex128)
+        return QcArray(self.from_f_np(x.real), self.from_f_np(x.imag))
+
+    def cto_f(self, a: QcArray) -> np.ndarray:
+        out = np.empty(len(a), dtype=np.complex128)
+        out.real = self.to_f_np(a.re)
+        out.imag = self.to_f_np(a.im)
+        return out
+
+    def cadd(self, a: QcArray, b: QcArray) -> QcArray:
+        return QcArray(self.add_np(a.re, b.re), self.add_np(a.im, b.im))
+
+    def csub(self, a: QcArray, b: QcArray) -> QcArray:
+        return QcArray(self.sub_np(a.re, b.re), self.sub_np(a.im, b.im))
+
+    def cmul(self, a: QcArray, b: QcArray) -> QcArray:
+        re = self.sub_np(self.mul_np(a.re, b.re), self.mul_np(a.im, b.im))
+        im = self.add_np(self.mul_np(a.re, b.im), self.mul_np(a.im, b.re))
+        return QcArray(re, im)
+
+    def cshr_round(self, a: QcArray, s: int) -> QcArray:
+        return QcArray(self.shr_round_np(a.re, s), self.shr_round_np(a.im, s))
+
+    def cconj(self, a: QcArray) -> QcArray:
+        # -QMIN 은 saturate (sub 로 계수)
+        return QcArray(a.re, self.sub_np(np.zeros_like(a.im), a.im))
+
+    def cdiv(self, a: QcArray, b: QcArray) -> QcArray:
+        """a / b by Smith's scaling: intermediates stay ~max(|a|, |b|) (no |b|^2 term)"""
+        swap = np.abs(b.im) > np.abs(b.re)
+        p = np.where(swap, b.im, b.re)          # |p| >= |s|  →  |r| <= 1
+        s = np.where(swap, b.re, b.im)
+        x = np.where(swap, a.im, a.re)
+        y = np.where(swap, a.re, a.im)
+        r = self.div_np(s, p)
+        d = self.add_np(p, self.mul_np(s, r))
+        re = self.div_np(self.add_np(x, self.mul_np(y, r)), d)
+        # swap 이면 허수부 부호 반전 → 분모 부호로 처리
+        d = np.where(swap, self.sub_np(np.zeros_like(d), d), d)
+        im = self.div_np(self.sub_np(y, self.mul_np(x, r)), d)
+        return QcArray(re, im)
+    # --------------------------------------------------------------
+
+
+def _as_qbuf(x) -> np.ndarray:
+    # Q128 은 object(int) 버퍼, 나머지는 int64
+    x = np.asarray(x)
+    return x if x.dtype == object else x.astype(np.int64, copy=False)
+
+
+# --- ADD: opt-in saturation / magnitude instrumentation (QCtx(..., stats=True)) ---
+def max_abs(*arrays) -> int:
+    """Largest |value| over integer arrays as a Python int (|INT64_MIN| 포함 exact)"""
+    m = 0
+    for a in arrays:
+        if len(a):
+            m = max(m, int(a.max()), -int(a.min()))
+    return m
+
+
+class QStats:
+    """Per-context counters: saturations per op, per FFT stage, max magnitude / headroom."""
+    OPS = ("from_f", "add", "sub", "mul", "div", "shr", "shl")
+
+    def __init__(self, q: QCtx):
+        self.W = q.W
+        self.QONE = q.QONE
+        self.sat = dict.fromkeys(self.OPS, 0)
+        self.stage_sat = []          # stage 별 saturation 수 (마지막 = rescale)
+        self.stage_max = []          # stage 출력의 max |raw int|
+        self._mark = 0
+
+    def reset(self):
+        for k in self.sat:
+            self.sat[k] = 0
+        self.stage_sat.clear()
+        self.stage_max.clear()
+
+    @property
+    def total(self) -> int:
+        return sum(self.sat.values())
+
+    def headroom(self, m: int) -> int:
+        """Unused integer bits before |m| would saturate (0 = at QMAX/QMIN)"""
+        return max(0, self.W - 1 - int(m).bit_length())
+
+    def begin_stage(self):
+        self._mark = self.total
+
+    def end_stage(self, maxabs: int):
+        self.stage_sat.append(self.total - self._mark)
+        self.stage_max.append(int(maxabs))
+
+    def columns(self, prefix: str) -> dict:
+        """Flat CSV columns; per-stage lists joined with ';'"""
+        out = {f"{prefix}sat_{op}": n for op, n in self.sat.items()}
+        out[f"{prefix}sat_total"] = self.total
+        if self.stage_max:
+            heads = [self.headroom(m) for m in self.stage_max]
+            out[f"{prefix}stage_sat"] = ";".join(str(n) for n in self.stage_sat)
+            out[f"{prefix}stage_maxabs"] = ";".join(f"{m / self.QONE:.6g}" for m in self.stage_max)
+            out[f"{prefix}stage_headroom"] = ";".join(str(h) for h in heads)
+            out[f"{prefix}headroom_bits"] = min(heads)
+        return out
+
+
+def qstats_fields(prefix: str, stages: bool = True) -> list[str]:
+    cols = [f"{prefix}sat_{op}" for op in QStats.OPS] + [f"{prefix}sat_total"]
+    if stages:
+        cols += [f"{prefix}stage_sat", f"{prefix}stage_maxabs", f"{prefix}stage_headroom",
+                 f"{prefix}headroom_bits"]
+    return cols
+# ---------------------------------------------------------------------------------
 
 
 class Qc:
     """Complex number with Q-format components"""
+    __slots__ = ("re", "im")
+
     def __init__(self, re: int, im: int):
         self.re = re
         self.im = im
 
     def __repr__(self):
         return f"Qc(re={self.re}, im={self.im})"
+
+
+class QcArray:
+    """Complex Q-format vector as separate re/im integer buffers"""
+    __slots__ = ("re", "im")
+
+    def __init__(self, re, im):
+        self.re = _as_qbuf(re)
+        self.im = _as_qbuf(im)
+
+    @classmethod
+    def from_list(cls, xs: list[Qc]) -> QcArray:
+        return cls([z.re for z in xs], [z.im for z in xs])
+
+    def to_list(self) -> list[Qc]:
+        return [Qc(r, i) for r, i in zip(self.re.tolist(), self.im.tolist())]
+
+    def __len__(self):
+        return len(self.re)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return Qc(int(self.re[idx]), int(self.im[idx]))
+        return QcArray(self.re[idx], self.im[idx])
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    @property
+    def nbytes(self) -> int:
+        return self.re.nbytes + self.im.nbytes
+
+    def __repr__(self):
+        return f"QcArray(n={len(self)})"
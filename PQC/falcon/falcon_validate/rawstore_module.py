@@ -0,0 +1,118 @@
+# falcon_validate/rawstore_module.py
+# Append-only raw payload archive: one binary file of 64-byte aligned arrays per sweep
+# plus a JSON Lines index (key -> offset / nbytes / sha256 / per-array dtype, shape)
+
+from __future__ import annotations
+import os
+import json
+import numpy as np
+
+_ALIGN = 64
+
+
+class RawStore:
+    """Single append-only columnar file (<base>.raw.bin) + index (<base>.raw.idx.jsonl)."""
+    def __init__(self, base: str):
+        self.bin_path = base + ".raw.bin"
+        self.idx_path = base + ".raw.idx.jsonl"
+        self._bin = None
+        self._idx = None
+        self._index = None
+
+    # --- write side ---
+    def append(self, key: str, payload: dict) -> dict:
+        """Append one grid point; returns its index record (sha256 over array bytes, sorted names)"""
+        if self._bin is None:
+            self._bin = open(self.bin_path, "ab")
+            self._idx = open(self.idx_path, "a")
+        f = self._bin
+        f.seek(0, os.SEEK_END)
+        start = _pad(f, f.tell())                  # 중단으로 남은 꼬리는 그대로 두고 뒤에 기록
+        import hashlib
+        h = hashlib.sha256()
+        arrays = {}
+        pos = start
+        for name in sorted(payload):
+            a = _le(payload[name])
+            pos = _pad(f, pos)
+            buf = memoryview(a).cast("B")
+            f.write(buf)
+            h.update(buf)
+            arrays[name] = {"dtype": a.dtype.str, "shape": list(a.shape), "offset": pos - start}
+            pos += a.nbytes
+        f.flush()
+        os.fsync(f.fileno())
+        rec = {"key": key, "offset": start, "nbytes": pos - start, "sha256": h.hexdigest(),
+               "arrays": arrays}
+        # 데이터가 디스크에 기록된 뒤에만 index 추가
+        self._idx.write(json.dumps(rec) + "\n")
+        self._idx.flush()
+        os.fsync(self._idx.fileno())
+        if self._index is not None:
+            self._index[key] = rec
+        return rec
+
+    def close(self):
+        for f in (self._bin, self._idx):
+            if f is not None:
+                f.close()
+        self._bin = self._idx = None
+
+    # --- read side ---
+    def index(self) -> dict:
+        """key -> latest record (resume 로 다시 계산된 point 는 마지막 기록이 유효)"""
+        if self._index is None:
+            self._index = {}
+            if os.path.exists(self.idx_path):
+                with open(self.idx_path) as f:
+                    for line in f:
+                        try:
+                            rec = json.loads(line)
+                        except ValueError:
+                            continue
+                        self._index[rec["key"]] = rec
+        return self._index
+
+    def keys(self) -> list[str]:
+        return list(self.index())
+
+    def load(self, key: str, mmap: bool = True) -> dict:
+        """Arrays of one grid point (np.memmap views unless mmap=False)"""
+        rec = self.index()[key]
+        out = {}
+        for name, meta in rec["arrays"].items():
+            dtype = np.dtype(meta["dtype"])
+            shape = tuple(meta["shape"])
+            off = rec["offset"] + meta["offset"]
+            if mmap and int(np.prod(shape)) > 0:
+                out[name] = np.memmap(self.bin_path, dtype=dtype, mode="r", offset=off, shape=shape)
+            else:
+                with open(self.bin_path, "rb") as f:
+                    f.seek(off)
+                    out[name] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+        return out
+
+    def verify(self, key: str) -> bool:
+        import hashlib
+        rec = self.index()[key]
+        h = hashlib.sha256()
+        with open(self.bin_path, "rb") as f:
+            for name in sorted(rec["arrays"]):
+                meta = rec["arrays"][name]
+                f.seek(rec["offset"] + meta["offset"])
+                h.update(f.read(int(np.prod(meta["shape"])) * np.dtype(meta["dtype"]).itemsize))
+        return h.hexdigest() == rec["sha256"]
+
+
+def _le(a) -> np.ndarray:
+    a = np.ascontiguousarray(a)
+    if a.dtype.byteorder == ">":
+        a = a.astype(a.dtype.newbyteorder("<"))
+    return a
+
+
+def _pad(f, pos: int) -> int:
+    n = -pos % _ALIGN
+    if n:
+        f.write(b"\0" * n)
+    return pos + n
@@ -0,0 +1,117 @@
+# falcon_validate/refft_module.py
+# High-precision reference FFT engines (mpmath baseline, double-double on NumPy arrays)
+
+from __future__ import annotations
+import numpy as np
+from .fft_module import bit_reverse_indices, mp_fft
+from .twiddle_module import TWIDDLES
+
+REF_ENGINES = ("mpmath", "dd")
+DD_DIGITS = 32        # double-double (106-bit significand) 으로 얻을 수 있는 자릿수 상한
+
+_SPLIT = 134217729.0  # 2^27 + 1 (Dekker split)
+
+
+# --- double-double 기본 연산 (error-free transformations) ---
+def _two_sum(a, b):
+    s = a + b
+    bb = s - a
+    return s, (a - (s - bb)) + (b - bb)
+
+
+def _quick_two_sum(a, b):
+    s = a + b
+    return s, b - (s - a)
+
+
+def _split(a):
+    t = _SPLIT * a
+    hi = t - (t - a)
+    return hi, a - hi
+
+
+def _two_prod(a, b):
+    p = a * b
+    ah, al = _split(a)
+    bh, bl = _split(b)
+    return p, ((ah * bh - p) + ah * bl + al * bh) + al * bl
+
+
+def dd_add(ah, al, bh, bl):
+    s, e = _two_sum(ah, bh)
+    t, f = _two_sum(al, bl)
+    s, e = _quick_two_sum(s, e + t)
+    return _quick_two_sum(s, e + f)
+
+
+def dd_sub(ah, al, bh, bl):
+    return dd_add(ah, al, -bh, -bl)
+
+
+def dd_mul(ah, al, bh, bl):
+    p, e = _two_prod(ah, bh)
+    return _quick_two_sum(p, e + (ah * bl + al * bh))
+
+
+def dd_fft(x, dps: int = 40):
+    """Radix-2 DIT FFT in double-double (~32 digits; twiddles from mpmath at dps);
+    returns (re_hi, re_lo, im_hi, im_lo)"""
+    x = np.asarray(x, dtype=np.complex128)
+    n = len(x)
+    br = bit_reverse_indices(n)
+    rh = x.real[br].copy(); rl = np.zeros(n)
+    ih = x.imag[br].copy(); il = np.zeros(n)
+    # mp_fft 의 (u±t)/2 후 2^stages 복원은 2진수에서 exact 이므로 생략
+    step = 1
+    for wrh, wrl, wih, wil in TWIDDLES.dd(n, dps):
+        M = step << 1
+        a = [v.reshape(-1, 2, step) for v in (rh, rl, ih, il)]
+        urh, url, uih, uil = (v[:, 0] for v in a)
+        vrh, vrl, vih, vil = (v[:, 1] for v in a)
+        # t = w * v
+        p1 = dd_mul(wrh, wrl, vrh, vrl); p2 = dd_mul(wih, wil, vih, vil)
+        p3 = dd_mul(wrh, wrl, vih, vil); p4 = dd_mul(wih, wil, vrh, vrl)
+        trh, trl = dd_sub(*p1, *p2)
+        tih, til = dd_add(*p3, *p4)
+        top = (dd_add(urh, url, trh, trl), dd_add(uih, uil, tih, til))
+        bot = (dd_sub(urh, url, trh, trl), dd_sub(uih, uil, tih, til))
+        rh = np.stack([top[0][0], bot[0][0]], axis=1).reshape(n)
+        rl = np.stack([top[0][1], bot[0][1]], axis=1).reshape(n)
+        ih = np.stack([top[1][0], bot[1][0]], axis=1).reshape(n)
+        il = np.stack([top[1][1], bot[1][1]], axis=1).reshape(n)
+        step = M
+    return rh, rl, ih, il
+
+
+def ref_fft(x, dps: int = 60, engine: str = "mpmath") -> np.ndarray:
+    """Reference FFT as complex128 (same scale as mp_fft)"""
+    if engine == "mpmath":
+        return np.asarray([complex(v) for v in mp_fft(x, dps)], dtype=np.complex128)
+    if engine == "dd":
+        rh, rl, ih, il = dd_fft(x, dps)
+        out = np.empty(len(rh), dtype=np.complex128)
+        out.real = rh + rl
+        out.imag = ih + il
+        return out
+    raise ValueError(f"Unsupported ref_engine: {engine}")
+
+
+def ref_self_check(x, dps: int = 60, digits: int = 28) -> float:
+    """Compare dd_fft against mp_fft; returns matching digits, raises if below `digits`
+    (ValueError if `digits` is beyond double-double (DD_DIGITS) or the mpmath reference (dps))"""
+    import mpmath as mp
+    if digits > min(DD_DIGITS, dps):
+        raise ValueError(f"ref self-check: {digits} digits requested, but dd gives at most {DD_DIGITS} "
+                         f"and the mpmath reference runs at mp_dps={dps}")
+    ref = mp_fft(x, dps)
+    rh, rl, ih, il = dd_fft(x, dps)
+    err = mp.mpf(0)
+    mag = mp.mpf(0)
+    for k, r in enumerate(ref):
+        d = mp.mpc(mp.mpf(rh[k]) + mp.mpf(rl[k]), mp.mpf(ih[k]) + mp.mpf(il[k]))
+        err = max(err, abs(d - r))
+        mag = max(mag, abs(r))
+    got = float(-mp.log10(err / mag)) if err > 0 else float(dps)
+    if got < digits:
+        raise RuntimeError(f"ref self-check failed: dd vs mpmath agree to {got:.1f} digits (< {digits})")
+    return got
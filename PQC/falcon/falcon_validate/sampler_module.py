@@ -2,11 +2,13 @@
 # Falcon-style discrete Gaussian samplers
 
 # --- ADD/UPDATE: imports ---
+from __future__ import annotations
 import numpy as np
 import math
 from time import perf_counter_ns
 from .qformat_module import QCtx
 from .gaussian_module import box_muller_qx
+from .ctsampler_module import ct_cdt_table, ct_cdt_table_q, ct_cdt_sample
 # ---------------------------
 
 # --- ADD: Alias Table utilities ---
@@ -152,8 +154,12 @@ def sample_discrete_expcut_qx(sigma, k_max, rng, q: QCtx, cut_mult=2.5):
 # -----------------------------------------
 
 # --- UPDATE: sample_discrete_variants(...) ---
-def sample_discrete_variants(pmf_mp, sigma, k_max, n, variant, seed=0):
+def sample_discrete_variants(pmf_mp, sigma, k_max, n, variant, seed=0, batch=True, stats=None,
+                             tables=None):
     rng = np.random.default_rng(seed)
+    if batch:
+        return (sample_batch(variant, n, pmf_mp, sigma, k_max, rng, stats=stats, tables=tables)
+                - k_max).astype(np.int32)
     idxs = []
     pmf_f = [float(p) for p in pmf_mp]
     if variant == "alias":
@@ -178,17 +184,22 @@ def sample_discrete_variants(pmf_mp, sigma, k_max, n, variant, seed=0):
     return np.array(vals, dtype=np.int32)
 
 # --- UPDATE: sample_discrete_variants_qx(...) ---
-def sample_discrete_variants_qx(pmf_mp, sigma, k_max, n, variant, q: QCtx, seed=0):
+def sample_discrete_variants_qx(pmf_mp, sigma, k_max, n, variant, q: QCtx, seed=0, batch=True,
+                                stats=None, tables=None):
     rng = np.random.default_rng(seed)
+    if batch:
+        return (sample_batch(variant, n, pmf_mp, sigma, k_max, rng, q, stats=stats, tables=tables)
+                - k_max).astype(np.int32)
     pmf_f = np.array([float(p) for p in pmf_mp], dtype=np.float64)
     cdf = np.cumsum(pmf_f)
+    cdf_q = q.from_f_np(cdf)                       # batch 경로와 같은 fixed-point CDF
     idxs = []
     if variant == "alias":
         prob, alias = build_alias_table(pmf_f)
     for _ in range(n):
         if variant == "cdt":
-            u = float(rng.random()); uq = q.to_f(q.from_f(u))
-            idx = int(np.searchsorted(cdf, uq, side="right"))
+            u = float(rng.random())
+            idx = int(np.searchsorted(cdf_q, q.from_f(u), side="right"))
         elif variant == "knuth_yao":
             u = float(rng.random()); uq = q.to_f(q.from_f(u))
             idx = int(np.searchsorted(cdf, uq, side="right"))
@@ -206,3 +217,213 @@ def sample_discrete_variants_qx(pmf_mp, sigma, k_max, n, variant, q: QCtx, seed=
     vals = [i - k_max for i in idxs]
     return np.array(vals, dtype=np.int32)
 # ----------------------------------------------
+
+# --- ADD: Knuth–Yao DDG-tree sampler (column-packed probability bit matrix) ---
+class KnuthYaoDDG:
+    """Knuth–Yao DDG walk over the binary expansions of the PMF (precision bits per row)"""
+    def __init__(self, pmf, precision: int = 64):
+        import mpmath as mp
+        self.precision = precision
+        self.n = len(pmf)
+        scale = mp.mpf(2) ** precision
+        P = [int(mp.floor(mp.mpf(p) * scale)) for p in pmf]
+        if sum(P) == 0:
+            raise ValueError(f"Knuth-Yao table is empty at {precision} bits")
+        # M[i, j] = bit j (MSB first, weight 2^-(j+1)) of row i
+        M = np.array([[(v >> (precision - 1 - j)) & 1 for j in range(precision)] for v in P],
+                     dtype=np.uint8)
+        self.packed = np.packbits(M.T, axis=1)          # (precision, ceil(n/8)) column-packed
+        self._index()
+        self.reset_stats()
+
+    @classmethod
+    def from_packed(cls, packed: np.ndarray, n: int):
+        """Rebuild from a stored column-packed matrix (e.g. SamplerTables cache)"""
+        obj = cls.__new__(cls)
+        obj.precision = packed.shape[0]
+        obj.n = n
+        obj.packed = packed
+        obj._index()
+        obj.reset_stats()
+        return obj
+
+    def _index(self):
+        M = np.unpackbits(self.packed, axis=1, count=self.n).T      # (n, precision)
+        self.col_weight = M.sum(axis=0).astype(np.int64)
+        # rows_by_col[j, r]: r 번째 set bit 의 row (아래 row 부터 스캔 — DDG 방문 순서)
+        wmax = max(1, int(self.col_weight.max()))
+        self.rows_by_col = np.full((self.precision, wmax), -1, dtype=np.int32)
+        for j in range(self.precision):
+            rows = np.nonzero(M[::-1, j])[0]
+            self.rows_by_col[j, :len(rows)] = self.n - 1 - rows
+
+    def reset_stats(self):
+        self.bits_consumed = 0
+        self.samples = 0
+        self.restarts = 0
+
+    @property
+    def table_bytes(self) -> int:
+        return int(self.packed.nbytes)
+
+    @property
+    def avg_bits_per_sample(self) -> float:
+        return self.bits_consumed / self.samples if self.samples else 0.0
+
+    def stats(self) -> dict:
+        return {"ky_bits_per_sample": self.avg_bits_per_sample,
+                "ky_table_bytes": self.table_bytes,
+                "ky_restarts": self.restarts}
+
+    def sample(self, n: int, rng, max_restarts: int = 64) -> np.ndarray:
+        """n row indices; random bits drawn in 64-bit words, consumed one per tree level"""
+        out = np.empty(n, dtype=np.int64)
+        active = np.arange(n)
+        for _ in range(max_restarts):
+            d = np.zeros(len(active), dtype=np.int64)
+            words = None
+            for j in range(self.precision):
+                if len(active) == 0:
+                    break
+                if j % 64 == 0:
+                    words = rng.integers(0, 1 << 64, size=len(active), dtype=np.uint64)
+                bit = ((words >> np.uint64(63 - j % 64)) & np.uint64(1)).astype(np.int64)
+                d = 2 * d + bit
+                self.bits_consumed += len(active)
+                hit = d < self.col_weight[j]
+                out[active[hit]] = self.rows_by_col[j, d[hit]]
+                keep = ~hit
+                d = d[keep] - self.col_weight[j]
+                active = active[keep]
+                words = words[keep]
+            if len(active) == 0:
+                break
+            self.restarts += len(active)     # 잘린 tail (확률 < n·2^-precision) → 재시작
+        out[active] = self.n // 2            # fallback = 중심 (다른 sampler 와 동일)
+        self.samples += n
+        return out
+# ------------------------------------------------------------------------------
+
+# --- ADD: batched (vectorized) samplers: tables once per batch, whole-array draws ---
+SAMPLER_VARIANTS = ("cdt", "cdt_ct", "knuth_yao", "rejection", "ziggurat", "alias", "expcut")
+
+
+def _rint(x):
+    # Python round() 과 동일한 half-even
+    return np.rint(x).astype(np.int64)
+
+
+def _batch_cdt(cdf, n, rng, q: QCtx | None = None, cdf_q=None):
+    """FP64: float CDF; Qx: Q-format u against the fixed-point CDF (int64 | Q128 object ints)"""
+    u = rng.random(n)
+    if q is None:
+        return np.searchsorted(cdf, u, side="right")
+    if cdf_q is None:
+        cdf_q = q.from_f_np(cdf)
+    return np.searchsorted(cdf_q, q.from_f_np(u), side="right")
+
+
+def _batch_alias(prob, alias, n, rng):
+    i = rng.integers(0, len(prob), size=n)
+    u = rng.random(n)
+    return np.where(u < prob[i], i, alias[i])
+
+
+def _batch_ziggurat(sigma, k_max, n, rng, q: QCtx | None = None):
+    z = rng.standard_normal(n)
+    if q is not None:
+        z = q.to_f_np(q.from_f_np(z))
+    return np.clip(_rint(z * sigma), -k_max, k_max) + k_max
+
+
+def _batch_rejection(sigma, k_max, n, rng, max_rounds=10000):
+    out = np.full(n, k_max, dtype=np.int64)      # 실패 시 fallback = 0 (scalar 와 동일)
+    active = np.arange(n)
+    for _ in range(max_rounds):
+        m = len(active)
+        if m == 0:
+            break
+        x = rng.normal(0.0, sigma, m)
+        k = _rint(x)
+        acc = np.exp(-(k * k - x * x) / (2 * sigma * sigma))
+        ok = (np.abs(k) <= k_max) & (rng.random(m) <= acc)
+        out[active[ok]] = k[ok] + k_max
+        active = active[~ok]
+    return out
+
+
+def _batch_expcut(sigma, k_max, n, rng, cut_mult=2.5, max_rounds=10000):
+    t = int(math.ceil(cut_mult * sigma))
+    lam = 1.0 / sigma
+    out = np.full(n, k_max, dtype=np.int64)
+    active = np.arange(n)
+    for _ in range(max_rounds):
+        m = len(active)
+        if m == 0:
+            break
+        center = rng.random(m) < 0.8
+        k = np.zeros(m, dtype=np.int64)
+        ok = np.zeros(m, dtype=bool)
+        # 중심: 가우시안 근사
+        nc = int(center.sum())
+        kc = _rint(rng.normal(0.0, sigma, nc))
+        k[center] = kc
+        ok[center] = (np.abs(kc) <= t) & (np.abs(kc) <= k_max)
+        # 꼬리: exp 제안 + 수락확률 (target/proposal)
+        tail = ~center
+        kt = t + np.floor(rng.exponential(1.0 / lam, m - nc)).astype(np.int64)
+        ratio = np.exp(-(kt * kt - t * t) / (2 * sigma * sigma)) * lam
+        okt = (kt <= k_max) & (rng.random(m - nc) < np.minimum(1.0, ratio))
+        sign = rng.integers(0, 2, m - nc)
+        k[tail] = np.where(sign == 0, kt, -kt)
+        ok[tail] = okt
+        out[active[ok]] = k[ok] + k_max
+        active = active[~ok]
+    return out
+
+
+def sample_batch(variant, n, pmf, sigma, k_max, rng, q: QCtx | None = None, stats=None,
+                 ky_precision=64, tables=None):
+    """Draw n table indices (value + k_max) with array ops; q != None -> Qx variant.
+    tables: prebuilt SamplerTables (table_module) — skips per-call table construction."""
+    if tables is not None:
+        pmf_f, cdf = tables.pmf_f, tables.cdf_f
+    else:
+        pmf_f = np.array([float(p) for p in pmf], dtype=np.float64)
+        cdf = np.cumsum(pmf_f)
+    if variant == "cdt":
+        return _batch_cdt(cdf, n, rng, q, tables.cdf_q if tables is not None and q is not None else None)
+    if variant == "cdt_ct":
+        # FP64: 72-bit fixed-point CDT; Qx: QCtx fraction (F bits) CDT — full-table branch-free scan
+        if q is None:
+            table = tables.ct_cdt if tables is not None else ct_cdt_table(pmf)
+        else:
+            table = tables.ct_cdt_q if tables is not None else ct_cdt_table_q(pmf, q)
+        return ct_cdt_sample(table, n, rng)
+    if variant == "knuth_yao":
+        # Qx: 확률 bit matrix 를 Q-format fraction 폭 (F bits) 으로 보관
+        if tables is not None:
+            ddg = tables.ky_q if q is not None else tables.ky
+            if ddg is None:
+                raise ValueError(f"Knuth-Yao table is empty at {q.F} bits")
+            ddg.reset_stats()
+        else:
+            ddg = KnuthYaoDDG(pmf, q.F if q is not None else ky_precision)
+        out = ddg.sample(n, rng)
+        if stats is not None:
+            stats.update(ddg.stats())
+        return out
+    if variant == "rejection":
+        return _batch_rejection(sigma, k_max, n, rng)
+    if variant == "ziggurat":
+        return _batch_ziggurat(sigma, k_max, n, rng, q)
+    if variant == "alias":
+        if tables is not None:
+            prob, alias = tables.alias_prob, tables.alias_idx
+        else:
+            prob, alias = build_alias_table(pmf_f)
+        return _batch_alias(prob, alias, n, rng)
+    if variant == "expcut":
+        return _batch_expcut(sigma, k_max, n, rng)
+    raise ValueError(f"Unsupported sampler: {variant}")
+# ----------------------------------------------------------------------------------
@@ -0,0 +1,130 @@
+# falcon_validate/samplerz_module.py
+# Batched Falcon SamplerZ(mu, sigma'): base half-Gaussian draws (sigma_max) from the existing
+# CDT / CT-CDT / alias / Knuth–Yao tables + Bernoulli-exp rejection, on whole arrays of centers
+# and sigmas per accept/reject round (BerExp: Falcon 63-bit fixed-point ApproxExp or FP64 exp)
+
+from __future__ import annotations
+import math
+import numpy as np
+from .qformat_module import _umul128
+from .sampler_module import sample_batch
+from .table_module import SamplerTables
+
+SIGMA_MAX = 1.8205                      # base sampler 폭 = leaf sigma 상한
+SIGMA_TOL = 1e-6                        # sigma > SIGMA_MAX * (1 + tol) 는 거부 (Q-format leaf rounding 허용폭)
+SIGMA_MIN = {512: 1.277833697, 1024: 1.298280334}
+BASE_KMAX = 18                          # Falcon RCDT 범위 z0 in [0, 18]
+BASE_VARIANTS = ("cdt", "cdt_ct", "alias", "knuth_yao")
+EXP_MODES = ("falcon", "fp64")
+
+_LN2 = math.log(2)
+_INV_2SMAX2 = 1.0 / (2 * SIGMA_MAX * SIGMA_MAX)
+# ApproxExp: exp(-x) on [0, ln 2) as a degree-12 polynomial, coefficients scaled by 2^63
+_EXP_C = [0x00000004741183A3, 0x00000036548CFC06, 0x0000024FDCBF140A, 0x0000171D939DE045,
+          0x0000D00CF58F6F84, 0x000680681CF796E3, 0x002D82D8305B0FEA, 0x011111110E066FD0,
+          0x0555555555070F00, 0x155555555581FF00, 0x400000000002B400, 0x7FFFFFFFFFFF4800,
+          0x8000000000000000]
+_P63 = 2.0 ** 63
+_BASE = {}
+
+
+def base_tables(mp_dps: int = 40) -> SamplerTables:
+    """Half-Gaussian P(z0 = k) ∝ exp(-k^2 / 2 sigma_max^2), k = 0..BASE_KMAX (index = z0)"""
+    if mp_dps not in _BASE:
+        import mpmath as mp
+        from .gaussian_module import discrete_gaussian_pmf_mp
+        pmf = discrete_gaussian_pmf_mp(BASE_KMAX, SIGMA_MAX, mp_dps)[BASE_KMAX:]
+        mp.mp.dps = mp_dps
+        Z = mp.fsum(pmf)
+        _BASE[mp_dps] = SamplerTables.build(SIGMA_MAX, BASE_KMAX, mp_dps, 2, [p / Z for p in pmf])
+    return _BASE[mp_dps]
+
+
+def _mulhi63(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    hi, lo = _umul128(a, b)
+    return (hi << np.uint64(1)) | (lo >> np.uint64(63))
+
+
+def approx_exp_np(x: np.ndarray, ccs: np.ndarray) -> np.ndarray:
+    """floor(2^63 * ccs * exp(-x)) for x in [0, ln 2), ccs in [0, 1] (uint64)"""
+    z = np.floor(np.asarray(x) * _P63).astype(np.uint64)
+    y = np.full(z.shape, _EXP_C[0], dtype=np.uint64)
+    for c in _EXP_C[1:]:
+        y = np.uint64(c) - _mulhi63(z, y)
+    return _mulhi63(np.floor(np.asarray(ccs) * _P63).astype(np.uint64), y)
+
+
+def ber_exp_np(x: np.ndarray, ccs: np.ndarray, rng, mode: str = "falcon") -> np.ndarray:
+    """Bernoulli(ccs * exp(-x)) per element, x >= 0 (x < 0 from sigma within SIGMA_TOL clamped to 0)"""
+    x = np.maximum(x, 0.0)                      # 음수 x → uint64 shift wrap 방지
+    if mode == "fp64":
+        return rng.random(x.shape) < ccs * np.exp(-x)
+    if mode != "falcon":
+        raise ValueError(f"Unsupported BerExp mode: {mode}")
+    s = np.floor(x / _LN2)
+    r = x - s * _LN2
+    s = np.minimum(s, 63).astype(np.uint64)
+    z = ((approx_exp_np(r, ccs) << np.uint64(1)) - np.uint64(1)) >> s
+    # Falcon 은 byte 단위 lazy 비교 — 64-bit uniform 과의 u < z 와 동일
+    u = rng.integers(0, np.iinfo(np.uint64).max, size=x.shape, dtype=np.uint64, endpoint=True)
+    return u < z
+
+
+def sampler_z(mu, sigma, rng, base: str = "cdt", sigma_min: float = SIGMA_MIN[512], exp: str = "falcon",
+              stats: dict | None = None, mp_dps: int = 40, max_rounds: int = 10000) -> np.ndarray:
+    """Integers ~ D_{Z, mu, sigma} per element (sigma <= SIGMA_MAX, else ValueError); one accept/reject
+    round over all still-active elements at a time. stats += rounds / proposals / accepted"""
+    mu = np.asarray(mu, dtype=np.float64)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=np.float64), mu.shape)
+    check_sigma(sigma)
+    tables = base_tables(mp_dps)
+    s = np.floor(mu).ravel()
+    r = mu.ravel() - s
+    dss = 1.0 / (2 * sigma.ravel() ** 2)
+    # ccs = sigma_min / sigma: sigma 와 무관한 수락률 (sigma < sigma_min 이면 1 로 제한 — 분포는 그대로)
+    ccs = np.minimum(sigma_min / sigma.ravel(), 1.0)
+    out = np.empty(mu.size, dtype=np.int64)
+    active = np.arange(mu.size)
+    rounds = proposals = 0
+    for _ in range(max_rounds):
+        m = len(active)
+        if m == 0:
+            break
+        rounds += 1
+        proposals += m
+        z0 = sample_batch(base, m, None, SIGMA_MAX, BASE_KMAX, rng, tables=tables)
+        b = rng.integers(0, 2, size=m)
+        z = b + (2 * b - 1) * z0
+        x = (z - r[active]) ** 2 * dss[active] - z0 * z0 * _INV_2SMAX2
+        ok = ber_exp_np(x, ccs[active], rng, exp)
+        out[active[ok]] = z[ok] + s[active[ok]].astype(np.int64)
+        active = active[~ok]
+    if len(active):
+        raise RuntimeError(f"SamplerZ: {len(active)} element(s) not accepted in {max_rounds} rounds")
+    if stats is not None:
+        for k, v in (("rounds", rounds), ("proposals", proposals), ("accepted", mu.size)):
+            stats[k] = stats.get(k, 0) + v
+    return out.reshape(mu.shape)
+
+
+def check_sigma(sigma):
+    """ValueError if any sigma exceeds SIGMA_MAX (beyond SIGMA_TOL): the base sampler would not cover
+    it and the rejection step would bias the output"""
+    smax = float(np.max(sigma)) if np.size(sigma) else 0.0
+    if not smax <= SIGMA_MAX * (1 + SIGMA_TOL):
+        raise ValueError(f"SamplerZ: sigma {smax:.9g} exceeds SIGMA_MAX = {SIGMA_MAX}")
+
+
+def samplerz_leaf(base: str = "cdt", sigma_min: float = SIGMA_MIN[512], exp: str = "falcon",
+                  stats: dict | None = None):
+    """ffSampling leaf sampler (mu, sigma, rng) -> int array backed by sampler_z"""
+    def leaf(mu, sigma, rng):
+        return sampler_z(mu, sigma, rng, base, sigma_min, exp, stats)
+    return leaf
+
+
+def dgauss_pmf(mu: float, sigma: float, lo: int, hi: int) -> np.ndarray:
+    """Exact-enough D_{Z, mu, sigma} on [lo, hi] (FP64, normalized over the window)"""
+    k = np.arange(lo, hi + 1)
+    w = np.exp(-(k - mu) ** 2 / (2 * sigma * sigma))
+    return w / w.sum()
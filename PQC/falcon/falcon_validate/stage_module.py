@@ -0,0 +1,82 @@
+# falcon_validate/stage_module.py
+# Dependency-aware stage graph: caches intermediate results of compare_single
+# by the subset of grid parameters each stage actually depends on
+
+from __future__ import annotations
+from collections import OrderedDict
+
+
+class StageGraph:
+    """Named stages with declared params/deps; results memoized per param key."""
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._stages = {}        # name -> (func, own params, deps)
+        self._keys = {}          # name -> sorted effective params (own + deps, transitive)
+        self._cache = {}         # name -> OrderedDict(key -> value)
+        self.hits = {}
+        self.misses = {}
+
+    def stage(self, name: str, params=(), deps=()):
+        """Decorator: func(**{p: value for p in params}, **{d: result of d for d in deps})"""
+        def deco(func):
+            eff = set(params)
+            for d in deps:
+                if d not in self._stages:
+                    raise KeyError(f"stage '{name}' depends on unknown stage '{d}'")
+                eff |= set(self._keys[d])
+            self._stages[name] = (func, tuple(params), tuple(deps))
+            self._keys[name] = tuple(sorted(eff))
+            self._cache[name] = OrderedDict()
+            self.hits[name] = 0
+            self.misses[name] = 0
+            return func
+        return deco
+
+    def get(self, name: str, **params):
+        func, own, deps = self._stages[name]
+        key = tuple(params[p] for p in self._keys[name])
+        cache = self._cache[name]
+        if key in cache:
+            cache.move_to_end(key)
+            self.hits[name] += 1
+            return cache[key]
+        kwargs = {p: params[p] for p in own}
+        for d in deps:
+            kwargs[d] = self.get(d, **params)
+        val = func(**kwargs)
+        self.misses[name] += 1
+        cache[key] = val
+        if len(cache) > self.maxsize:
+            cache.popitem(last=False)
+        return val
+
+    def clear(self):
+        for c in self._cache.values():
+            c.clear()
+
+    def reset_stats(self):
+        for name in self.hits:
+            self.hits[name] = 0
+            self.misses[name] = 0
+
+    def stats(self) -> dict:
+        return {name: {"hits": self.hits[name], "misses": self.misses[name]} for name in self._stages}
+
+
+def merge_stats(total: dict, part: dict) -> dict:
+    for name, st in part.items():
+        t = total.setdefault(name, {"hits": 0, "misses": 0})
+        t["hits"] += st["hits"]
+        t["misses"] += st["misses"]
+    return total
+
+
+def format_stats(stats: dict) -> str:
+    lines = [f"  {'stage':<12s} {'hits':>7s} {'misses':>7s}"]
+    for name, st in stats.items():
+        lines.append(f"  {name:<12s} {st['hits']:>7d} {st['misses']:>7d}")
+    return "\n".join(lines)
+
+
+# 프로세스 공용 graph (stage 등록은 main.py)
+STAGES = StageGraph()
@@ -4,20 +4,22 @@
 from __future__ import annotations
 import os
 import csv
+import json
 import time
 import numpy as np
-import matplotlib
-matplotlib.use("Agg")  # ✅ headless backend (no Qt)
-import matplotlib.pyplot as plt
 from .metrics_module import compute_fft_errors, compute_hist_errors, compute_continuous_errors
+from .stage_module import STAGES, format_stats, merge_stats
+from .qformat_module import qstats_fields
+from .fftkernel_module import opcount_fields
+from .rawstore_module import RawStore
+from .trace_module import TRACE, span, format_trace
 # (추가) 해시 계산 유틸
-import hashlib
-import io
+from .hash_module import payload_sha256
 
 # === ADD: complex 벡터를 CSV 문자열로 인코딩 ===
 def encode_complex_vector_to_csv_fields(x: np.ndarray):
-    xr = np.asarray(x).real.tolist()
-    xi = np.asarray(x).imag.tolist()
+    xr = np.asarray(x).real.ravel().tolist()
+    xi = np.asarray(x).imag.ravel().tolist()
     re_s = ";".join(f"{v:.17g}" for v in xr)
     im_s = ";".join(f"{v:.17g}" for v in xi)
     return re_s, im_s
@@ -26,31 +28,39 @@ def encode_complex_vector_to_csv_fields(x: np.ndarray):
 def timestamp():
     return time.strftime("%Y%m%d_%H%M%S")
 
-# (추가) RAW payload를 메모리에서 직렬화해 SHA256 계산 (파일 저장 없음)
-def raw_sha256_from_payload(payload: dict) -> str:
-    buf = io.BytesIO()
-    # 키 순서를 고정해 캐논컬 직렬화
-    ordered = {k: np.asarray(payload[k]) for k in sorted(payload.keys())}
-    np.savez_compressed(buf, **ordered)
-    data = buf.getvalue()
-    return hashlib.sha256(data).hexdigest()
+# (추가) RAW payload SHA256 (파일 저장 없음) — hash_module 의 canonical streaming hash
+# mode="legacy" 는 예전 savez_compressed 기반 값을 재현
+def raw_sha256_from_payload(payload: dict, mode: str = "sha256") -> str:
+    return payload_sha256(payload, mode)
 
 # (교체) 메인 결과 CSV — RAW 관련 컬럼 제거
+# --- UPDATE: write_results_csv fieldnames ---
+RESULT_FIELDS = [
+    "I","word_bits","N","sigma","mp_dps","sampler",
+    "fft64_mse","fft64_relL2","fftq_mse","fftq_relL2",
+    "disc_pmf_l2_fp64","disc_hist_mse_fp64","disc_hist_mse_qx","disc_hist_ks_qx",  # KS 추가
+    "cont64_mse","contqx_mse",
+    "sampler_ns_per_sample_fp64","sampler_ns_per_sample_qx",                         # 성능 추가
+    "ky_bits_per_sample","ky_table_bytes","ky_restarts",                             # knuth_yao 전용
+]
+RAWMETA_FIELDS = ["I","N","sigma","mp_dps","sampler","timestamp","raw_sha256",
+                  "raw_input_re","raw_input_im"]
+RAWSTORE_FIELDS = ["raw_file","raw_offset","raw_nbytes","raw_record_sha256"]    # --raw_archive
+# -------------------------------------------------------------------
+
+
+def result_fieldnames(results) -> list[str]:
+    # --qstats / 기본이 아닌 --fft_kernel, --fft_scaling / --fft_opcount 컬럼은 결과에 있을 때만 추가
+    qcols = (qstats_fields("fftq_") + qstats_fields("bmqx_", stages=False)
+             + ["fft_kernel", "fft_scaling"] + opcount_fields("fftq_"))
+    return RESULT_FIELDS + [c for c in qcols if any(c in r for r in results)]
+
+
 def write_results_csv(results, prefix="falcon_sweep", ts=None):
     ts = ts or timestamp()
     fname = f"{prefix}_{ts}.csv"
     with open(fname, "w", newline="") as f:
-        # --- UPDATE: write_results_csv fieldnames ---
-        fieldnames = [
-            "I","N","sigma","mp_dps","sampler",
-            "fft64_mse","fft64_relL2","fftq_mse","fftq_relL2",
-            "disc_pmf_l2_fp64","disc_hist_mse_fp64","disc_hist_mse_qx","disc_hist_ks_qx",  # KS 추가
-            "cont64_mse","contqx_mse",
-            "sampler_ns_per_sample_fp64","sampler_ns_per_sample_qx"                          # 성능 추가
-        ]
-        # -------------------------------------------------------------------
-
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=result_fieldnames(results), restval="")
         writer.writeheader()
         writer.writerows(results)
     return fname
@@ -61,9 +71,7 @@ def write_rawmeta_csv(rows, prefix="falcon_rawmeta", ts=None):
     ts = ts or timestamp()
     fname = f"{prefix}_{ts}.csv"
     with open(fname, "w", newline="") as f:
-        fieldnames = ["I","N","sigma","mp_dps","sampler","timestamp","raw_sha256",
-                      "raw_input_re","raw_input_im"]  # ← ✅ 추가
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=RAWMETA_FIELDS)
         writer.writeheader()
         writer.writerows(rows)
     return fname
@@ -85,9 +93,15 @@ def write_csv(results, prefix="falcon_sweep"):
         writer.writerows(results)
     return fname
 
-def plot_from_csv(csv_file):
-    import numpy as np
+def _pyplot():
+    # matplotlib 은 plot 경로에서만 로드 (CLI 시작 시간 / --no-plots)
+    import matplotlib
+    matplotlib.use("Agg")  # ✅ headless backend (no Qt)
     import matplotlib.pyplot as plt
+    return plt
+
+def plot_from_csv(csv_file):
+    plt = _pyplot()
 
     data = np.genfromtxt(csv_file, delimiter=",", names=True, dtype=None, encoding=None)
 
@@ -97,13 +111,14 @@ def plot_from_csv(csv_file):
     plt.ylabel("Relative L2 error")
     plt.title("FFT relative L2 vs N")
 
-    # 1) Qx를 I별로 분리해 QI.F 라벨 부여 (예: Q12.52)
+    # 1) Qx를 I별로 분리해 QI.F 라벨 부여 (예: Q12.52, F = word_bits - I)
+    W = int(data["word_bits"][0]) if "word_bits" in data.dtype.names else 64
     unique_I = np.unique(data["I"])
     for I in unique_I:
         m = (data["I"] == I)
         if not np.any(m):
             continue
-        F = 64 - int(I)
+        F = W - int(I)
         label_q = f"FFT Q{int(I)}.{F} relL2"
         plt.scatter(data["N"][m], data["fftq_relL2"][m], label=label_q)
 
@@ -119,6 +134,7 @@ def plot_from_csv(csv_file):
 
 # --- ADD: additional plots ---
 def plot_perf_from_csv(csv_file):
+    plt = _pyplot()
     data = np.genfromtxt(csv_file, delimiter=",", names=True, dtype=None, encoding=None)
     plt.figure()
     for name in np.unique(data["sampler"]):
@@ -131,6 +147,7 @@ def plot_perf_from_csv(csv_file):
     plt.savefig(png, dpi=150); return png
 
 def plot_ks_from_csv(csv_file):
+    plt = _pyplot()
     data = np.genfromtxt(csv_file, delimiter=",", names=True, dtype=None, encoding=None)
     plt.figure()
     for name in np.unique(data["sampler"]):
@@ -143,6 +160,7 @@ def plot_ks_from_csv(csv_file):
     plt.savefig(png, dpi=150); return png
 
 def plot_mse_from_csv(csv_file):
+    plt = _pyplot()
     data = np.genfromtxt(csv_file, delimiter=",", names=True, dtype=None, encoding=None)
     plt.figure()
     for name in np.unique(data["sampler"]):
@@ -155,62 +173,417 @@ def plot_mse_from_csv(csv_file):
     plt.savefig(png, dpi=150); return png
 # ---------------------------------------------
 
+# --- ADD: lattice NTT sweep (Kyber / Dilithium, ntt_module) — 같은 CSV / raw_sha256 / span 경로 ---
+NTT_RESULT_FIELDS = [
+    "q","scheme","n","layers","reduce","batch",
+    "ntt_mismatch","intt_roundtrip_mismatch","mul_mismatch","rtl_sum_overflow",
+    "ntt_ns_per_poly","intt_ns_per_poly","mul_ns_per_poly","ntt_per_sec","mul_per_sec",
+]
+
+
+def ntt_grid_points(ntt_grid):
+    """Grid points (q, reduce, batch) in canonical (CSV) order"""
+    return [(q, reduce, batch)
+            for q in ntt_grid["q_list"]
+            for reduce in ntt_grid["reduce_list"]
+            for batch in ntt_grid["batch_list"]]
+
+
+def ntt_point_label(point):
+    q, reduce, batch = point
+    return f"q={q:<8d} reduce={reduce:<10s} batch={batch:<5d}"
+
+
+def _ntt_status(res):
+    exact = not (res["ntt_mismatch"] or res["intt_roundtrip_mismatch"] or res["mul_mismatch"])
+    return exact, "✅ bit-exact" if exact else "❌ MISMATCH"
+
+
+def plot_ntt_from_csv(csv_file):
+    plt = _pyplot()
+    data = np.genfromtxt(csv_file, delimiter=",", names=True, dtype=None, encoding=None)
+    plt.figure()
+    for q in np.unique(data["q"]):
+        for name in np.unique(data["reduce"]):
+            m = (data["q"] == q) & (data["reduce"] == name)
+            plt.plot(data["batch"][m], data["ntt_ns_per_poly"][m], marker="o", linestyle="-",
+                     label=f"q={q} {name}")
+    plt.xscale("log"); plt.yscale("log")
+    plt.xlabel("polynomials per call"); plt.ylabel("ns per NTT")
+    plt.title("Lattice NTT speed vs batch")
+    plt.legend(); plt.tight_layout()
+    png = csv_file.replace(".csv", ".png")
+    plt.savefig(png, dpi=150); return png
+
+
+def ntt_sweep_and_export(ntt_grid, compute_func, prefix="lattice_ntt_sweep", jobs=1, resume=None,
+                         raw_archive=False, hash_mode=None, trace_out=None, plots=True):
+    """NTT sweep over (q, reduce, batch) through SweepWriter / run_point: results CSV,
+    lattice_ntt_rawmeta_<ts>.csv (raw_sha256 of input, NTT, product), manifest / resume / jobs"""
+    ts = resume or timestamp()
+    writer = SweepWriter(prefix, ts, ntt_grid, resume=bool(resume), raw_archive=raw_archive,
+                         hash_mode=hash_mode, config=compute_config(compute_func), fields=NTT_POINT,
+                         rawmeta_prefix="lattice_ntt_rawmeta", result_fields=lambda results: NTT_RESULT_FIELDS)
+    _, n_bad = run_sweep(ntt_grid_points(ntt_grid), compute_func, writer, jobs, raw_archive,
+                         label=ntt_point_label, status=_ntt_status)
+    csv_path = writer.csv_path
+    if not os.path.exists(csv_path):
+        with open(csv_path, "w", newline="") as f:          # 전부 실패해도 header 는 남김
+            csv.DictWriter(f, fieldnames=NTT_RESULT_FIELDS).writeheader()
+    png = plot_ntt_from_csv(csv_path) if plots else None
+    print(f"\n✅ NTT sweep completed ({n_bad} failing point(s))\n📄 Results → {csv_path}"
+          + (f"\n📊 Speed → {png}" if png else ""))
+    if TRACE.enabled:
+        print(f"\n⏱️  Spans (all workers):\n{format_trace(TRACE.stats())}")
+        if trace_out:
+            print(f"🧭 Chrome trace → {TRACE.dump_chrome(trace_out)}")
+    return csv_path, png
+# ---------------------------------------------
+
+# --- ADD: grid point 실행 (serial / process-pool 공용) ---
+def grid_points(param_grid):
+    """Grid points (I, N, sigma, mp_dps, sampler) in canonical (CSV) order"""
+    return [(I, N, sigma, mp_dps, sampler)
+            for I in param_grid["I_list"]
+            for N in param_grid["N_list"]
+            for sigma in param_grid["sigma_list"]
+            for mp_dps in param_grid["mp_dps_list"]
+            for sampler in param_grid["sampler_list"]]
+
+
+def point_label(point):
+    I, N, sigma, mp_dps, sampler = point
+    return f"I={I:2d}  N={N:<5d}  σ={sigma:<4.2f}  mp_dps={mp_dps:<3d}  sampler={sampler:<10s}"
+
+
+def run_point(compute_func, point, keep_raw=False, hash_mode="sha256"):
+    """Run one grid point -> (res, raw_sha256, raw_input_re, raw_input_im, payload | None)"""
+    with span("point"):
+        res, raw_payload = compute_func(*point, need_raw=True)
+        # 1) SHA 계산
+        with span("raw.hash"):
+            sha = raw_sha256_from_payload(raw_payload, hash_mode)
+        if keep_raw:
+            # raw archive 사용 시 payload 전체를 넘기고 CSV 벡터는 비워둠
+            return res, sha, "", "", raw_payload
+        # 2) 입력 x를 CSV에 그대로 박아 넣기
+        with span("raw.encode"):
+            raw_re, raw_im = encode_complex_vector_to_csv_fields(raw_payload["x"])
+        return res, sha, raw_re, raw_im, None
+
+
+def _run_group(compute_func, indexed_points, progress, keep_raw=False, hash_mode="sha256"):
+    """Worker: run points sharing (I, N) in one process so stage caches stay warm"""
+    STAGES.reset_stats()
+    TRACE.reset()
+    for idx, point in indexed_points:
+        try:
+            progress.put((idx, run_point(compute_func, point, keep_raw, hash_mode), None))
+        except Exception as e:
+            progress.put((idx, None, str(e)))
+    return STAGES.stats(), TRACE.export()
+
+
+def _run_parallel(compute_func, todo, jobs, emit, keep_raw=False, hash_mode="sha256"):
+    """Spread (I, N) groups (split into <= ceil(len/jobs)-point chunks) over a process pool;
+    emit(idx, outcome, err) in canonical order"""
+    import multiprocessing as mproc
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    groups = {}
+    for idx, p in todo:
+        groups.setdefault((p[0], p[1]), []).append((idx, p))
+    # (I, N) group 이 jobs 보다 적어도 worker 가 놀지 않도록 ceil(len/jobs) point 단위로 분할
+    # (같은 chunk 안에서는 stage cache 공유)
+    size = max(1, -(-len(todo) // jobs))
+    chunks = [g[i:i + size] for g in groups.values() for i in range(0, len(g), size)]
+    order = [idx for idx, _ in todo]
+    ready = {}                                   # reorder buffer: idx -> (outcome, err)
+    pos = 0
+    stats = {}
+    with mproc.Manager() as mgr, ProcessPoolExecutor(max_workers=jobs) as ex:
+        progress = mgr.Queue()
+        pending = {ex.submit(_run_group, compute_func, g, progress, keep_raw, hash_mode)
+                   for g in chunks}
+        while True:
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                st, tr = fut.result()
+                merge_stats(stats, st)
+                TRACE.merge(tr)                  # worker span 집계 + trace 이벤트
+            while not progress.empty():
+                idx, outcome, err = progress.get()
+                ready[idx] = (outcome, err)
+            # 앞선 point 가 모두 끝난 것만 순서대로 기록 (serial 과 동일한 CSV 순서)
+            while pos < len(order) and order[pos] in ready:
+                emit(order[pos], *ready.pop(order[pos]))
+                pos += 1
+            if not pending and pos == len(order):
+                break
+    return stats
+
+
+def compute_config(compute_func) -> dict:
+    """JSON form of the per-row settings bound into compute_func (functools.partial keywords)"""
+    cfg = dict(getattr(compute_func, "keywords", None) or {})
+    cfg["compute"] = getattr(getattr(compute_func, "func", compute_func), "__name__", "")
+    return json.loads(json.dumps(cfg, default=str))
+
+
+# 결과 행에 영향 없는 설정 (병렬도) 은 resume 시 바꿔도 됨
+_RESUME_FREE = ("bm_jobs",)
+
+
+def _check_resume(head: dict, param_grid: dict, config: dict):
+    """Refuse to resume when the grid / compute config differs from the manifest header"""
+    diffs = []
+    grid = json.loads(json.dumps(param_grid))
+    for k in sorted(set(grid) | set(head.get("grid") or {})):
+        if grid.get(k) != head["grid"].get(k):
+            diffs.append(f"{k}: manifest={head['grid'].get(k)!r} now={grid.get(k)!r}")
+    rec = head.get("config")
+    if rec is None:
+        diffs.append("config: not recorded in the manifest")
+    else:
+        for k in sorted(set(config) | set(rec)):
+            if k not in _RESUME_FREE and config.get(k) != rec.get(k):
+                diffs.append(f"{k}: manifest={rec.get(k)!r} now={config.get(k)!r}")
+    if diffs:
+        raise ValueError("resume settings differ from the sweep manifest (rerun with the original flags):\n  "
+                         + "\n  ".join(diffs))
+
+
+# grid point 컬럼 (이름, CSV 문자열 → 값): point_key / _compact_csv / rawmeta 행 공용
+SWEEP_POINT = (("I", int), ("N", int), ("sigma", float), ("mp_dps", int), ("sampler", str))
+NTT_POINT = (("q", int), ("reduce", str), ("batch", int))
+
+
+def point_key(point, fields=SWEEP_POINT) -> str:
+    """e.g. "8|256|1.5|33|cdt" (floats as repr, so CSV round trips give the same key)"""
+    return "|".join(repr(float(v)) if conv is float else str(conv(v)) for (_, conv), v in zip(fields, point))
+
+
+class SweepWriter:
+    """Append + flush results / rawmeta rows per grid point; manifest (jsonl) of completed keys.
+    fields: grid point columns (SWEEP_POINT | NTT_POINT); result_fields(results) -> results CSV header"""
+    def __init__(self, prefix: str, ts: str, param_grid: dict, resume: bool = False,
+                 raw_archive: bool = False, hash_mode: str | None = None, config: dict | None = None,
+                 fields=SWEEP_POINT, rawmeta_prefix: str = "falcon_rawmeta", result_fields=result_fieldnames):
+        self.ts = ts
+        self.fields = fields
+        self.result_fields = result_fields
+        self.raw_store = RawStore(f"{prefix}_{ts}") if raw_archive else None
+        self.csv_path = f"{prefix}_{ts}.csv"
+        self.rawmeta_path = f"{rawmeta_prefix}_{ts}.csv"
+        self.manifest_path = f"{prefix}_{ts}.manifest.jsonl"
+        self.done = set()
+        if resume:
+            if not os.path.exists(self.manifest_path):
+                raise FileNotFoundError(f"no sweep manifest to resume: {self.manifest_path}")
+            head, self.done = _read_manifest(self.manifest_path)
+            _check_resume(head, param_grid, config or {})
+            # raw_sha256 는 manifest 에 기록된 방식으로만 이어서 계산
+            recorded = head.get("hash", "sha256")
+            if hash_mode is not None and hash_mode != recorded:
+                raise ValueError(f"--hash {hash_mode} differs from the sweep manifest (hash={recorded})")
+            hash_mode = recorded
+            # manifest 에 없는 행 (기록 도중 중단) 은 버리고 다시 계산
+            _compact_csv(self.csv_path, self.done, fields)
+            _compact_csv(self.rawmeta_path, self.done, fields)
+        self.hash_mode = hash_mode or "sha256"
+        self._manifest = open(self.manifest_path, "a")
+        if resume and _torn_tail(self.manifest_path):
+            self._manifest.write("\n")                # 잘린 마지막 줄 뒤에 이어 붙이지 않음
+        if not resume:
+            self._log({"ts": ts, "grid": param_grid, "hash": self.hash_mode, "config": config or {}})
+        self._res = self._raw = None
+
+    def _log(self, rec: dict):
+        self._manifest.write(json.dumps(rec) + "\n")
+        _sync(self._manifest)
+
+    def _open(self, path, fieldnames):
+        header = None
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, newline="") as f:
+                header = next(csv.reader(f), None)
+        if header is not None and not set(fieldnames) <= set(header):
+            # 이어 쓰는 CSV 에 없는 컬럼을 버리지 않음
+            raise ValueError(f"{path}: columns {sorted(set(fieldnames) - set(header))} missing from the existing header")
+        f = open(path, "a", newline="")
+        w = csv.DictWriter(f, fieldnames=header or fieldnames, restval="")
+        if header is None:
+            w.writeheader()
+        return f, w
+
+    def write(self, point, outcome, err=None):
+        with span("sweep.write"):
+            self._write(point, outcome, err)
+
+    def _write(self, point, outcome, err):
+        key = point_key(point, self.fields)
+        if outcome is None:
+            self._log({"key": key, "status": "error", "error": err})
+            return
+        res, sha, raw_re, raw_im, payload = outcome
+        names = [n for n, _ in self.fields]
+        if self._res is None:
+            self._res = self._open(self.csv_path, self.result_fields([res]))
+            self._raw = self._open(self.rawmeta_path,
+                                   names + RAWMETA_FIELDS[5:] + (RAWSTORE_FIELDS if self.raw_store else []))
+        row = {
+            **dict(zip(names, point)),
+            "timestamp": self.ts, "raw_sha256": sha,
+            "raw_input_re": raw_re,           # ← ✅ 추가
+            "raw_input_im": raw_im,           # ← ✅ 추가
+        }
+        if self.raw_store is not None and payload is not None:
+            rec = self.raw_store.append(key, payload)
+            row.update({"raw_file": os.path.basename(self.raw_store.bin_path), "raw_offset": rec["offset"],
+                        "raw_nbytes": rec["nbytes"], "raw_record_sha256": rec["sha256"]})
+        self._res[1].writerow(res)
+        self._raw[1].writerow(row)
+        _sync(self._res[0])
+        _sync(self._raw[0])
+        # 행이 디스크에 기록된 뒤에만 완료 처리
+        self._log({"key": key, "status": "ok"})
+        self.done.add(key)
+
+    def close(self):
+        for fw in (self._res, self._raw):
+            if fw is not None:
+                fw[0].close()
+        if self.raw_store is not None:
+            self.raw_store.close()
+        self._manifest.close()
+
+
+def _sync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _torn_tail(path) -> bool:
+    """True if the file does not end with a newline (interrupted mid-record)"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def _read_manifest(path) -> tuple[dict, set]:
+    """-> (header record {ts, grid, hash, config}, completed point keys)"""
+    head, done = {}, set()
+    with open(path) as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:                        # 중단으로 잘린 마지막 줄
+                continue
+            if "grid" in rec and not head:
+                head = rec
+            elif rec.get("status") == "ok":
+                done.add(rec["key"])
+    return head, done
+
+
+def _compact_csv(path, keys, fields=SWEEP_POINT):
+    if not os.path.exists(path):
+        return
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows, seen = [], set()
+        for r in reader:
+            try:
+                k = point_key(tuple(r[n] for n, _ in fields), fields)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if k in keys and k not in seen:
+                seen.add(k)
+                rows.append(r)
+    if fieldnames is None:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w.writeheader()
+        w.writerows(rows)
+    os.replace(tmp, path)
+# ---------------------------------------------------------
+
+
+def run_sweep(points, compute_func, writer: SweepWriter, jobs=1, raw_archive=False,
+              label=point_label, status=None):
+    """Run the points not yet in writer.done (serial or process pool), rows appended in canonical order;
+    status(res) -> (ok, text) for the progress line. -> (stage cache stats, failing point count)"""
+    total = len(points)
+    hash_mode = writer.hash_mode                  # manifest 의 값 (resume) / sha256
+    todo = [(idx, p) for idx, p in enumerate(points) if point_key(p, writer.fields) not in writer.done]
+    skipped = total - len(todo)
+
+    print(f"\n🚀 Starting sweep for {total} combinations (jobs={jobs})...\n")
+    if skipped:
+        print(f"⏩ resume {writer.ts}: {skipped} completed point(s) skipped\n")
+
+    count = [skipped, 0]
+    def emit(idx, outcome, err):
+        writer.write(points[idx], outcome, err)
+        count[0] += 1
+        if outcome is None:
+            ok, text = False, f"❌ error: {err}"
+        else:
+            ok, text = status(outcome[0]) if status else (True, "✅ done")
+        count[1] += not ok
+        print(f"[{count[0]:3d}/{total}] {label(points[idx])} ... {text}", flush=True)
+
+    STAGES.reset_stats()
+    TRACE.reset()
+    try:
+        if jobs > 1 and todo:
+            stage_stats = _run_parallel(compute_func, todo, jobs, emit, raw_archive, hash_mode)
+        else:
+            for idx, point in todo:
+                # try 는 계산만 감쌈: 기록 / 진행 출력 실패가 완료된 point 의 error 기록이 되지 않게
+                try:
+                    outcome, err = run_point(compute_func, point, raw_archive, hash_mode), None
+                except Exception as e:
+                    outcome, err = None, str(e)
+                emit(idx, outcome, err)
+            stage_stats = STAGES.stats()
+    finally:
+        writer.close()
+    return stage_stats, count[1]
+
+
 # (교체) sweep_and_export: 한 번의 ts를 공유해 results.csv 와 rawmeta.csv 생성
-def sweep_and_export(param_grid, compute_func, prefix="falcon_sweep"):
-    results = []
-    rawmeta_rows = []
-    ts = timestamp()
-
-    total = (len(param_grid["I_list"])
-             * len(param_grid["N_list"])
-             * len(param_grid["sigma_list"])
-             * len(param_grid["mp_dps_list"])
-             * len(param_grid["sampler_list"]))
-    count = 0
-
-    print(f"\n🚀 Starting sweep for {total} combinations...\n")
-
-    for I in param_grid["I_list"]:
-        for N in param_grid["N_list"]:
-            for sigma in param_grid["sigma_list"]:
-                for mp_dps in param_grid["mp_dps_list"]:
-                    for sampler in param_grid["sampler_list"]:
-                        count += 1
-                        print(
-                            f"[{count:3d}/{total}] I={I:2d}  N={N:<5d}  σ={sigma:<4.2f}  mp_dps={mp_dps:<3d}  sampler={sampler:<10s} ... ",
-                            end="", flush=True,
-                        )
-                        try:
-                            res, raw_payload = compute_func(I, N, sigma, mp_dps, sampler, need_raw=True)
-
-                            # 1) SHA 계산 (기존 그대로)
-                            sha = raw_sha256_from_payload(raw_payload)
-
-                            # 2) 입력 x를 CSV에 그대로 박아 넣기
-                            raw_re, raw_im = encode_complex_vector_to_csv_fields(raw_payload["x"])
-
-                            rawmeta_rows.append({
-                                "I": I, "N": N, "sigma": sigma, "mp_dps": mp_dps, "sampler": sampler,
-                                "timestamp": ts, "raw_sha256": sha,
-                                "raw_input_re": raw_re,           # ← ✅ 추가
-                                "raw_input_im": raw_im,           # ← ✅ 추가
-                            })
-                            
-                            results.append(res)
-                            print("✅ done")
-                        except Exception as e:
-                            print(f"❌ error: {e}")
-
-    # 두 CSV 생성(동일 ts)
-    csv_path = write_results_csv(results, prefix=prefix, ts=ts)
-    rawmeta_path = write_rawmeta_csv(rawmeta_rows, prefix="falcon_rawmeta", ts=ts)
+# 완료된 point 마다 행을 바로 append/flush → 중단 시 resume=<ts> 로 이어서 실행
+def sweep_and_export(param_grid, compute_func, prefix="falcon_sweep", jobs=1, resume=None,
+                     raw_archive=False, hash_mode=None, trace_out=None, plots=True):
+    ts = resume or timestamp()
+    writer = SweepWriter(prefix, ts, param_grid, resume=bool(resume), raw_archive=raw_archive,
+                         hash_mode=hash_mode, config=compute_config(compute_func))
+    stage_stats, _ = run_sweep(grid_points(param_grid), compute_func, writer, jobs, raw_archive)
+
+    csv_path = writer.csv_path
+    if not os.path.exists(csv_path):
+        write_results_csv([], prefix=prefix, ts=ts)   # 전부 실패해도 header 는 남김
     # --- UPDATE: sweep_and_export end ---
-    csv_path = write_results_csv(results, prefix=prefix, ts=ts)
-    png_relL2 = plot_from_csv(csv_path)             # 기존 (FFT relL2)
-    png_perf  = plot_perf_from_csv(csv_path)        # 신규
-    png_ks    = plot_ks_from_csv(csv_path)          # 신규
-    png_mse   = plot_mse_from_csv(csv_path)         # 신규
-    print(f"\n✅ Sweep completed!\n📄 Results → {csv_path}\n"
-        f"📊 FFT → {png_relL2}\n⚡ Perf → {png_perf}\n📈 KS → {png_ks}\n📉 MSE → {png_mse}")
+    if plots:
+        png_relL2 = plot_from_csv(csv_path)             # 기존 (FFT relL2)
+        png_perf  = plot_perf_from_csv(csv_path)        # 신규
+        png_ks    = plot_ks_from_csv(csv_path)          # 신규
+        png_mse   = plot_mse_from_csv(csv_path)         # 신규
+        print(f"\n✅ Sweep completed!\n📄 Results → {csv_path}\n"
+            f"📊 FFT → {png_relL2}\n⚡ Perf → {png_perf}\n📈 KS → {png_ks}\n📉 MSE → {png_mse}")
+    else:
+        png_relL2 = png_perf = png_ks = png_mse = None  # --no-plots: matplotlib 로드 안 함
+        print(f"\n✅ Sweep completed!\n📄 Results → {csv_path}")
+    print(f"\n♻️  Stage cache (hits/misses):\n{format_stats(stage_stats)}")
+    if TRACE.enabled:
+        print(f"\n⏱️  Spans (all workers):\n{format_trace(TRACE.stats())}")
+        if trace_out:
+            print(f"🧭 Chrome trace → {TRACE.dump_chrome(trace_out)}")
     return csv_path, png_relL2, png_perf, png_ks, png_mse
     # ---------------------------------------------------
@@ -0,0 +1,170 @@
+# falcon_validate/table_module.py
+# Precomputed sampler tables (PMF, CDFs, alias, Knuth–Yao, CT-CDT) built once per
+# (sigma, k_max, mp_dps, I, word_bits) and persisted to a content-addressed .npy cache
+
+from __future__ import annotations
+import os
+import json
+from collections import OrderedDict
+import numpy as np
+from .qformat_module import QCtx
+from .gaussian_module import discrete_gaussian_pmf_mp, discrete_gaussian_pmf_float
+from .sampler_module import build_alias_table, KnuthYaoDDG
+from .ctsampler_module import ct_cdt_table, ct_cdt_table_q
+from .trace_module import span
+
+TABLE_VERSION = 3
+
+# npy 로 저장되는 배열 필드 (mmap 로 로드)
+_ARRAY_FIELDS = ("pmf_f", "pmf_fp64", "cdf_f", "cdf_q", "alias_prob", "alias_idx",
+                 "ky_packed", "ky_q_packed", "ct_cdt", "ct_cdt_q")
+
+
+class SamplerTables:
+    """All per-(sigma, k_max, mp_dps, I, word_bits) sampler tables."""
+    def __init__(self, sigma, k_max, mp_dps, I, pmf_mp, arrays: dict, word_bits: int = 64):
+        self.sigma = sigma
+        self.k_max = k_max
+        self.mp_dps = mp_dps
+        self.I = I
+        self.word_bits = word_bits
+        self.pmf_mp = pmf_mp                      # list[mp.mpf] (FP128 기준)
+        for name in _ARRAY_FIELDS:
+            setattr(self, name, arrays[name])
+        n = len(pmf_mp)
+        self.ky = KnuthYaoDDG.from_packed(self.ky_packed, n)
+        # F 가 너무 작으면 (I≈63) Qx KY table 이 비어 있음 → None
+        self.ky_q = KnuthYaoDDG.from_packed(self.ky_q_packed, n) if self.ky_q_packed.size else None
+
+    @classmethod
+    def build(cls, sigma, k_max, mp_dps, I, pmf_mp=None, word_bits: int = 64):
+        q = QCtx(I, word_bits)
+        if pmf_mp is None:
+            pmf_mp = discrete_gaussian_pmf_mp(k_max, sigma, mp_dps)
+        pmf_f = np.array([float(p) for p in pmf_mp], dtype=np.float64)
+        cdf_f = np.cumsum(pmf_f)
+        prob, alias = build_alias_table(pmf_f)
+        arrays = {
+            "pmf_f": pmf_f,
+            "pmf_fp64": np.array(discrete_gaussian_pmf_float(k_max, sigma), dtype=np.float64),
+            "cdf_f": cdf_f,
+            "cdf_q": q.from_f_np(cdf_f),
+            "alias_prob": prob,
+            "alias_idx": alias,
+            "ky_packed": KnuthYaoDDG(pmf_mp, 64).packed,
+            "ky_q_packed": _ky_packed_or_empty(pmf_mp, q.F),
+            "ct_cdt": ct_cdt_table(pmf_mp),
+            "ct_cdt_q": ct_cdt_table_q(pmf_mp, q),
+        }
+        return cls(sigma, k_max, mp_dps, I, pmf_mp, arrays, word_bits)
+
+    def save(self, path: str):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp, exist_ok=True)
+        for name in _ARRAY_FIELDS:
+            # Q128 cdf_q 는 object(int) 배열 → pickle 필요
+            np.save(os.path.join(tmp, name + ".npy"), getattr(self, name), allow_pickle=True)
+        meta = {
+            "version": TABLE_VERSION, "sigma": self.sigma, "k_max": self.k_max,
+            "mp_dps": self.mp_dps, "I": self.I, "word_bits": self.word_bits,
+            # mpf 내부 표현 (sign, man, exp, bc) 그대로 → exact 복원
+            "pmf_mp": [[s, hex(m), e, bc] for s, m, e, bc in (p._mpf_ for p in self.pmf_mp)],
+        }
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        try:
+            os.rename(tmp, path)
+        except OSError:                               # 다른 worker 가 먼저 저장
+            import shutil
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        import mpmath as mp
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        # 전역 mp.dps 는 건드리지 않음 (캐시 hit 이 이후 mpmath 계산 정밀도를 바꾸지 않도록)
+        with mp.workdps(meta["mp_dps"]):
+            pmf_mp = [mp.mpf((s, int(m, 16), e, bc)) for s, m, e, bc in meta["pmf_mp"]]
+        arrays = {name: _load_npy(os.path.join(path, name + ".npy"), mmap) for name in _ARRAY_FIELDS}
+        return cls(meta["sigma"], meta["k_max"], meta["mp_dps"], meta["I"], pmf_mp, arrays,
+                   meta["word_bits"])
+
+
+def _load_npy(path, mmap):
+    try:
+        return np.load(path, mmap_mode="r" if mmap else None)
+    except ValueError:                                # object 배열은 mmap 불가
+        return np.load(path, allow_pickle=True)
+
+
+def _ky_packed_or_empty(pmf_mp, precision):
+    try:
+        return KnuthYaoDDG(pmf_mp, precision).packed
+    except ValueError:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+
+def table_key(sigma, k_max, mp_dps, I, word_bits=64) -> str:
+    import hashlib
+    blob = json.dumps({"v": TABLE_VERSION, "sigma": repr(float(sigma)), "k_max": int(k_max),
+                       "mp_dps": int(mp_dps), "I": int(I), "word_bits": int(word_bits)},
+                      sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:24]
+
+
+class TableStore:
+    """In-memory LRU over SamplerTables + optional content-addressed cache directory."""
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.cache_dir = None
+        self._mem = OrderedDict()
+        self._pmf = OrderedDict()                     # (sigma, k_max, mp_dps) -> pmf_mp (I, word_bits 무관)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def set_cache_dir(self, path: str | None):
+        if path:
+            os.makedirs(path, exist_ok=True)
+        self.cache_dir = path
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+    def get(self, sigma, k_max, mp_dps, I, word_bits: int = 64) -> SamplerTables:
+        key = table_key(sigma, k_max, mp_dps, I, word_bits)
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            self.hits += 1
+            return self._mem[key]
+        tables = None
+        path = os.path.join(self.cache_dir, key) if self.cache_dir else None
+        if path and os.path.isdir(path):
+            try:
+                with span("tables.load"):
+                    tables = SamplerTables.load(path)
+                self.disk_hits += 1
+            except Exception:
+                tables = None                         # 깨진 캐시 → 재생성
+        if tables is None:
+            pkey = (sigma, k_max, mp_dps)
+            if pkey not in self._pmf:
+                with span("pmf.mp"):
+                    self._pmf[pkey] = discrete_gaussian_pmf_mp(k_max, sigma, mp_dps)
+                if len(self._pmf) > self.maxsize:
+                    self._pmf.popitem(last=False)
+            with span("tables.build"):
+                tables = SamplerTables.build(sigma, k_max, mp_dps, I, self._pmf[pkey], word_bits)
+            self.misses += 1
+            if path and not os.path.isdir(path):
+                tables.save(path)
+        self._mem[key] = tables
+        if len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+        return tables
+
+
+# 프로세스 공용 store (FALCON_TABLE_CACHE 로 디스크 캐시 지정 가능)
+TABLES = TableStore()
+TABLES.set_cache_dir(os.environ.get("FALCON_TABLE_CACHE") or None)
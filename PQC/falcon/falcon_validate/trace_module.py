@@ -0,0 +1,113 @@
+# falcon_validate/trace_module.py
+# Lightweight span instrumentation: wall / CPU time and allocated-block deltas per named
+# stage, aggregated across sweep workers, optional Chrome trace (chrome://tracing, Perfetto)
+
+from __future__ import annotations
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import nullcontext
+
+_NULL = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "t0", "c0", "b0")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.b0 = sys.getallocatedblocks()
+        self.c0 = time.process_time_ns()
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter_ns()
+        c1 = time.process_time_ns()
+        self.tracer._record(self.name, self.t0, t1 - self.t0, c1 - self.c0,
+                            sys.getallocatedblocks() - self.b0)
+        return False
+
+
+class Tracer:
+    """Named spans -> {count, wall_ns, cpu_ns, alloc_blocks}; disabled = shared null context."""
+    def __init__(self):
+        self.enabled = False
+        self.events = None           # Chrome trace 이벤트 (record_events=True 일 때만)
+        self._stats = {}
+
+    def enable(self, record_events: bool = False):
+        self.enabled = True
+        if record_events and self.events is None:
+            self.events = []
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self._stats = {}
+        if self.events is not None:
+            self.events = []
+
+    def span(self, name: str):
+        return _Span(self, name) if self.enabled else _NULL
+
+    def _record(self, name, t0, wall, cpu, blocks):
+        st = self._stats.get(name)
+        if st is None:
+            st = self._stats[name] = {"count": 0, "wall_ns": 0, "cpu_ns": 0, "alloc_blocks": 0}
+        st["count"] += 1
+        st["wall_ns"] += wall
+        st["cpu_ns"] += cpu
+        st["alloc_blocks"] += blocks
+        if self.events is not None:
+            self.events.append({"name": name, "cat": "falcon", "ph": "X", "ts": t0 / 1e3, "dur": wall / 1e3,
+                                "pid": os.getpid(), "tid": threading.get_ident(),
+                                "args": {"cpu_us": cpu / 1e3, "alloc_blocks": blocks}})
+
+    def stats(self) -> dict:
+        return {k: dict(v) for k, v in self._stats.items()}
+
+    def export(self) -> dict:
+        """Picklable snapshot for worker -> parent aggregation"""
+        return {"stats": self.stats(), "events": list(self.events or ())}
+
+    def merge(self, part: dict):
+        for name, st in part["stats"].items():
+            t = self._stats.setdefault(name, {"count": 0, "wall_ns": 0, "cpu_ns": 0, "alloc_blocks": 0})
+            for k in t:
+                t[k] += st[k]
+        if self.events is not None:
+            self.events.extend(part["events"])
+
+    def dump_chrome(self, path: str) -> str:
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events or [], "displayTimeUnit": "ms"}, f)
+        return path
+
+
+def format_trace(stats: dict) -> str:
+    total = sum(st["wall_ns"] for name, st in stats.items() if name == "point") or None
+    lines = [f"  {'span':<16s} {'count':>6s} {'wall ms':>11s} {'cpu ms':>11s} {'ms/call':>9s} "
+             f"{'blocks':>9s} {'% point':>7s}"]
+    for name, st in sorted(stats.items(), key=lambda kv: -kv[1]["wall_ns"]):
+        wall = st["wall_ns"] / 1e6
+        share = f"{100 * st['wall_ns'] / total:6.1f}%" if total else "      -"
+        lines.append(f"  {name:<16s} {st['count']:>6d} {wall:>11.2f} {st['cpu_ns'] / 1e6:>11.2f} "
+                     f"{wall / max(st['count'], 1):>9.3f} {st['alloc_blocks']:>9d} {share}")
+    return "\n".join(lines)
+
+
+# 프로세스 공용 tracer (FALCON_TRACE=1 | events 로 worker 프로세스에서도 활성화)
+TRACE = Tracer()
+if os.environ.get("FALCON_TRACE"):
+    TRACE.enable(record_events=os.environ["FALCON_TRACE"] == "events")
+
+
+def span(name: str):
+    return TRACE.span(name)
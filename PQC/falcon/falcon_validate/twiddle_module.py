@@ -0,0 +1,181 @@
+# falcon_validate/twiddle_module.py
+# Twiddle-factor store shared by the FFT paths across sweep points
+# (in-memory LRU + optional on-disk cache directory)
+
+from __future__ import annotations
+import os
+import math
+import pickle
+from collections import OrderedDict
+import numpy as np
+from .trace_module import span
+
+
+class TwiddleStore:
+    """Per-stage twiddle tables keyed by (kind, N, word_bits/I_bits | mp_dps)."""
+    def __init__(self, maxsize: int = 64, cache_dir: str | None = None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._mem = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def set_cache_dir(self, path: str | None):
+        if path:
+            os.makedirs(path, exist_ok=True)
+        self.cache_dir = path
+
+    def clear(self):
+        self._mem.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses}
+
+    def _get(self, key: tuple, build, save, load):
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            self.hits += 1
+            return self._mem[key]
+        val = None
+        path = self._path(key)
+        if path and os.path.exists(path):
+            try:
+                val = load(path)
+                self.disk_hits += 1
+            except Exception:
+                val = None                          # 깨진 캐시 파일은 다시 생성
+        if val is None:
+            with span(f"twiddle.{key[0]}"):
+                val = build()
+            self.misses += 1
+            if path:
+                tmp = f"{path}.{os.getpid()}.tmp"
+                save(tmp, val)
+                os.replace(tmp, path)               # 병렬 worker 간 atomic 교체
+        self._mem[key] = val
+        if len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+        return val
+
+    def _path(self, key: tuple):
+        if not self.cache_dir:
+            return None
+        kind = key[0]
+        ext = "pkl" if kind == "mp" else "npz"
+        return os.path.join(self.cache_dir, "tw_" + "_".join(str(k) for k in key) + "." + ext)
+
+    # --- Q-format: list of (re, im) integer arrays (int64, Q128 은 object), one per stage ---
+    def q(self, n: int, q):
+        from .fft_module import twiddles_q
+        def build():
+            return [(q.asarray([z.re for z in st]), q.asarray([z.im for z in st]))
+                    for st in twiddles_q(n, q)]
+        return self._get(("q", n, q.W, q.I), build, _save_stages_npz, _load_stages_npz)
+
+    # --- Q-format w_m^j = exp(-2 pi i j / m), j < m, as one (re, im) stage (fftkernel_module) ---
+    def qroot(self, m: int, q):
+        from .fft_module import normalize_to_unit
+        def build():
+            # twiddles_q 와 같은 식 → j < m/2 는 TWIDDLES.q 의 stage 값과 bit 동일
+            zs = [normalize_to_unit(q, q.from_f(math.cos(-2.0 * math.pi * j / m)),
+                                    q.from_f(math.sin(-2.0 * math.pi * j / m))) for j in range(m)]
+            return [(q.asarray([z.re for z in zs]), q.asarray([z.im for z in zs]))]
+        return self._get(("qroot", m, q.W, q.I), build, _save_stages_npz, _load_stages_npz)
+
+    # --- Q-format negacyclic twist: psi^j = exp(-i*pi*j/n), j < n, as one (re, im) stage ---
+    def psi(self, n: int, q):
+        from .fft_module import normalize_to_unit
+        def build():
+            zs = [normalize_to_unit(q, q.from_f(math.cos(-math.pi * j / n)), q.from_f(math.sin(-math.pi * j / n)))
+                  for j in range(n)]
+            return [(q.asarray([z.re for z in zs]), q.asarray([z.im for z in zs]))]
+        return self._get(("psi", n, q.W, q.I), build, _save_stages_npz, _load_stages_npz)
+
+    # --- NTT (ntt_module.NttParams): [zetas, zetas_inv] int64, bit-reversed, domain "mont" | "plain" ---
+    def ntt(self, p, domain: str = "mont"):
+        def build():
+            conv = p.mont if domain == "mont" else int
+            return [np.array([conv(z) for z in p.zetas], dtype=np.int64),
+                    np.array([conv(z) for z in p.zetas_inv], dtype=np.int64)]
+        return self._get(("ntt", p.q, p.r_bits, domain), build, _save_stages_npz, _load_stages_npz)
+
+    # --- FP64: list of complex128 arrays, one per stage ---
+    def fp64(self, n: int):
+        def build():
+            out = []
+            m = 1
+            while (1 << m) <= n:
+                M = 1 << m
+                k = np.arange(M >> 1)
+                out.append(np.exp(-2j * math.pi * k / M))
+                m += 1
+            return out
+        return self._get(("fp64", n), build, _save_stages_npz, _load_stages_npz)
+
+    # --- mpmath: list of lists of mp.mpc at mp_dps, same expression as mp_fft ---
+    def mp(self, n: int, dps: int):
+        def build():
+            import mpmath as mp
+            mp.mp.dps = dps
+            out = []
+            M = 2
+            while M <= n:
+                out.append([mp.e ** (mp.j * (-2 * mp.pi * j / M)) for j in range(M >> 1)])
+                M *= 2
+            return out
+        def save(path, val):
+            with open(path, "wb") as f:
+                pickle.dump(val, f, protocol=pickle.HIGHEST_PROTOCOL)
+        def load(path):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        return self._get(("mp", n, dps), build, save, load)
+
+    # --- double-double: per stage (re_hi, re_lo, im_hi, im_lo) float64 arrays ---
+    def dd(self, n: int, dps: int = 40):
+        def build():
+            out = []
+            for st in self.mp(n, dps):
+                re = [w.real for w in st]
+                im = [w.imag for w in st]
+                re_hi = np.array([float(v) for v in re]); im_hi = np.array([float(v) for v in im])
+                re_lo = np.array([float(v - h) for v, h in zip(re, re_hi)])
+                im_lo = np.array([float(v - h) for v, h in zip(im, im_hi)])
+                out.append((re_hi, re_lo, im_hi, im_lo))
+            return out
+        return self._get(("dd", n, dps), build, _save_stages_npz, _load_stages_npz)
+
+
+def _save_stages_npz(path, stages):
+    arrs = {}
+    for i, st in enumerate(stages):
+        if isinstance(st, tuple):
+            for j, a in enumerate(st):
+                arrs[f"s{i}_{j}"] = a
+        else:
+            arrs[f"c{i}"] = st
+    with open(path, "wb") as f:
+        np.savez(f, **arrs)
+
+
+def _load_stages_npz(path):
+    with np.load(path, allow_pickle=True) as z:           # Q128 twiddle = object 배열
+        names = set(z.files)
+        out = []
+        i = 0
+        while f"s{i}_0" in names or f"c{i}" in names:
+            if f"c{i}" in names:
+                out.append(z[f"c{i}"])
+            else:
+                parts = sorted((n for n in names if n.startswith(f"s{i}_")), key=lambda n: int(n.split("_")[1]))
+                out.append(tuple(z[n] for n in parts))
+            i += 1
+    if not out:                                           # 다른 형식 / 낡은 파일 → _get 이 재생성
+        raise ValueError(f"No twiddle stages in {path}")
+    return out
+
+
+# 프로세스 공용 store (FALCON_TWIDDLE_CACHE 로 디스크 캐시 지정 가능)
+TWIDDLES = TwiddleStore()
+TWIDDLES.set_cache_dir(os.environ.get("FALCON_TWIDDLE_CACHE") or None)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from falcon_validate.fft_module import fft_q, fft_q_np, to_qc_array
+from falcon_validate.qformat_module import QCtx
+
+
+def _inputs(n, seed=0, scale=1.0):
+    rng = np.random.default_rng(seed)
+    return scale * (rng.random(n) + 1j * rng.random(n)) / np.sqrt(2)
+
+
+@pytest.mark.parametrize("I, word_bits", [(4, 16), (8, 32), (12, 48), (16, 64), (40, 128)])
+@pytest.mark.parametrize("n", [2, 16, 128])
+def test_fft_q_np_matches_scalar_fft_q(I, word_bits, n):
+    q = QCtx(I, word_bits)
+    xa = to_qc_array(_inputs(n), q)
+    ref, ref_stages = fft_q(xa.to_list(), q)
+    re, im, stages = fft_q_np(xa.re, xa.im, q)
+    assert stages == ref_stages
+    assert [int(v) for v in re] == [z.re for z in ref]
+    assert [int(v) for v in im] == [z.im for z in ref]
+
+
+def test_fft_q_np_saturates_like_fft_q():
+    # I 가 작아 rescale (<< stages) 에서 포화되는 경우도 같은 값
+    q = QCtx(2, 32)
+    xa = to_qc_array(_inputs(64, seed=1, scale=1.9), q)
+    ref, _ = fft_q(xa.to_list(), q)
+    re, im, _ = fft_q_np(xa.re, xa.im, q)
+    assert [int(v) for v in re] == [z.re for z in ref]
+    assert [int(v) for v in im] == [z.im for z in ref]
+    assert any(z.re in (q.QMIN, q.QMAX) for z in ref)
+
+
+def test_fft_q_np_batch_rows_match_single():
+    q = QCtx(8, 32)
+    rows = [to_qc_array(_inputs(32, seed=s), q) for s in range(3)]
+    re, im, _ = fft_q_np(np.stack([r.re for r in rows]), np.stack([r.im for r in rows]), q)
+    for k, r in enumerate(rows):
+        one_re, one_im, _ = fft_q_np(r.re, r.im, q)
+        assert np.array_equal(re[k], one_re) and np.array_equal(im[k], one_im)
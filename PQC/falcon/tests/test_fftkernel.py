@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from falcon_validate.fft_module import fft_q_np, to_complex128, to_qc_array
+from falcon_validate.fftkernel_module import FFT_KERNELS, FFT_SCALINGS, OpCount, check_kernel, fft_q_kernel
+from falcon_validate.qformat_module import QCtx, QcArray
+
+
+def _inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.random(n) + 1j * rng.random(n)) / np.sqrt(2)
+
+
+@pytest.mark.parametrize("kernel", FFT_KERNELS)
+@pytest.mark.parametrize("scaling", FFT_SCALINGS)
+@pytest.mark.parametrize("n", [2, 4, 8, 32, 64])
+def test_kernel_matches_scalar_reference(kernel, scaling, n):
+    q = QCtx(8, 32)
+    xa = to_qc_array(_inputs(n), q)
+    chk = check_kernel(xa.re, xa.im, q, kernel, scaling)
+    assert {k: v["mismatch"] for k, v in chk.items()} == {k: 0 for k in chk}
+
+
+@pytest.mark.parametrize("I, word_bits", [(4, 16), (8, 32), (16, 64), (40, 128)])
+def test_radix2_fixed_is_fft_q_np(I, word_bits):
+    q = QCtx(I, word_bits)
+    xa = to_qc_array(_inputs(128), q)
+    want = fft_q_np(xa.re, xa.im, q)
+    # ops 를 주면 fft_q_np 로 돌려보내지 않고 kernel 경로를 탐
+    got = fft_q_kernel(xa.re, xa.im, q, "radix2", "fixed", ops=OpCount())
+    for a, b in zip(got, want):
+        assert np.array_equal(np.asarray(a), np.asarray(b))
+
+
+@pytest.mark.parametrize("kernel", FFT_KERNELS)
+@pytest.mark.parametrize("scaling", FFT_SCALINGS)
+def test_kernel_close_to_radix2(kernel, scaling):
+    q = QCtx(8, 32)
+    xa = to_qc_array(_inputs(256, seed=3), q)
+    ref = to_complex128(QcArray(*fft_q_np(xa.re, xa.im, q)[:2]), q)
+    est = to_complex128(QcArray(*fft_q_kernel(xa.re, xa.im, q, kernel, scaling)[:2]), q)
+    assert np.linalg.norm(est - ref) / np.linalg.norm(ref) < 1e-4
+
+
+def test_radix4_and_split_use_fewer_multiplies():
+    q = QCtx(8, 32)
+    xa = to_qc_array(_inputs(256), q)
+    muls = {}
+    for kernel in FFT_KERNELS:
+        c = OpCount()
+        fft_q_kernel(xa.re, xa.im, q, kernel, ops=c)
+        muls[kernel] = c.n["mul"]
+    assert muls["split"] < muls["radix4"] < muls["radix2"]
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from falcon_validate.ntt_module import (NTT_PARAMS, REDUCTIONS, intt_np, intt_ref, ntt_np, ntt_ref,
+                                        poly_mul_ntt, poly_mul_ref, random_poly)
+
+
+@pytest.mark.parametrize("reduce", REDUCTIONS)
+@pytest.mark.parametrize("q", sorted(NTT_PARAMS))
+def test_ntt_np_matches_ntt_ref(q, reduce):
+    p = NTT_PARAMS[q]
+    a = random_poly(p, 4, seed=q)
+    A = ntt_np(a, p, reduce)
+    assert np.array_equal(A, np.array([ntt_ref(x, p) for x in a]))
+    assert np.array_equal(intt_np(A, p, reduce), a)
+
+
+@pytest.mark.parametrize("reduce", REDUCTIONS)
+@pytest.mark.parametrize("q", sorted(NTT_PARAMS))
+def test_poly_mul_ntt_matches_schoolbook(q, reduce):
+    p = NTT_PARAMS[q]
+    a, b = random_poly(p, 2, seed=1), random_poly(p, 2, seed=2)
+    c = poly_mul_ntt(a, b, p, reduce)
+    assert np.array_equal(c, np.array([poly_mul_ref(x, y, q) for x, y in zip(a, b)]))
+
+
+@pytest.mark.parametrize("q", sorted(NTT_PARAMS))
+def test_ntt_ref_roundtrip(q):
+    p = NTT_PARAMS[q]
+    a = [int(v) for v in random_poly(p, seed=3)]
+    assert intt_ref(ntt_ref(a, p), p) == a
+
+
+def test_edge_coefficients():
+    # 0 / q-1 만으로 된 입력 (reduction 경계값)
+    for q, p in NTT_PARAMS.items():
+        a = np.array([[0] * p.n, [q - 1] * p.n, [(q - 1) * (k & 1) for k in range(p.n)]], dtype=np.int64)
+        for reduce in REDUCTIONS:
+            assert np.array_equal(ntt_np(a, p, reduce), np.array([ntt_ref(x, p) for x in a]))
@@ -0,0 +1,86 @@
+import csv
+import glob
+import json
+from functools import partial
+
+import pytest
+
+from falcon_validate.main import compare_single
+from falcon_validate.stage_module import STAGES
+from falcon_validate.sweep_module import grid_points, point_key, sweep_and_export
+
+GRID = {
+    "I_list": [12],
+    "N_list": [16, 32],
+    "sigma_list": [1.5, 2.0],
+    "mp_dps_list": [33],
+    "sampler_list": ["cdt", "alias"],
+}
+COMPUTE = partial(compare_single, bm_pairs=64, word_bits=32)
+PREFIX = "falcon_sweep"
+
+
+def _sweep(path, monkeypatch, **kw):
+    monkeypatch.chdir(path)
+    STAGES.clear()                                    # 앞선 sweep 의 cache 없이 다시 계산
+    sweep_and_export(GRID, COMPUTE, plots=False, **kw)
+    (manifest,) = glob.glob(f"{path}/{PREFIX}_*.manifest.jsonl")
+    return manifest[len(f"{path}/{PREFIX}_"):-len(".manifest.jsonl")]
+
+
+def _hashes(path, ts):
+    """rawmeta rows -> {point key: raw_sha256}; every grid point exactly once"""
+    with open(f"{path}/falcon_rawmeta_{ts}.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    keys = [point_key((r["I"], r["N"], r["sigma"], r["mp_dps"], r["sampler"])) for r in rows]
+    assert sorted(keys) == sorted(point_key(p) for p in grid_points(GRID))
+    return {k: r["raw_sha256"] for k, r in zip(keys, rows)}
+
+
+@pytest.fixture(scope="module")
+def serial(tmp_path_factory):
+    path = tmp_path_factory.mktemp("serial")
+    with pytest.MonkeyPatch.context() as mp:
+        ts = _sweep(path, mp)
+    return _hashes(path, ts)
+
+
+def test_resume_after_crash_gives_same_hashes(serial, tmp_path, monkeypatch):
+    ts = _sweep(tmp_path, monkeypatch)
+    manifest = f"{tmp_path}/{PREFIX}_{ts}.manifest.jsonl"
+    with open(manifest) as f:
+        lines = f.readlines()
+    # 중단 흉내: header + 완료 2 점만 남기고 마지막 줄은 반쯤 쓰인 상태; CSV 의 나머지 행은 resume 이 버림
+    with open(manifest, "w") as f:
+        f.writelines(lines[:3])
+        f.write(lines[3][:10])
+    rawmeta = f"{tmp_path}/falcon_rawmeta_{ts}.csv"
+    with open(rawmeta, "rb+") as f:
+        f.truncate(f.seek(0, 2) - 20)
+    assert _sweep(tmp_path, monkeypatch, resume=ts) == ts
+    with open(manifest) as f:
+        lines = f.read().splitlines()
+    assert lines[3] == lines[3][:10]                  # 잘린 줄 뒤에 새 기록을 붙이지 않음
+    ok = [json.loads(line)["key"] for line in lines[4:]]
+    assert sorted(ok + [json.loads(line)["key"] for line in lines[1:3]]) == sorted(serial)
+    assert _hashes(tmp_path, ts) == serial
+    with open(f"{tmp_path}/{PREFIX}_{ts}.csv", newline="") as f:
+        assert len(list(csv.DictReader(f))) == len(serial)
+
+
+def test_resume_refuses_changed_config(tmp_path, monkeypatch):
+    ts = _sweep(tmp_path, monkeypatch)
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match="bm_pairs"):
+        sweep_and_export(GRID, partial(compare_single, bm_pairs=128, word_bits=32), resume=ts, plots=False)
+    with open(f"{tmp_path}/{PREFIX}_{ts}.manifest.jsonl") as f:
+        assert json.loads(f.readline())["config"]["bm_pairs"] == 64
+
+
+@pytest.mark.parametrize("jobs", [2, 3])
+def test_parallel_matches_serial(serial, tmp_path, monkeypatch, jobs):
+    ts = _sweep(tmp_path, monkeypatch, jobs=jobs)
+    with open(f"{tmp_path}/falcon_rawmeta_{ts}.csv", newline="") as f:
+        keys = [point_key((r["I"], r["N"], r["sigma"], r["mp_dps"], r["sampler"])) for r in csv.DictReader(f)]
+    assert keys == [point_key(p) for p in grid_points(GRID)]     # canonical 순서
+    assert _hashes(tmp_path, ts) == serial